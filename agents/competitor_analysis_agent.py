@@ -1,69 +1,151 @@
 import json
-import re
-from typing import Dict
+import os
+from typing import Dict, List, Literal, Optional, Tuple
 from dotenv import load_dotenv
 
-from langchain_community.chat_models import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
-from langchain_community.tools import DuckDuckGoSearchRun
+from pydantic import BaseModel, Field
+
+from agents.context_budget import format_within_budget, project
+from agents.json_stream import astream_json
+from agents.resources import get_chat_model
+from agents.search_cache import acached_search
 
 from prompts.competitor_analysis_prompt import (
     COMPETITOR_DISCOVERY_PROMPT,
     COMPETITOR_ANALYSIS_PROMPT,
     COMPETITOR_POSITIONING_PROMPT,
+    COMPETITOR_FUSED_PROMPT,
 )
 
 load_dotenv()
 
 # ---------------------------
-# LLM 및 도구 초기화
+# LLM 및 도구 (최초 호출 시 생성)
 # ---------------------------
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
-search_tool = DuckDuckGoSearchRun()
+def get_llm():
+    return get_chat_model("gpt-4o-mini", temperature=0.3)
 
 
 # ---------------------------
-# 유틸: JSON 추출
+# 단일 호출(fused) 모드 스키마
 # ---------------------------
-def extract_json(text: str, fallback=None):
-    text = text.strip()
-    match = re.search(r"\{.*\}", text, re.DOTALL)
-    if not match:
-        return fallback or {}
-    try:
-        return json.loads(match.group(0))
-    except Exception:
-        return fallback or {}
+Level = Literal["높음", "중간", "낮음"]
+
+
+class Competitor(BaseModel):
+    name: str = Field(description="회사명")
+    description: str = Field(description="간단한 설명 (1-2문장)")
+    category: str = Field(description="B2B/B2C/B2B2C")
+    founded_year: str = Field(description="설립연도")
+    estimated_revenue: str = Field(description="추정 매출 (모르면 Unknown)")
+    key_products: List[str]
+    target_market: str = Field(description="타겟 시장")
+    funding_stage: str = Field(description="Seed/Series A/B/C/IPO/Unknown")
+    competitive_overlap: Level
+
+
+class CompetitionAnalysis(BaseModel):
+    competition_intensity: int = Field(description="경쟁 강도 (1-10)")
+    market_positioning: Literal["Blue Ocean", "Red Ocean", "Niche Market"]
+    differentiation_factors: List[str]
+    competitive_advantages: List[str]
+    entry_barriers: Level
+    key_threats: List[str]
+    market_share_potential: int = Field(description="점유율 확보 가능성 (1-10)")
+
+
+class CompetitiveMoat(BaseModel):
+    technology: int = Field(description="0-10")
+    brand: int = Field(description="0-10")
+    network_effect: int = Field(description="0-10")
+    data: int = Field(description="0-10")
+    overall: int = Field(description="0-10")
+
+
+class Sustainability(BaseModel):
+    score: int = Field(description="0-10")
+    reasoning: str = Field(description="지속 가능성 평가 이유")
+
+
+class CompetitivePositioning(BaseModel):
+    positioning_score: int = Field(description="0-10")
+    differentiation_score: int = Field(description="0-10")
+    competitive_moat: CompetitiveMoat
+    sustainability: Sustainability
+    recommendations: List[str]
+
+
+class CompetitorEvaluation(BaseModel):
+    """경쟁사 탐색 + 경쟁 구도 분석 + 포지셔닝 평가 (3단계 결과를 한 번에)"""
+    competitors: List[Competitor]
+    competitor_analysis: CompetitionAnalysis
+    competitive_positioning: CompetitivePositioning
 
 
 # ---------------------------
-# 경쟁사 분석 LangGraph 노드 (단일 스타트업 처리)
+# 프롬프트 컨텍스트 (필드 선별 + 토큰 예산)
 # ---------------------------
-async def competitor_analysis_node(state: Dict) -> Dict:
-    state["stage"] = "Competitor Analysis Node"
-    print(f"진행 단계: {state['stage']}")
+FUSED_TOKEN_BUDGET = int(os.getenv("COMPETITOR_FUSED_TOKEN_BUDGET", "3000"))
+
+# 앞 단계가 추가한 분석 결과 — 경쟁 구도 판단에 필요한 항목만 골라서 전달
+DERIVED_FIELDS = (
+    "tech_summary", "market_eval", "market_eval_detail",
+    "competitor_list", "competitor_analysis", "competitive_positioning",
+    "investment_scores", "risk_assessment", "investment_decision",
+)
+TECH_FIELDS = ("summary", "highlights")
+MARKET_FIELDS = ("size_estimate", "growth", "competition")
+
+
+def fused_sections(current: Dict) -> Dict[str, Dict]:
+    # 시장 보고서 전문(summary) 대신 규모/성장/경쟁 항목만
+    startup_info = project(current, exclude=DERIVED_FIELDS)
+    startup_info["tech_summary"] = project(current.get("tech_summary"), TECH_FIELDS)
+    startup_info["market_eval"] = project(current.get("market_eval"), MARKET_FIELDS)
+    return {"startup_info": startup_info}
 
-    current = state.get("current_startup", {})
-    if not current:
-        print("current_startup 없음 — 스킵")
-        return state
 
+def fused_mode_enabled() -> bool:
+    """COMPETITOR_FUSED_MODE=1 이면 탐색/분석/포지셔닝을 한 번의 structured output 호출로 산출"""
+    return os.getenv("COMPETITOR_FUSED_MODE", "0").lower() in ("1", "true", "yes")
+
+
+async def evaluate_fused(current: Dict, search_results: str) -> Tuple[List, Dict, Dict]:
+    """단일 호출 경로 — 스키마 검증 실패 시 예외를 그대로 올려 3단계 경로로 대체"""
+    name = current.get("name", "Unknown Startup")
+    formatted = format_within_budget(
+        COMPETITOR_FUSED_PROMPT.strip(),
+        fused_sections(current),
+        FUSED_TOKEN_BUDGET,
+        label=f"{name} 경쟁사 분석(fused)",
+        fixed={"startup_name": name, "search_results": search_results},
+    )
+    structured_llm = get_llm().with_structured_output(CompetitorEvaluation)
+    result: CompetitorEvaluation = await structured_llm.ainvoke(formatted)
+    return (
+        [c.model_dump() for c in result.competitors],
+        result.competitor_analysis.model_dump(),
+        result.competitive_positioning.model_dump(),
+    )
+
+
+async def evaluate_three_step(current: Dict, search_results: str) -> Tuple[List, Dict, Dict]:
+    """탐색 → 분석 → 포지셔닝 순차 호출 (단계별 실패 시 기본값)"""
     name = current.get("name", "Unknown Startup")
     info_json = json.dumps(current, ensure_ascii=False, indent=2)
 
     # 1️⃣ 경쟁사 탐색
     try:
-        search_query = f"{name} 에듀테크 경쟁사 OR similar edtech companies"
-        search_results = search_tool.run(search_query)[:2000]
-
         prompt_discovery = PromptTemplate(
             input_variables=["startup_info", "search_results"],
             template=COMPETITOR_DISCOVERY_PROMPT.strip(),
         )
-        response_1 = await llm.ainvoke(
-            prompt_discovery.format(startup_info=info_json, search_results=search_results)
+        competitors_obj = await astream_json(
+            get_llm(),
+            prompt_discovery.format(startup_info=info_json, search_results=search_results),
+            expect="{",
         )
-        competitors_obj = extract_json(response_1.content, {"competitors": []})
         competitors = competitors_obj.get("competitors", [])
     except Exception as e:
         print(f"경쟁사 탐색 실패: {e}")
@@ -75,13 +157,14 @@ async def competitor_analysis_node(state: Dict) -> Dict:
             input_variables=["startup_info", "competitors"],
             template=COMPETITOR_ANALYSIS_PROMPT.strip(),
         )
-        response_2 = await llm.ainvoke(
+        analysis = await astream_json(
+            get_llm(),
             prompt_analysis.format(
                 startup_info=info_json,
                 competitors=json.dumps(competitors, ensure_ascii=False, indent=2),
-            )
+            ),
+            expect="{",
         )
-        analysis = extract_json(response_2.content, {})
     except Exception as e:
         print(f"경쟁 구도 분석 실패: {e}")
         analysis = {}
@@ -92,18 +175,54 @@ async def competitor_analysis_node(state: Dict) -> Dict:
             input_variables=["startup_name", "competitors", "analysis"],
             template=COMPETITOR_POSITIONING_PROMPT.strip(),
         )
-        response_3 = await llm.ainvoke(
+        positioning = await astream_json(
+            get_llm(),
             prompt_position.format(
                 startup_name=name,
                 competitors=json.dumps(competitors, ensure_ascii=False, indent=2),
                 analysis=json.dumps(analysis, ensure_ascii=False, indent=2),
-            )
+            ),
+            expect="{",
         )
-        positioning = extract_json(response_3.content, {})
     except Exception as e:
         print(f"포지셔닝 평가 실패: {e}")
         positioning = {}
 
+    return competitors, analysis, positioning
+
+
+# ---------------------------
+# 경쟁사 분석 LangGraph 노드 (단일 스타트업 처리)
+# ---------------------------
+async def competitor_analysis_node(state: Dict) -> Dict:
+    state["stage"] = "Competitor Analysis Node"
+    print(f"진행 단계: {state['stage']}")
+
+    current = state.get("current_startup", {})
+    if not current:
+        print("current_startup 없음 — 스킵")
+        return state
+
+    name = current.get("name", "Unknown Startup")
+
+    # 경쟁사 검색 (두 경로 공통)
+    try:
+        search_query = f"{name} 에듀테크 경쟁사 OR similar edtech companies"
+        search_results = (await acached_search("duckduckgo", search_query))[:2000]
+    except Exception as e:
+        print(f"경쟁사 검색 실패: {e}")
+        search_results = ""
+
+    evaluation: Optional[Tuple[List, Dict, Dict]] = None
+    if fused_mode_enabled():
+        try:
+            evaluation = await evaluate_fused(current, search_results)
+        except Exception as e:
+            print(f"[{name}] fused 경쟁사 분석 실패 → 3단계 경로로 재시도: {e}")
+    if evaluation is None:
+        evaluation = await evaluate_three_step(current, search_results)
+    competitors, analysis, positioning = evaluation
+
     # 결과 합치기
     current["competitor_list"] = competitors
     current["competitor_analysis"] = analysis
@@ -0,0 +1,134 @@
+# ai-agent/agents/context_budget.py
+"""
+프롬프트 컨텍스트 압축.
+
+앞 단계 결과가 누적된 current_startup을 통째로 json.dumps(indent=2) 하면
+같은 섹션(시장 보고서, 경쟁사 목록 등)이 여러 번 들어가고 들여쓰기 공백까지 토큰이 된다.
+여기서는
+- 프롬프트마다 실제로 쓰는 필드만 골라(project) 공백 없는 JSON으로 직렬화하고
+- 프롬프트별 토큰 예산을 넘으면 가장 큰 섹션부터 긴 문자열/리스트를 잘라낸다.
+"""
+import functools
+import json
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+TRUNCATION_MARK = "…"
+MIN_STRING_CHARS = 80
+MIN_LIST_ITEMS = 2
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """tiktoken(o200k_base)으로 토큰 수 계산, 없으면 글자 수 기반 추정"""
+    encoding = _encoding()
+    if encoding is None:
+        return max(1, len(text) // 2)
+    return len(encoding.encode(text))
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def project(data: Optional[Dict[str, Any]], fields: Optional[Iterable[str]] = None,
+            exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """fields에 있는 키만 (None이면 전체에서 exclude 제외) 남긴 얕은 사본"""
+    if not isinstance(data, dict):
+        return {}
+    excluded = set(exclude)
+    keys = data.keys() if fields is None else [f for f in fields if f in data]
+    return {k: data[k] for k in keys if k not in excluded}
+
+
+def _shrink(value: Any, max_chars: int, max_items: int) -> Any:
+    """긴 문자열은 max_chars, 리스트는 max_items 까지만 남김 (중첩 구조 포함)"""
+    if isinstance(value, str):
+        return value if len(value) <= max_chars else value[:max_chars] + TRUNCATION_MARK
+    if isinstance(value, list):
+        return [_shrink(v, max_chars, max_items) for v in value[:max_items]]
+    if isinstance(value, dict):
+        return {k: _shrink(v, max_chars, max_items) for k, v in value.items()}
+    return value
+
+
+def _longest_string(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, list):
+        return max((_longest_string(v) for v in value), default=0)
+    if isinstance(value, dict):
+        return max((_longest_string(v) for v in value.values()), default=0)
+    return 0
+
+
+def _longest_list(value: Any) -> int:
+    if isinstance(value, list):
+        return max([len(value)] + [_longest_list(v) for v in value])
+    if isinstance(value, dict):
+        return max((_longest_list(v) for v in value.values()), default=0)
+    return 0
+
+
+def fit_sections(sections: Dict[str, Any], budget: int, fixed_tokens: int = 0) -> Tuple[Dict[str, str], int]:
+    """
+    섹션별 값을 compact JSON으로 직렬화하고, 합계(+ 템플릿 고정 토큰)가 budget 이하가 될 때까지
+    토큰이 가장 많은 섹션의 문자열/리스트 길이를 절반씩 줄인다.
+    반환: ({섹션명: 직렬화 문자열}, 섹션 토큰 합계)
+    """
+    values = dict(sections)
+    rendered = {k: compact_json(v) for k, v in values.items()}
+    tokens = {k: count_tokens(text) for k, text in rendered.items()}
+    exhausted = set()
+
+    while fixed_tokens + sum(tokens.values()) > budget:
+        candidates = [k for k in tokens if k not in exhausted]
+        if not candidates:
+            break
+        target = max(candidates, key=tokens.get)
+        value = values[target]
+        shrunk = _shrink(
+            value,
+            max(MIN_STRING_CHARS, _longest_string(value) // 2),
+            max(MIN_LIST_ITEMS, _longest_list(value) // 2),
+        )
+        text = compact_json(shrunk)
+        if text == rendered[target]:
+            # 이 섹션은 더 줄일 수 없음 → 다음으로 큰 섹션
+            exhausted.add(target)
+            continue
+        values[target] = shrunk
+        rendered[target] = text
+        tokens[target] = count_tokens(text)
+
+    return rendered, sum(tokens.values())
+
+
+def format_within_budget(template: str, sections: Dict[str, Any], budget: int, label: str,
+                         fixed: Optional[Dict[str, Any]] = None,
+                         baseline_sections: Optional[Dict[str, Any]] = None) -> str:
+    """
+    template(str.format 형식)에 sections를 예산 안으로 압축해 채운다.
+    baseline_sections(기존 방식: 전체 dict, indent=2)가 주어지면 압축 전/후 토큰 수를 로그로 남긴다.
+    """
+    fixed = fixed or {}
+    empty = {k: "" for k in sections}
+    fixed_tokens = count_tokens(template.format(**empty, **fixed))
+    rendered, section_tokens = fit_sections(sections, budget, fixed_tokens)
+    prompt = template.format(**rendered, **fixed)
+
+    after = fixed_tokens + section_tokens
+    if baseline_sections is not None:
+        baseline = {k: json.dumps(v, ensure_ascii=False, indent=2) for k, v in baseline_sections.items()}
+        before = count_tokens(template.format(**baseline, **fixed))
+        print(f"[{label}] 입력 토큰 {before} → {after} (예산 {budget})")
+    else:
+        print(f"[{label}] 입력 토큰 {after} (예산 {budget})")
+    return prompt
@@ -1,88 +1,214 @@
-import json, re
-from typing import Dict
+import os
+from typing import Any, Dict, List, Literal, Optional, Tuple
 from dotenv import load_dotenv
-from langchain_community.chat_models import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
+from pydantic import BaseModel, Field
+
+from agents.context_budget import compact_json, format_within_budget, project
+from agents.json_stream import astream_json
+from agents.resources import get_chat_model
 
 from prompts.investment_decision_prompt import (
     INVESTMENT_SCORING_PROMPT,
     INVESTMENT_RISK_PROMPT,
     INVESTMENT_DECISION_PROMPT,
+    INVESTMENT_FUSED_PROMPT,
 )
 
 load_dotenv()
 
 # ---------------------------
-# LLM 초기화
+# LLM (최초 호출 시 생성)
 # ---------------------------
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
+def get_llm():
+    return get_chat_model("gpt-4o-mini", temperature=0.1)
+
+
+def is_invested(startup: Dict) -> bool:
+    """투자 확정(유치/확정) 여부"""
+    inv_decision = startup.get("investment_decision", {})
+    decision = inv_decision.get("decision", "") if isinstance(inv_decision, dict) else ""
+    decision_lower = str(decision).lower()
+    return "유치" in decision_lower or "확정" in decision_lower
 
 # ---------------------------
-# JSON 추출 유틸
+# 프롬프트 컨텍스트 (필드 선별 + 토큰 예산)
 # ---------------------------
-def extract_json(text: str, fallback=None):
-    match = re.search(r"\{.*\}", text.strip(), re.DOTALL)
-    if not match:
-        return fallback or {}
-    try:
-        return json.loads(match.group(0))
-    except Exception:
-        return fallback or {}
+SCORING_TOKEN_BUDGET = int(os.getenv("INVESTMENT_SCORING_TOKEN_BUDGET", "3000"))
+RISK_TOKEN_BUDGET = int(os.getenv("INVESTMENT_RISK_TOKEN_BUDGET", "2000"))
+FUSED_TOKEN_BUDGET = int(os.getenv("INVESTMENT_FUSED_TOKEN_BUDGET", "3500"))
+
+# 앞 단계가 추가한 분석 결과 — startup_info에서는 빼고 각 섹션으로만 전달
+DERIVED_FIELDS = (
+    "tech_summary", "market_eval", "market_eval_detail",
+    "competitor_list", "competitor_analysis", "competitive_positioning",
+    "investment_scores", "risk_assessment", "investment_decision",
+)
+MARKET_FIELDS = ("summary", "size_estimate", "growth", "competition", "risks", "score")
+MARKET_RISK_FIELDS = ("growth", "competition", "risks", "score")
+TECH_FIELDS = ("summary", "highlights", "gaps")
+TECH_RISK_FIELDS = ("highlights", "gaps")
+
+
+def startup_profile(current: Dict) -> Dict[str, Any]:
+    """검색 단계의 기업 기본 정보만 (이름, 기술, 시장, 경쟁사 등)"""
+    return project(current, exclude=DERIVED_FIELDS)
+
+
+def scoring_sections(current: Dict) -> Dict[str, Any]:
+    return {
+        "startup_info": startup_profile(current),
+        "tech_summary": project(current.get("tech_summary"), TECH_FIELDS),
+        "market_analysis": project(current.get("market_eval"), MARKET_FIELDS),
+        "competitor_analysis": current.get("competitor_analysis", {}),
+        "competitive_positioning": current.get("competitive_positioning", {}),
+    }
+
+
+def risk_sections(current: Dict, scores: Dict) -> Dict[str, Any]:
+    # 리스크 평가는 시장 보고서 전문 대신 성장/경쟁/리스크 항목과 기술 강점·공백만 참고
+    startup_info = startup_profile(current)
+    startup_info["market_eval"] = project(current.get("market_eval"), MARKET_RISK_FIELDS)
+    startup_info["tech_summary"] = project(current.get("tech_summary"), TECH_RISK_FIELDS)
+    return {
+        "startup_info": startup_info,
+        "scores": scores,
+        "competitor_analysis": current.get("competitor_analysis", {}),
+    }
+
+
+def _legacy_scoring_sections(current: Dict) -> Dict[str, Any]:
+    """압축 전 기준선 (로그 비교용)"""
+    return {
+        "startup_info": current,
+        "tech_summary": current.get("tech_summary", {}),
+        "market_analysis": current.get("market_eval", {}),
+        "competitor_analysis": current.get("competitor_analysis", {}),
+        "competitive_positioning": current.get("competitive_positioning", {}),
+    }
+
+
+def _legacy_risk_sections(current: Dict, scores: Dict) -> Dict[str, Any]:
+    return {
+        "startup_info": current,
+        "scores": scores,
+        "competitor_analysis": current.get("competitor_analysis", {}),
+    }
 
 # ---------------------------
-# 투자 판단 노드 (단일 스타트업)
+# 단일 호출(fused) 모드 스키마
 # ---------------------------
-async def investment_decision_node(state: Dict) -> Dict:
-    """
-    LangGraph 투자 판단 노드
-    Input: {"current_startup": {...}}
-    Output: {"current_startup": {... + investment_decision}}
-    """
-    state["stage"] = "Investment Decision Node"
-    print(f"진행 단계: {state['stage']}")
+Level = Literal["낮음", "중간", "높음"]
 
-    current = state.get("current_startup", {})
-    if not current:
-        print("current_startup 없음 — 스킵")
-        return state
 
+class ScoreItem(BaseModel):
+    subtotal: int = Field(description="항목 점수")
+    max: int = Field(description="항목 배점")
+
+
+class ScoreBreakdown(BaseModel):
+    educational_efficacy: ScoreItem = Field(description="학습 효과 (max 25)")
+    market_traction: ScoreItem = Field(description="시장 견인력 (max 20)")
+    team: ScoreItem = Field(description="팀 (max 20)")
+    technology: ScoreItem = Field(description="기술 (max 15)")
+    business_model: ScoreItem = Field(description="비즈니스 모델 (max 10)")
+    competition: ScoreItem = Field(description="경쟁력 (max 5)")
+    compliance: ScoreItem = Field(description="규제 준수 (max 5)")
+
+
+class InvestmentScores(BaseModel):
+    scores: ScoreBreakdown
+    total_score: int = Field(description="총점 (0-100)")
+    percentile_rank: str = Field(description="상위 X%")
+
+
+class RiskItem(BaseModel):
+    level: int = Field(description="리스크 수준 (1-10)")
+    likelihood: Level
+    impact: Level
+
+
+class RiskAssessment(BaseModel):
+    market_risk: RiskItem
+    technology_risk: RiskItem
+    execution_risk: RiskItem
+    financial_risk: RiskItem
+    competition_risk: RiskItem
+    regulatory_risk: RiskItem
+    overall_risk_score: float = Field(description="종합 리스크 점수 (1-10)")
+
+
+class InvestmentDecision(BaseModel):
+    decision: str = Field(description="최종 투자 결정 (예: 유치, 보류)")
+    confidence: Level
+    key_strengths: List[str]
+    key_concerns: List[str]
+    investment_thesis: str = Field(description="투자 논리 (2~3문장)")
+    recommended_actions: List[str]
+    valuation_suggestion: str = Field(description="적정 밸류에이션 제안")
+    expected_return: str = Field(description="예상 수익률 (3~5년)")
+    exit_strategy: str = Field(description="엑싯 전략")
+
+
+class InvestmentEvaluation(BaseModel):
+    """투자 점수 + 리스크 평가 + 최종 결정 (3단계 결과를 한 번에)"""
+    investment_scores: InvestmentScores
+    risk_assessment: RiskAssessment
+    investment_decision: InvestmentDecision
+
+
+def fused_mode_enabled() -> bool:
+    """INVESTMENT_FUSED_MODE=1 이면 점수/리스크/결정을 한 번의 structured output 호출로 산출"""
+    return os.getenv("INVESTMENT_FUSED_MODE", "0").lower() in ("1", "true", "yes")
+
+
+async def evaluate_fused(current: Dict) -> Tuple[Dict, Dict, Dict]:
+    """단일 호출 경로 — 스키마 검증 실패 시 예외를 그대로 올려 3단계 경로로 대체"""
+    name = current.get("name", "Unknown Startup")
+    formatted = format_within_budget(
+        INVESTMENT_FUSED_PROMPT.strip(),
+        scoring_sections(current),
+        FUSED_TOKEN_BUDGET,
+        label=f"{name} 투자 판단(fused)",
+        fixed={"startup_name": name},
+    )
+    structured_llm = get_llm().with_structured_output(InvestmentEvaluation)
+    result: InvestmentEvaluation = await structured_llm.ainvoke(formatted)
+    return (
+        result.investment_scores.model_dump(),
+        result.risk_assessment.model_dump(),
+        result.investment_decision.model_dump(),
+    )
+
+
+async def evaluate_three_step(current: Dict) -> Tuple[Dict, Dict, Dict]:
+    """점수 → 리스크 → 결정 순차 호출 (단계별 실패 시 기본값)"""
     name = current.get("name", "Unknown Startup")
 
     # 1️⃣ 투자 점수 계산
     try:
-        prompt_score = PromptTemplate(
-            input_variables=[
-                "startup_info", "tech_summary", "market_analysis",
-                "competitor_analysis", "competitive_positioning"
-            ],
-            template=INVESTMENT_SCORING_PROMPT.strip(),
+        formatted_score = format_within_budget(
+            INVESTMENT_SCORING_PROMPT.strip(),
+            scoring_sections(current),
+            SCORING_TOKEN_BUDGET,
+            label=f"{name} 투자 점수",
+            baseline_sections=_legacy_scoring_sections(current),
         )
-        formatted_score = prompt_score.format(
-            startup_info=json.dumps(current, ensure_ascii=False, indent=2),
-            tech_summary=json.dumps(current.get("tech_summary", {}), ensure_ascii=False, indent=2),
-            market_analysis=json.dumps(current.get("market_eval", {}), ensure_ascii=False, indent=2),
-            competitor_analysis=json.dumps(current.get("competitor_analysis", {}), ensure_ascii=False, indent=2),
-            competitive_positioning=json.dumps(current.get("competitive_positioning", {}), ensure_ascii=False, indent=2),
-        )
-        resp1 = await llm.ainvoke(formatted_score)
-        scores = extract_json(resp1.content, {"total_score": 60})
+        scores = await astream_json(get_llm(), formatted_score, expect="{")
     except Exception as e:
         print(f"투자 점수 계산 실패: {e}")
         scores = {"total_score": 60}
 
     # 2️⃣ 리스크 평가
     try:
-        prompt_risk = PromptTemplate(
-            input_variables=["startup_info", "scores", "competitor_analysis"],
-            template=INVESTMENT_RISK_PROMPT.strip(),
-        )
-        formatted_risk = prompt_risk.format(
-            startup_info=json.dumps(current, ensure_ascii=False, indent=2),
-            scores=json.dumps(scores, ensure_ascii=False, indent=2),
-            competitor_analysis=json.dumps(current.get("competitor_analysis", {}), ensure_ascii=False, indent=2),
+        formatted_risk = format_within_budget(
+            INVESTMENT_RISK_PROMPT.strip(),
+            risk_sections(current, scores),
+            RISK_TOKEN_BUDGET,
+            label=f"{name} 리스크 평가",
+            baseline_sections=_legacy_risk_sections(current, scores),
         )
-        resp2 = await llm.ainvoke(formatted_risk)
-        risks = extract_json(resp2.content, {"overall_risk_score": 5.5})
+        risks = await astream_json(get_llm(), formatted_risk, expect="{")
     except Exception as e:
         print(f"리스크 평가 실패: {e}")
         risks = {"overall_risk_score": 5.5}
@@ -97,14 +223,44 @@ async def investment_decision_node(state: Dict) -> Dict:
         formatted_decision = prompt_decision.format(
             startup_name=name,
             total_score=total_score,
-            risk_assessment=json.dumps(risks, ensure_ascii=False, indent=2),
+            risk_assessment=compact_json(risks),
         )
-        resp3 = await llm.ainvoke(formatted_decision)
-        decision = extract_json(resp3.content, {"decision": "Hold"})
+        decision = await astream_json(get_llm(), formatted_decision, expect="{")
     except Exception as e:
         print(f"투자 의사결정 실패: {e}")
         decision = {"decision": "Hold"}
 
+    return scores, risks, decision
+
+# ---------------------------
+# 투자 판단 노드 (단일 스타트업)
+# ---------------------------
+async def investment_decision_node(state: Dict) -> Dict:
+    """
+    LangGraph 투자 판단 노드
+    Input: {"current_startup": {...}}
+    Output: {"current_startup": {... + investment_decision}}
+    """
+    state["stage"] = "Investment Decision Node"
+    print(f"진행 단계: {state['stage']}")
+
+    current = state.get("current_startup", {})
+    if not current:
+        print("current_startup 없음 — 스킵")
+        return state
+
+    name = current.get("name", "Unknown Startup")
+
+    evaluation: Optional[Tuple[Dict, Dict, Dict]] = None
+    if fused_mode_enabled():
+        try:
+            evaluation = await evaluate_fused(current)
+        except Exception as e:
+            print(f"[{name}] fused 투자 판단 실패 → 3단계 경로로 재시도: {e}")
+    if evaluation is None:
+        evaluation = await evaluate_three_step(current)
+    scores, risks, decision = evaluation
+
     # 결과 병합
     current["investment_scores"] = scores
     current["risk_assessment"] = risks
@@ -0,0 +1,201 @@
+# ai-agent/agents/json_stream.py
+"""
+스트리밍 JSON 추출 (에이전트 공용).
+
+LLM 응답을 토큰 청크 단위로 받으면서 첫 번째 top-level JSON 값({...} 또는 [...])이 닫히는 순간
+스트림을 닫아 나머지 생성(뒤따르는 설명문, 코드 펜스 등)을 중단한다.
+- 값이 닫히기 전에 스트림이 끝나면 TruncatedJSONError, 닫혔지만 파싱할 수 없으면 InvalidJSONError
+  → astream_json이 원인에 맞는 지시를 덧붙여 재시도하고, 그래도 실패하면 예외를 올린다
+    (호출 측은 기본값을 쓰기 전에 실패 원인을 남길 수 있다).
+- 스트리밍 호출은 langchain 캐시를 거치지 않으므로, 모델에 설정된 LLM 캐시(agents/llm_cache.py)를
+  같은 키로 직접 조회/저장한다.
+"""
+import json
+from typing import Any, List, Optional, Sequence, Union
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration
+
+from agents.metrics import REGISTRY
+
+PromptInput = Union[str, Sequence[BaseMessage]]
+
+RETRY_HINTS = {
+    "truncated": "직전 응답이 JSON이 끝나기 전에 잘렸다. 설명 없이 더 간결한 JSON만 다시 출력해.",
+    "invalid": "직전 응답이 올바른 JSON이 아니었다. 지정한 형식의 JSON만 다시 출력해.",
+}
+
+
+class JSONStreamError(ValueError):
+    """LLM 출력에서 JSON 값을 얻지 못함 (text: 받은 원문)"""
+
+    reason = "invalid"
+
+    def __init__(self, message: str, text: str):
+        super().__init__(message)
+        self.text = text
+
+
+class TruncatedJSONError(JSONStreamError):
+    reason = "truncated"
+
+
+class InvalidJSONError(JSONStreamError):
+    reason = "invalid"
+
+
+# ---------------------------
+# 증분 파서
+# ---------------------------
+class JSONStreamParser:
+    """
+    청크를 이어 받으며 첫 top-level JSON 값의 끝을 찾는다.
+    문자열 내부의 괄호/이스케이프는 무시하고, 값 앞의 텍스트(코드 펜스, 설명문)는 건너뛴다.
+    """
+
+    def __init__(self, expect: Optional[str] = None):
+        self.openers = expect or "{["  # "{" 또는 "["로 시작 문자 제한
+        self.text = ""
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """청크 추가 — 값이 닫혔으면 그 JSON 문자열, 아니면 None"""
+        self.text += chunk
+        text = self.text
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._start is None:
+                if ch in self.openers:
+                    self._start, self._depth = i, 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._pos = i + 1
+                    return text[self._start:i + 1]
+        self._pos = len(text)
+        return None
+
+    def finish(self) -> None:
+        """스트림 종료 시점에 값이 닫히지 않았으면 원인별 예외"""
+        if self._start is None:
+            raise InvalidJSONError("응답에 JSON 값이 없음", self.text)
+        raise TruncatedJSONError("JSON 값이 닫히기 전에 응답이 끝남", self.text)
+
+
+def _loads(value: str, text: str) -> Any:
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError as e:
+        raise InvalidJSONError(f"JSON 파싱 실패: {e}", text) from e
+
+
+def extract_json(text: str, expect: Optional[str] = None) -> Any:
+    """완성된 텍스트에서 첫 top-level JSON 값 추출 (실패 시 JSONStreamError)"""
+    parser = JSONStreamParser(expect)
+    value = parser.feed(text)
+    if value is None:
+        parser.finish()
+    return _loads(value, text)
+
+
+# ---------------------------
+# LLM 스트리밍 호출
+# ---------------------------
+def _to_messages(prompt: PromptInput) -> List[BaseMessage]:
+    if isinstance(prompt, str):
+        return [HumanMessage(content=prompt)]
+    return list(prompt)
+
+
+def _with_hint(messages: List[BaseMessage], error: JSONStreamError) -> List[BaseMessage]:
+    """직전 출력과 실패 원인을 덧붙인 재시도 프롬프트"""
+    return [*messages, AIMessage(content=error.text), HumanMessage(content=RETRY_HINTS[error.reason])]
+
+
+def _content_text(content: Any) -> str:
+    """메시지 content (문자열 또는 content block 리스트) → 텍스트"""
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block if isinstance(block, str) else block.get("text", "")
+        for block in content
+        if isinstance(block, (str, dict))
+    )
+
+
+def _cache_entry(llm: BaseChatModel, messages: List[BaseMessage]):
+    """(cache, prompt, llm_string) — langchain이 agenerate 캐시에 쓰는 것과 같은 키"""
+    cache = getattr(llm, "cache", None)
+    if cache is None or isinstance(cache, bool):
+        return None
+    return cache, dumps(messages), llm._get_llm_string()
+
+
+async def _astream_once(llm: BaseChatModel, messages: List[BaseMessage], expect: Optional[str]) -> Any:
+    entry = _cache_entry(llm, messages)
+    if entry is not None:
+        cache, prompt, llm_string = entry
+        cached = await cache.alookup(prompt, llm_string)
+        if cached:
+            try:
+                return extract_json(cached[0].text, expect)
+            except JSONStreamError:
+                pass  # 예전 형식/잘린 응답은 새로 호출
+
+    parser = JSONStreamParser(expect)
+    stream = llm.astream(messages)
+    try:
+        async for chunk in stream:
+            value = parser.feed(_content_text(chunk.content))
+            if value is not None:
+                break
+        else:
+            parser.finish()
+    finally:
+        await stream.aclose()  # 값이 닫히면 나머지 생성 중단
+
+    result = _loads(value, parser.text)
+    if entry is not None:
+        await cache.aupdate(prompt, llm_string, [ChatGeneration(message=AIMessage(content=parser.text))])
+    return result
+
+
+async def astream_json(
+    llm: BaseChatModel,
+    prompt: PromptInput,
+    expect: Optional[str] = None,
+    retries: int = 1,
+) -> Any:
+    """
+    prompt를 스트리밍 호출해 첫 JSON 값을 반환.
+    expect: "{" (객체) / "[" (배열) / None (먼저 나오는 쪽)
+    잘림/형식 오류 시 원인에 맞는 지시를 덧붙여 retries회 재시도, 그래도 실패하면 JSONStreamError.
+    """
+    messages = _to_messages(prompt)
+    attempt_messages = messages
+    for attempt in range(retries + 1):
+        try:
+            return await _astream_once(llm, attempt_messages, expect)
+        except JSONStreamError as e:
+            REGISTRY.inc("llm_json_errors_total", reason=e.reason)
+            if attempt >= retries:
+                raise
+            print(f"[JSON] {e} → 재시도 ({attempt + 1}/{retries})")
+            attempt_messages = _with_hint(messages, e)
@@ -0,0 +1,135 @@
+# ai-agent/agents/llm_cache.py
+"""
+SQLite 기반 LLM 응답 캐시 (langchain BaseCache 구현).
+
+키는 langchain이 넘겨주는 llm_string(모델명, temperature 등 호출 파라미터)과
+렌더링된 프롬프트를 합쳐 sha256으로 만든다. 따라서 템플릿이나 입력이 바뀐
+프롬프트만 다시 호출되고, 나머지는 재실행 시 디스크에서 바로 응답한다.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+
+class SQLiteLLMCache(BaseCache):
+    """TTL + 크기 제한(LRU) SQLite 캐시, 적중/실패 카운터 포함"""
+
+    def __init__(self, path: str, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                llm_string TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self.make_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if not row:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        try:
+            return [loads(item) for item in json.loads(row[0])]
+        except Exception:
+            # 직렬화 형식이 바뀐 항목은 실패로 취급
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = self.make_key(prompt, llm_string)
+        value = json.dumps([dumps(generation) for generation in return_val])
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, llm_string, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, llm_string, value, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """만료 항목 삭제 후, 최대 개수를 넘으면 가장 오래 사용되지 않은 항목부터 삭제"""
+        if self.ttl_seconds is not None:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        if self.max_entries is not None:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,),
+                )
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "entries": entries,
+        }
+
+
+def create_llm_cache_from_env() -> Optional[SQLiteLLMCache]:
+    """
+    LLM_CACHE_ENABLED (기본 1), LLM_CACHE_PATH (기본 .cache/llm_cache.sqlite),
+    LLM_CACHE_TTL 초 (기본 7일, 0 이하면 무제한), LLM_CACHE_MAX_ENTRIES (기본 10000)
+    """
+    if os.getenv("LLM_CACHE_ENABLED", "1").lower() in ("0", "false", "no"):
+        return None
+    ttl = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+    max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+    return SQLiteLLMCache(
+        path=os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite")),
+        ttl_seconds=ttl if ttl > 0 else None,
+        max_entries=max_entries if max_entries > 0 else None,
+    )
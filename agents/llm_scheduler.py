@@ -0,0 +1,419 @@
+# ai-agent/agents/llm_scheduler.py
+"""
+프로세스 전역 OpenAI 호출 스케줄러.
+
+모든 ChatOpenAI 호출(get_chat_model)이 모델별 LLMScheduler 하나를 거친다.
+- 요청/분(RPM), 토큰/분(TPM) token bucket — 토큰은 (추정 입력 토큰 + 출력 예약분)으로 선차감하고
+  응답의 실제 usage로 정산한다. 한 번에 몰리지 않고 quota 상한 근처에서 일정하게 흘려보내는 것이 목적.
+- 적응형 동시성(AIMD): 429를 받으면 한도를 절반으로 줄이고 retry-after(없으면 지수 백오프) 동안
+  전체 요청을 멈춘다. 성공이 한도만큼 이어지면 한도를 1씩 다시 올린다.
+- 대기열은 FIFO이며 대기 요청 수/실행 중 요청 수/현재 한도를 metrics 게이지로 노출한다.
+
+환경변수 (모델별 값은 LLM_RPM_GPT_4O_MINI 처럼 모델명을 대문자/밑줄로 붙여 지정)
+    LLM_SCHEDULER_ENABLED  기본 1
+    LLM_RPM / LLM_TPM      기본 500 / 200000
+    LLM_MAX_CONCURRENCY    기본 16
+    LLM_BURST_SECONDS      버킷 크기(초 단위 quota), 기본 6
+    LLM_COMPLETION_TOKEN_ESTIMATE  max_tokens 미지정 시 출력 예약 토큰, 기본 500
+    LLM_MAX_RETRIES        429/일시 오류 재시도 횟수, 기본 5
+"""
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_openai import ChatOpenAI
+
+from agents.context_budget import count_tokens
+from agents.metrics import REGISTRY
+from agents.resources import get_resource
+
+POLL_INTERVAL = 0.02  # 선두가 아닌 대기 요청의 확인 주기(초)
+MAX_BACKOFF = 60.0
+
+
+def _env_number(name: str, model: str, default: float) -> float:
+    model_key = re.sub(r"[^0-9A-Za-z]+", "_", model).upper()
+    value = os.getenv(f"{name}_{model_key}") or os.getenv(name)
+    return float(value) if value else default
+
+
+def scheduler_enabled() -> bool:
+    return os.getenv("LLM_SCHEDULER_ENABLED", "1").lower() not in ("0", "false", "no")
+
+
+# ---------------------------
+# Token bucket
+# ---------------------------
+class TokenBucket:
+    """분당 한도를 초당 rate로 채우는 버킷 (잠금은 LLMScheduler가 담당)"""
+
+    def __init__(self, per_minute: float, burst_seconds: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount를 꺼낼 수 있을 때까지 남은 시간 (버킷보다 큰 요청은 버킷이 가득 차면 허용)"""
+        self._refill(now)
+        need = min(amount, self.capacity)
+        if self.tokens >= need:
+            return 0.0
+        return (need - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.tokens -= amount  # 음수 허용 → 다음 요청들이 그만큼 더 기다림
+
+    def settle(self, delta: float) -> None:
+        """실제 사용량 - 예약량 정산 (양수면 추가 차감, 음수면 환급)"""
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class Reservation:
+    def __init__(self, tokens: int):
+        self.tokens = tokens
+        self.closed = False
+
+
+# ---------------------------
+# 스케줄러
+# ---------------------------
+class LLMScheduler:
+    def __init__(
+        self,
+        model: str,
+        rpm: float,
+        tpm: float,
+        max_concurrency: int,
+        burst_seconds: float = 6.0,
+        max_retries: int = 5,
+    ):
+        self.model = model
+        self.requests = TokenBucket(rpm, burst_seconds)
+        self.tokens = TokenBucket(tpm, burst_seconds)
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = self.max_concurrency
+        self.max_retries = max_retries
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._successes = 0
+        self._queue: deque = deque()
+        self._lock = threading.Lock()
+        self._publish()
+
+    @classmethod
+    def from_env(cls, model: str) -> "LLMScheduler":
+        return cls(
+            model,
+            rpm=_env_number("LLM_RPM", model, 500),
+            tpm=_env_number("LLM_TPM", model, 200_000),
+            max_concurrency=int(_env_number("LLM_MAX_CONCURRENCY", model, 16)),
+            burst_seconds=_env_number("LLM_BURST_SECONDS", model, 6),
+            max_retries=int(_env_number("LLM_MAX_RETRIES", model, 5)),
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "model": self.model,
+                "queue_depth": len(self._queue),
+                "in_flight": self.in_flight,
+                "concurrency_limit": self.limit,
+                "paused_s": max(0.0, self.paused_until - time.monotonic()),
+            }
+
+    def _publish(self) -> None:
+        REGISTRY.set("llm_scheduler_queue_depth", len(self._queue), model=self.model)
+        REGISTRY.set("llm_scheduler_in_flight", self.in_flight, model=self.model)
+        REGISTRY.set("llm_scheduler_concurrency_limit", self.limit, model=self.model)
+
+    # --- 획득 ---
+    def _try_acquire(self, ticket: object, tokens: int) -> float:
+        """획득하면 0, 아니면 다시 시도할 때까지 기다릴 시간"""
+        with self._lock:
+            if self._queue[0] is not ticket:
+                return POLL_INTERVAL
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+            if self.in_flight >= self.limit:
+                return POLL_INTERVAL
+            wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+            if wait > 0:
+                return wait
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self.in_flight += 1
+            self._queue.popleft()
+            self._publish()
+            return 0.0
+
+    def _enqueue(self) -> object:
+        ticket = object()
+        with self._lock:
+            self._queue.append(ticket)
+            self._publish()
+        return ticket
+
+    def _dequeue(self, ticket: object) -> None:
+        with self._lock:
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+                self._publish()
+
+    def _granted(self, tokens: int, started: float) -> Reservation:
+        REGISTRY.observe("llm_scheduler_wait_seconds", time.monotonic() - started, model=self.model)
+        return Reservation(tokens)
+
+    async def areserve(self, tokens: int) -> Reservation:
+        started = time.monotonic()
+        ticket = self._enqueue()
+        try:
+            while True:
+                wait = self._try_acquire(ticket, tokens)
+                if wait == 0:
+                    return self._granted(tokens, started)
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+
+    def reserve(self, tokens: int) -> Reservation:
+        started = time.monotonic()
+        ticket = self._enqueue()
+        try:
+            while True:
+                wait = self._try_acquire(ticket, tokens)
+                if wait == 0:
+                    return self._granted(tokens, started)
+                time.sleep(wait)
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+
+    # --- 반환 ---
+    def complete(self, reservation: Reservation, used_tokens: int = 0) -> None:
+        """성공 (또는 스트림 조기 종료) — 토큰 정산 후 동시성 한도 가산 증가"""
+        if reservation.closed:
+            return
+        reservation.closed = True
+        with self._lock:
+            self.in_flight -= 1
+            if used_tokens:
+                self.tokens.settle(used_tokens - reservation.tokens)
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.max_concurrency:
+                self.limit += 1
+                self._successes = 0
+            self._publish()
+
+    def release(self, reservation: Reservation) -> None:
+        """결과 없이 빠져나간 요청(취소 등)의 슬롯만 반환"""
+        if reservation.closed:
+            return
+        reservation.closed = True
+        with self._lock:
+            self.in_flight -= 1
+            self._publish()
+
+    def fail(self, reservation: Reservation, error: BaseException, attempt: int) -> Optional[float]:
+        """실패 — 재시도할 대기 시간(초) 반환, 재시도 대상이 아니면 None"""
+        self.release(reservation)
+        status = getattr(error, "status_code", None)
+        if status == 429:
+            if getattr(error, "code", None) == "insufficient_quota":
+                return None  # 결제 한도 초과는 기다려도 풀리지 않음
+            REGISTRY.inc("llm_rate_limited_total", model=self.model)
+            if attempt >= self.max_retries:
+                return None
+            delay = _retry_after(error) or _backoff(attempt)
+            with self._lock:
+                now = time.monotonic()
+                # 같은 정지 구간에 몰려 온 429들은 한 번만 감소 (한도가 1까지 무너지는 것 방지)
+                if now >= self.paused_until:
+                    self.limit = max(1, self.limit // 2)
+                    self._successes = 0
+                    print(f"[LLM 스케줄러] {self.model} 429 → 동시 요청 {self.limit}, {delay:.1f}s 대기")
+                self.paused_until = max(self.paused_until, now + delay)
+                self._publish()
+            return delay
+
+        transient = (status is not None and status >= 500) or type(error).__name__ in (
+            "APIConnectionError",
+            "APITimeoutError",
+        )
+        if transient and attempt < self.max_retries:
+            return _backoff(attempt)
+        return None
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def _backoff(attempt: int) -> float:
+    """지수 백오프 + jitter (동시에 실패한 요청들이 같은 시점에 몰리지 않도록)"""
+    base = min(MAX_BACKOFF, 2.0 ** attempt)
+    return base * (0.5 + random.random() / 2)
+
+
+def get_scheduler(model: str) -> LLMScheduler:
+    return get_resource(("llm_scheduler", model), lambda: LLMScheduler.from_env(model))
+
+
+# ---------------------------
+# ChatOpenAI 연동
+# ---------------------------
+def estimate_prompt_tokens(messages: List[BaseMessage]) -> int:
+    """메시지 본문 토큰 + 메시지당 포맷 오버헤드"""
+    return sum(count_tokens(str(m.content)) + 4 for m in messages)
+
+
+def _result_tokens(result: ChatResult) -> int:
+    usage = (result.llm_output or {}).get("token_usage") or {}
+    if usage.get("total_tokens"):
+        return int(usage["total_tokens"])
+    for generation in result.generations:
+        metadata = getattr(generation.message, "usage_metadata", None)
+        if metadata:
+            return int(metadata.get("total_tokens", 0))
+    return 0
+
+
+def _chunk_tokens(chunk: ChatGenerationChunk) -> int:
+    metadata = getattr(chunk.message, "usage_metadata", None)
+    return int(metadata.get("total_tokens", 0)) if metadata else 0
+
+
+class ScheduledChatOpenAI(ChatOpenAI):
+    """
+    모든 요청을 모델별 LLMScheduler로 통과시키는 ChatOpenAI.
+    429 재시도는 스케줄러가 담당하므로 max_retries=0으로 생성한다 (SDK 내부 재시도가 429를 가리지 않도록).
+    캐시 적중은 _generate 이전에 처리되므로 quota를 소모하지 않는다.
+    """
+
+    def _scheduler(self) -> LLMScheduler:
+        return get_scheduler(self.model_name)
+
+    def _estimate(self, messages: List[BaseMessage]) -> int:
+        completion = self.max_tokens or int(os.getenv("LLM_COMPLETION_TOKEN_ESTIMATE", "500"))
+        return estimate_prompt_tokens(messages) + completion
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.streaming:
+            # ChatOpenAI가 _astream으로 위임 → 스케줄링은 _astream에서 한 번만
+            return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        scheduler = self._scheduler()
+        estimate = self._estimate(messages)
+        attempt = 0
+        while True:
+            reservation = await scheduler.areserve(estimate)
+            try:
+                result = await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as e:
+                delay = scheduler.fail(reservation, e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            else:
+                scheduler.complete(reservation, _result_tokens(result))
+                return result
+            finally:
+                scheduler.release(reservation)  # 취소 등으로 빠져나간 경우 슬롯 반환
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.streaming:
+            return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        scheduler = self._scheduler()
+        estimate = self._estimate(messages)
+        attempt = 0
+        while True:
+            reservation = scheduler.reserve(estimate)
+            try:
+                result = super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as e:
+                delay = scheduler.fail(reservation, e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                time.sleep(delay)
+                continue
+            else:
+                scheduler.complete(reservation, _result_tokens(result))
+                return result
+            finally:
+                scheduler.release(reservation)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        scheduler = self._scheduler()
+        estimate = self._estimate(messages)
+        attempt = 0
+        while True:
+            reservation = await scheduler.areserve(estimate)
+            used = 0
+            started = False
+            try:
+                async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    started = True
+                    used += _chunk_tokens(chunk)
+                    yield chunk
+            except Exception as e:
+                delay = scheduler.fail(reservation, e, attempt)
+                if delay is None or started:  # 이미 내보낸 청크가 있으면 재시도 불가
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            finally:
+                # 정상 종료 또는 소비자가 스트림을 중단(aclose)한 경우
+                scheduler.complete(reservation, used)
+            return
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        scheduler = self._scheduler()
+        estimate = self._estimate(messages)
+        attempt = 0
+        while True:
+            reservation = scheduler.reserve(estimate)
+            used = 0
+            started = False
+            try:
+                for chunk in super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    started = True
+                    used += _chunk_tokens(chunk)
+                    yield chunk
+            except Exception as e:
+                delay = scheduler.fail(reservation, e, attempt)
+                if delay is None or started:
+                    raise
+                attempt += 1
+                time.sleep(delay)
+                continue
+            finally:
+                scheduler.complete(reservation, used)
+            return
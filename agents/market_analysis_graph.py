@@ -3,60 +3,154 @@ load_dotenv()
 
 import os
 import json
-from typing import Annotated, Sequence, TypedDict, Dict, Any, List, Literal
+import asyncio
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Annotated, Sequence, TypedDict, Dict, Any, List, Literal, Union
 from pydantic import BaseModel, Field
 
 # LangChain imports
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
 from langchain_core.prompts import PromptTemplate, ChatPromptTemplate
-from langchain_openai import ChatOpenAI
+from langchain_core.runnables import RunnableLambda
 
 # LangGraph imports
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.message import add_messages
 
-# Vector DB (faiss) and document loader imports
-from langchain_community.vectorstores import FAISS
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import DirectoryLoader, PyPDFLoader
-from langchain_core.tools.retriever import create_retriever_tool
-
-# External web search tool
-from langchain_community.tools import DuckDuckGoSearchRun
-
-# HuggingFace sentence transformers
-from langchain_huggingface import HuggingFaceEmbeddings
-
 # =============================================================================
 # 1. 데이터 로딩 및 벡터스토어 세팅
 # =============================================================================
-DATA_DIR = "data"
-PERSIST_PATH = "db_faiss"
-EMBEDDINGS_MODEL = HuggingFaceEmbeddings(
-    model_name="dragonkue/multilingual-e5-small-ko",
-    model_kwargs={"device": "cpu"}
-)
-
-def build_vector_db():
-    loader = DirectoryLoader(DATA_DIR, glob="**/*.pdf", loader_cls=PyPDFLoader)
-    docs = loader.load()
-    splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
-    docs_split = splitter.split_documents(docs)
-    db = FAISS.from_documents(docs_split, EMBEDDINGS_MODEL)
-    db.save_local(PERSIST_PATH)
-    return db
-
-if os.path.exists(PERSIST_PATH):
-    db = FAISS.load_local(
-        PERSIST_PATH, 
-        EMBEDDINGS_MODEL,
-        allow_dangerous_deserialization=True
-    )
-else:
-    db = build_vector_db()
+# 임베딩 모델, FAISS 벡터 DB(agents/vector_store.py), 검색 도구, LLM은
+# import 시점이 아니라 최초 사용 시점에 생성되어 공유됨 (agents/resources.py)
+from agents.metrics import timed_node
+from agents.resources import get_chat_model, get_embeddings, get_vector_db
+from agents.search_cache import acached_search, cached_search
+
+RETRIEVAL_K = 5
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))
+RETRIEVAL_BATCH_WINDOW = float(os.getenv("RETRIEVAL_BATCH_WINDOW_MS", "10")) / 1000
+RETRIEVAL_MAX_BATCH = int(os.getenv("RETRIEVAL_MAX_BATCH", "32"))
+
+# 쿼리 임베딩 LRU 캐시: 반복되는 "{query} {query_type} 시장 분석" 문자열은 인코더를 건너뜀
+_query_embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+_query_embeddings_lock = threading.Lock()
+
+def _embed_query_texts(embeddings: Any, queries: List[str]) -> List[List[float]]:
+    """
+    embed_query와 같은 방식(쿼리용 encode 옵션/prompt)으로 임베딩.
+    HuggingFaceEmbeddings(query_encode_kwargs 지원)는 한 번의 배치 인코딩, 그 외에는 쿼리마다 embed_query.
+    """
+    query_kwargs = getattr(embeddings, "query_encode_kwargs", None)
+    if query_kwargs is not None and hasattr(embeddings, "_embed"):
+        return embeddings._embed(queries, query_kwargs or embeddings.encode_kwargs)
+    return [embeddings.embed_query(q) for q in queries]
+
+def embed_queries(queries: List[str]) -> List[List[float]]:
+    """캐시에 없는 쿼리만 한 번의 배치 인코딩으로 임베딩"""
+    vectors: Dict[str, List[float]] = {}
+    with _query_embeddings_lock:
+        for q in dict.fromkeys(queries):
+            if q in _query_embeddings:
+                _query_embeddings.move_to_end(q)
+                vectors[q] = _query_embeddings[q]
+    missing = [q for q in dict.fromkeys(queries) if q not in vectors]
+    if missing:
+        vectors.update(zip(missing, _embed_query_texts(get_embeddings(), missing)))
+        with _query_embeddings_lock:
+            for q in missing:
+                _query_embeddings[q] = vectors[q]
+            while len(_query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                _query_embeddings.popitem(last=False)
+    return [vectors[q] for q in queries]
+
+def retrieve_batch(queries: List[str], k: int = RETRIEVAL_K) -> List[List[Any]]:
+    """여러 쿼리를 한 번의 임베딩 패스 + 한 번의 index.search로 검색 (CPU 작업, 동기)"""
+    if not queries:
+        return []
+    import numpy as np
+
+    db = get_vector_db()
+    matrix = np.asarray(embed_queries(queries), dtype=np.float32)
+    if getattr(db, "_normalize_L2", False):
+        import faiss
+        faiss.normalize_L2(matrix)
+    _, indices = db.index.search(matrix, k)
+
+    results = []
+    for row in indices:
+        docs = []
+        for i in row:
+            if i == -1:
+                continue
+            doc = db.docstore.search(db.index_to_docstore_id[int(i)])
+            if not isinstance(doc, str):
+                docs.append(doc)
+        results.append(docs)
+    return results
+
+class _RetrievalBatcher:
+    """
+    동시에 들어온 aretrieve 요청을 짧은 대기(window) 후 하나의 배치로 묶어 executor에서 실행.
+    대기 중인 future/타이머는 이벤트 루프에 묶이므로 루프마다 하나씩 만든다 (_batcher_for_loop).
+    """
 
-retriever = db.as_retriever(search_type="similarity", search_kwargs={"k": 5})
-search_tool = DuckDuckGoSearchRun()
+    def __init__(self, window: float, max_batch: int):
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Any] = []
+        self._flush_handle = None
+        self._tasks: set = set()  # 실행 중인 배치 task 참조 유지 (GC로 중단되지 않도록)
+
+    async def retrieve(self, query: str) -> List[Any]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((query, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Any]) -> None:
+        try:
+            results = await asyncio.to_thread(retrieve_batch, [q for q, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), docs in zip(batch, results):
+            if not future.done():
+                future.set_result(docs)
+
+_retrieval_batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _RetrievalBatcher]" = weakref.WeakKeyDictionary()
+_retrieval_batchers_lock = threading.Lock()
+
+def _batcher_for_loop() -> _RetrievalBatcher:
+    """현재 이벤트 루프의 batcher (asyncio.run을 여러 번 호출해도 닫힌 루프의 상태를 이어받지 않음)"""
+    loop = asyncio.get_running_loop()
+    with _retrieval_batchers_lock:
+        batcher = _retrieval_batchers.get(loop)
+        if batcher is None:
+            batcher = _RetrievalBatcher(RETRIEVAL_BATCH_WINDOW, RETRIEVAL_MAX_BATCH)
+            _retrieval_batchers[loop] = batcher
+        return batcher
+
+async def aretrieve(query: str) -> List[Any]:
+    """단일 쿼리 비동기 검색 — 같은 시점의 다른 스타트업 요청과 자동으로 배치 처리"""
+    return await _batcher_for_loop().retrieve(query)
 
 # =============================================================================
 # 2. 고도화된 상태 정의 (AgentState)
@@ -81,8 +175,12 @@ class MarketAnalysisState(TypedDict):
 # 3. LLM 모델 정의
 # =============================================================================
 MODEL_NAME = "gpt-4o-mini"
-llm = ChatOpenAI(temperature=0.3, model=MODEL_NAME, streaming=True)
-llm_creative = ChatOpenAI(temperature=0.7, model=MODEL_NAME, streaming=True)
+
+def get_llm():
+    return get_chat_model(MODEL_NAME, temperature=0.3, streaming=True)
+
+def get_llm_creative():
+    return get_chat_model(MODEL_NAME, temperature=0.7, streaming=True)
 
 # =============================================================================
 # 4. 쿼리 분류 및 라우팅을 위한 Pydantic 모델
@@ -100,90 +198,21 @@ class QueryClassification(BaseModel):
     )
 
 # =============================================================================
-# 5. 노드 함수들 정의
+# 5. 프롬프트 정의
 # =============================================================================
 
-def classify_query_node(state: MarketAnalysisState) -> Dict[str, Any]:
-    """
-    Step 1: 사용자 쿼리를 분석하여 분류하고 분석 전략 결정
-    """
-    query = state["query"]
-    
-    classification_prompt = ChatPromptTemplate.from_messages([
-        ("system", """당신은 시장 분석 쿼리 분류 전문가입니다. 
+CLASSIFICATION_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """당신은 시장 분석 쿼리 분류 전문가입니다. 
 사용자의 쿼리를 분석하여 다음을 판단하세요:
 1. query_type: 주요 관심사 (market_size, trend, competition, forecast, general)
 2. needs_web_search: 최신 데이터가 필요한지 (true/false)
 3. analysis_depth: 필요한 분석 깊이 (basic, intermediate, advanced)"""),
-        ("human", "{query}")
-    ])
-    
-    structured_llm = llm.with_structured_output(QueryClassification)
-    classification = structured_llm.invoke(classification_prompt.format_messages(query=query))
-    
-    return {
-        "query_type": classification.query_type,
-        "needs_web_search": classification.needs_web_search,
-        "analysis_depth": classification.analysis_depth,
-        "messages": [AIMessage(content=f"쿼리 분석 완료: {classification.query_type} (깊이: {classification.analysis_depth})")]
-    }
-
-def retrieve_internal_data_node(state: MarketAnalysisState) -> Dict[str, Any]:
-    """
-    Step 2: 내부 벡터 DB에서 관련 데이터 검색
-    """
-    query = state["query"]
-    query_type = state.get("query_type", "general")
-    
-    # 쿼리 타입에 따른 검색 쿼리 확장
-    enhanced_query = f"{query} {query_type} 시장 분석"
-    
-    rag_docs = retriever.invoke(enhanced_query)
-    rag_data = "\n\n---\n\n".join([
-        f"[문서 {i+1}]\n{doc.page_content[:600]}" 
-        for i, doc in enumerate(rag_docs)
-    ]) if rag_docs else "관련 내부 데이터 없음"
-    
-    return {
-        "rag_data": rag_data[:3000],
-        "messages": [AIMessage(content=f"내부 DB 검색 완료: {len(rag_docs)}개 문서 발견")]
-    }
+    ("human", "{query}")
+])
 
-def web_search_node(state: MarketAnalysisState) -> Dict[str, Any]:
-    """
-    Step 3: 외부 웹 검색 (조건부 실행)
-    """
-    query = state["query"]
-    
-    # 다양한 검색 쿼리 구성
-    search_queries = [
-        f"{query} 시장 규모 전망 2024 2025",
-        f"{query} 산업 동향 리포트",
-        f"{query} 경쟁사 분석"
-    ]
-    
-    web_results = []
-    for sq in search_queries[:2]:  # 최대 2개 쿼리만 실행
-        try:
-            result = search_tool.run(sq)
-            web_results.append(f"[검색: {sq}]\n{result[:800]}")
-        except:
-            continue
-    
-    web_data = "\n\n---\n\n".join(web_results) if web_results else "웹 검색 결과 없음"
-    
-    return {
-        "web_data": web_data[:2500],
-        "messages": [AIMessage(content="웹 검색 완료")]
-    }
-
-def analyze_market_size_node(state: MarketAnalysisState) -> Dict[str, Any]:
-    """
-    Step 4a: 시장 규모 분석
-    """
-    prompt = PromptTemplate(
-        input_variables=["query", "rag_data", "web_data"],
-        template="""시장 규모 분석 전문가로서, 다음 정보를 바탕으로 시장 규모를 분석하세요:
+MARKET_SIZE_PROMPT = PromptTemplate(
+    input_variables=["query", "rag_data", "web_data"],
+    template="""시장 규모 분석 전문가로서, 다음 정보를 바탕으로 시장 규모를 분석하세요:
 
 쿼리: {query}
 
@@ -200,28 +229,11 @@ def analyze_market_size_node(state: MarketAnalysisState) -> Dict[str, Any]:
 4. 지역별 시장 분포 (해당시)
 
 간결하고 정량적인 분석을 제공하세요."""
-    )
-    
-    response = llm.invoke([HumanMessage(
-        content=prompt.format(
-            query=state["query"],
-            rag_data=state.get("rag_data", "N/A"),
-            web_data=state.get("web_data", "N/A")
-        )
-    )])
-    
-    return {
-        "market_size": response.content,
-        "messages": [AIMessage(content="시장 규모 분석 완료")]
-    }
+)
 
-def analyze_growth_trend_node(state: MarketAnalysisState) -> Dict[str, Any]:
-    """
-    Step 4b: 성장 추세 및 트렌드 분석
-    """
-    prompt = PromptTemplate(
-        input_variables=["query", "rag_data", "web_data"],
-        template="""성장 트렌드 분석 전문가로서, 다음 정보를 바탕으로 시장 성장 추세를 분석하세요:
+GROWTH_TREND_PROMPT = PromptTemplate(
+    input_variables=["query", "rag_data", "web_data"],
+    template="""성장 트렌드 분석 전문가로서, 다음 정보를 바탕으로 시장 성장 추세를 분석하세요:
 
 쿼리: {query}
 
@@ -238,28 +250,11 @@ def analyze_growth_trend_node(state: MarketAnalysisState) -> Dict[str, Any]:
 4. 최신 트렌드 및 혁신
 
 구체적인 수치와 근거를 포함하세요."""
-    )
-    
-    response = llm.invoke([HumanMessage(
-        content=prompt.format(
-            query=state["query"],
-            rag_data=state.get("rag_data", "N/A"),
-            web_data=state.get("web_data", "N/A")
-        )
-    )])
-    
-    return {
-        "growth_trend": response.content,
-        "messages": [AIMessage(content="성장 추세 분석 완료")]
-    }
+)
 
-def analyze_competition_node(state: MarketAnalysisState) -> Dict[str, Any]:
-    """
-    Step 4c: 경쟁 환경 분석
-    """
-    prompt = PromptTemplate(
-        input_variables=["query", "rag_data", "web_data"],
-        template="""경쟁 분석 전문가로서, 다음 정보를 바탕으로 경쟁 환경을 분석하세요:
+COMPETITION_PROMPT = PromptTemplate(
+    input_variables=["query", "rag_data", "web_data"],
+    template="""경쟁 분석 전문가로서, 다음 정보를 바탕으로 경쟁 환경을 분석하세요:
 
 쿼리: {query}
 
@@ -276,28 +271,11 @@ def analyze_competition_node(state: MarketAnalysisState) -> Dict[str, Any]:
 4. 경쟁 강도 평가
 
 Porter의 5 Forces 관점을 활용하여 분석하세요."""
-    )
-    
-    response = llm.invoke([HumanMessage(
-        content=prompt.format(
-            query=state["query"],
-            rag_data=state.get("rag_data", "N/A"),
-            web_data=state.get("web_data", "N/A")
-        )
-    )])
-    
-    return {
-        "competition": response.content,
-        "messages": [AIMessage(content="경쟁 환경 분석 완료")]
-    }
+)
 
-def analyze_risk_factors_node(state: MarketAnalysisState) -> Dict[str, Any]:
-    """
-    Step 4d: 리스크 요인 분석
-    """
-    prompt = PromptTemplate(
-        input_variables=["query", "market_size", "growth_trend", "competition"],
-        template="""리스크 분석 전문가로서, 다음 분석 결과를 종합하여 주요 리스크 요인을 식별하세요:
+RISK_FACTORS_PROMPT = PromptTemplate(
+    input_variables=["query", "market_size", "growth_trend", "competition"],
+    template="""리스크 분석 전문가로서, 다음 분석 결과를 종합하여 주요 리스크 요인을 식별하세요:
 
 시장: {query}
 
@@ -317,44 +295,26 @@ def analyze_risk_factors_node(state: MarketAnalysisState) -> Dict[str, Any]:
 4. 경쟁 리스크 (신규 진입자, 가격 경쟁)
 
 각 리스크를 높음/중간/낮음으로 평가하고 근거를 제시하세요."""
-    )
-    
-    response = llm.invoke([HumanMessage(
-        content=prompt.format(
-            query=state["query"],
-            market_size=state.get("market_size", "N/A"),
-            growth_trend=state.get("growth_trend", "N/A"),
-            competition=state.get("competition", "N/A")
-        )
-    )])
-    
-    return {
-        "risk_factors": response.content,
-        "messages": [AIMessage(content="리스크 요인 분석 완료")]
-    }
+)
 
-def calculate_market_score_node(state: MarketAnalysisState) -> Dict[str, Any]:
-    """
-    Step 5: 종합 시장성 점수 산출
-    """
-    class MarketScore(BaseModel):
-        """시장성 점수 모델"""
-        market_size_score: int = Field(description="시장 규모 점수 (0-25)")
-        growth_score: int = Field(description="성장성 점수 (0-30)")
-        competition_score: int = Field(description="경쟁 환경 점수 (0-25, 낮은 경쟁=높은 점수)")
-        risk_score: int = Field(description="리스크 점수 (0-20, 낮은 리스크=높은 점수)")
-        total_score: int = Field(description="총점 (0-100)")
-        justification: str = Field(description="점수 산정 근거")
-    
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", """당신은 시장성 평가 전문가입니다. 
+class MarketScore(BaseModel):
+    """시장성 점수 모델"""
+    market_size_score: int = Field(description="시장 규모 점수 (0-25)")
+    growth_score: int = Field(description="성장성 점수 (0-30)")
+    competition_score: int = Field(description="경쟁 환경 점수 (0-25, 낮은 경쟁=높은 점수)")
+    risk_score: int = Field(description="리스크 점수 (0-20, 낮은 리스크=높은 점수)")
+    total_score: int = Field(description="총점 (0-100)")
+    justification: str = Field(description="점수 산정 근거")
+
+MARKET_SCORE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """당신은 시장성 평가 전문가입니다. 
 다음 분석 결과를 바탕으로 객관적인 시장성 점수를 산출하세요:
 - 시장 규모 점수: 0-25점 (규모가 클수록 높음)
 - 성장성 점수: 0-30점 (성장률이 높을수록 높음)
 - 경쟁 환경 점수: 0-25점 (경쟁이 약할수록 높음)
 - 리스크 점수: 0-20점 (리스크가 낮을수록 높음)
 합계: 0-100점"""),
-        ("human", """
+    ("human", """
 시장: {query}
 
 시장 규모: {market_size}
@@ -363,30 +323,12 @@ def calculate_market_score_node(state: MarketAnalysisState) -> Dict[str, Any]:
 리스크 요인: {risk_factors}
 
 위 정보를 바탕으로 점수를 산출하세요.""")
-    ])
-    
-    structured_llm = llm.with_structured_output(MarketScore)
-    score_result = structured_llm.invoke(prompt.format_messages(
-        query=state["query"],
-        market_size=state.get("market_size", "N/A"),
-        growth_trend=state.get("growth_trend", "N/A"),
-        competition=state.get("competition", "N/A"),
-        risk_factors=state.get("risk_factors", "N/A")
-    ))
-    
-    return {
-        "final_score": score_result.total_score,
-        "messages": [AIMessage(content=f"시장성 점수 산출 완료: {score_result.total_score}/100점\n\n{score_result.justification}")]
-    }
+])
 
-def generate_final_report_node(state: MarketAnalysisState) -> Dict[str, Any]:
-    """
-    Step 6: 최종 종합 리포트 생성
-    """
-    prompt = PromptTemplate(
-        input_variables=["query", "market_size", "growth_trend", "competition", 
-                        "risk_factors", "final_score", "analysis_depth"],
-        template="""종합 시장 분석 리포트를 작성하세요.
+FINAL_REPORT_PROMPT = PromptTemplate(
+    input_variables=["query", "market_size", "growth_trend", "competition", 
+                    "risk_factors", "final_score", "analysis_depth"],
+    template="""종합 시장 분석 리포트를 작성하세요.
 
 시장: {query}
 분석 깊이: {analysis_depth}
@@ -416,10 +358,228 @@ def generate_final_report_node(state: MarketAnalysisState) -> Dict[str, Any]:
 5. 결론
 
 명확하고 실행 가능한 인사이트를 제공하세요."""
-    )
+)
+
+# =============================================================================
+# 6. 노드 함수들 정의 (동기 버전: graph.invoke / 비동기 버전: graph.ainvoke)
+# =============================================================================
+
+def _classification_result(classification: QueryClassification) -> Dict[str, Any]:
+    return {
+        "query_type": classification.query_type,
+        "needs_web_search": classification.needs_web_search,
+        "analysis_depth": classification.analysis_depth,
+        "messages": [AIMessage(content=f"쿼리 분석 완료: {classification.query_type} (깊이: {classification.analysis_depth})")]
+    }
+
+def classify_query_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """
+    Step 1: 사용자 쿼리를 분석하여 분류하고 분석 전략 결정
+    """
+    structured_llm = get_llm().with_structured_output(QueryClassification)
+    classification = structured_llm.invoke(CLASSIFICATION_PROMPT.format_messages(query=state["query"]))
+    return _classification_result(classification)
+
+async def aclassify_query_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """Step 1 (async)"""
+    structured_llm = get_llm().with_structured_output(QueryClassification)
+    classification = await structured_llm.ainvoke(CLASSIFICATION_PROMPT.format_messages(query=state["query"]))
+    return _classification_result(classification)
+
+def _enhanced_query(state: MarketAnalysisState) -> str:
+    # 쿼리 타입에 따른 검색 쿼리 확장
+    return f"{state['query']} {state.get('query_type', 'general')} 시장 분석"
+
+def _retrieval_result(rag_docs: List[Any]) -> Dict[str, Any]:
+    rag_data = "\n\n---\n\n".join([
+        f"[문서 {i+1}]\n{doc.page_content[:600]}" 
+        for i, doc in enumerate(rag_docs)
+    ]) if rag_docs else "관련 내부 데이터 없음"
+    
+    return {
+        "rag_data": rag_data[:3000],
+        "messages": [AIMessage(content=f"내부 DB 검색 완료: {len(rag_docs)}개 문서 발견")]
+    }
+
+def retrieve_internal_data_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """
+    Step 2: 내부 벡터 DB에서 관련 데이터 검색
+    """
+    return _retrieval_result(retrieve_batch([_enhanced_query(state)])[0])
+
+async def aretrieve_internal_data_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """Step 2 (async) — 임베딩/FAISS 검색은 배치로 묶어 executor에서 실행"""
+    rag_docs = await aretrieve(_enhanced_query(state))
+    return _retrieval_result(rag_docs)
+
+def _web_search_queries(state: MarketAnalysisState) -> List[str]:
+    query = state["query"]
     
-    response = llm_creative.invoke([HumanMessage(
+    # 다양한 검색 쿼리 구성
+    search_queries = [
+        f"{query} 시장 규모 전망 2024 2025",
+        f"{query} 산업 동향 리포트",
+        f"{query} 경쟁사 분석"
+    ]
+    return search_queries[:2]  # 최대 2개 쿼리만 실행
+
+def _web_search_result(web_results: List[str]) -> Dict[str, Any]:
+    web_data = "\n\n---\n\n".join(web_results) if web_results else "웹 검색 결과 없음"
+    
+    return {
+        "web_data": web_data[:2500],
+        "messages": [AIMessage(content="웹 검색 완료")]
+    }
+
+def web_search_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """
+    Step 3: 외부 웹 검색 (조건부 실행)
+    """
+    web_results = []
+    for sq in _web_search_queries(state):
+        try:
+            result = cached_search("duckduckgo", sq)
+            web_results.append(f"[검색: {sq}]\n{result[:800]}")
+        except:
+            continue
+    return _web_search_result(web_results)
+
+async def aweb_search_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """Step 3 (async) — 검색 쿼리를 동시에 실행"""
+    queries = _web_search_queries(state)
+    results = await asyncio.gather(
+        *(acached_search("duckduckgo", sq) for sq in queries),
+        return_exceptions=True
+    )
+    web_results = [
+        f"[검색: {sq}]\n{result[:800]}"
+        for sq, result in zip(queries, results)
+        if not isinstance(result, BaseException)
+    ]
+    return _web_search_result(web_results)
+
+def _analysis_messages(prompt: PromptTemplate, state: MarketAnalysisState) -> List[BaseMessage]:
+    """시장 규모/성장/경쟁 분석 공통 입력 (query, rag_data, web_data)"""
+    return [HumanMessage(
         content=prompt.format(
+            query=state["query"],
+            rag_data=state.get("rag_data", "N/A"),
+            web_data=state.get("web_data", "N/A")
+        )
+    )]
+
+def analyze_market_size_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """
+    Step 4a: 시장 규모 분석
+    """
+    response = get_llm().invoke(_analysis_messages(MARKET_SIZE_PROMPT, state))
+    return {
+        "market_size": response.content,
+        "messages": [AIMessage(content="시장 규모 분석 완료")]
+    }
+
+async def aanalyze_market_size_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """Step 4a (async)"""
+    response = await get_llm().ainvoke(_analysis_messages(MARKET_SIZE_PROMPT, state))
+    return {
+        "market_size": response.content,
+        "messages": [AIMessage(content="시장 규모 분석 완료")]
+    }
+
+def analyze_growth_trend_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """
+    Step 4b: 성장 추세 및 트렌드 분석
+    """
+    response = get_llm().invoke(_analysis_messages(GROWTH_TREND_PROMPT, state))
+    return {
+        "growth_trend": response.content,
+        "messages": [AIMessage(content="성장 추세 분석 완료")]
+    }
+
+async def aanalyze_growth_trend_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """Step 4b (async)"""
+    response = await get_llm().ainvoke(_analysis_messages(GROWTH_TREND_PROMPT, state))
+    return {
+        "growth_trend": response.content,
+        "messages": [AIMessage(content="성장 추세 분석 완료")]
+    }
+
+def analyze_competition_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """
+    Step 4c: 경쟁 환경 분석
+    """
+    response = get_llm().invoke(_analysis_messages(COMPETITION_PROMPT, state))
+    return {
+        "competition": response.content,
+        "messages": [AIMessage(content="경쟁 환경 분석 완료")]
+    }
+
+async def aanalyze_competition_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """Step 4c (async)"""
+    response = await get_llm().ainvoke(_analysis_messages(COMPETITION_PROMPT, state))
+    return {
+        "competition": response.content,
+        "messages": [AIMessage(content="경쟁 환경 분석 완료")]
+    }
+
+def _risk_factors_messages(state: MarketAnalysisState) -> List[BaseMessage]:
+    return [HumanMessage(
+        content=RISK_FACTORS_PROMPT.format(
+            query=state["query"],
+            market_size=state.get("market_size", "N/A"),
+            growth_trend=state.get("growth_trend", "N/A"),
+            competition=state.get("competition", "N/A")
+        )
+    )]
+
+def analyze_risk_factors_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """
+    Step 4d: 리스크 요인 분석
+    """
+    response = get_llm().invoke(_risk_factors_messages(state))
+    return {
+        "risk_factors": response.content,
+        "messages": [AIMessage(content="리스크 요인 분석 완료")]
+    }
+
+async def aanalyze_risk_factors_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """Step 4d (async)"""
+    response = await get_llm().ainvoke(_risk_factors_messages(state))
+    return {
+        "risk_factors": response.content,
+        "messages": [AIMessage(content="리스크 요인 분석 완료")]
+    }
+
+def _market_score_messages(state: MarketAnalysisState) -> List[BaseMessage]:
+    return MARKET_SCORE_PROMPT.format_messages(
+        query=state["query"],
+        market_size=state.get("market_size", "N/A"),
+        growth_trend=state.get("growth_trend", "N/A"),
+        competition=state.get("competition", "N/A"),
+        risk_factors=state.get("risk_factors", "N/A")
+    )
+
+def _market_score_result(score_result: MarketScore) -> Dict[str, Any]:
+    return {
+        "final_score": score_result.total_score,
+        "messages": [AIMessage(content=f"시장성 점수 산출 완료: {score_result.total_score}/100점\n\n{score_result.justification}")]
+    }
+
+def calculate_market_score_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """
+    Step 5: 종합 시장성 점수 산출
+    """
+    structured_llm = get_llm().with_structured_output(MarketScore)
+    return _market_score_result(structured_llm.invoke(_market_score_messages(state)))
+
+async def acalculate_market_score_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """Step 5 (async)"""
+    structured_llm = get_llm().with_structured_output(MarketScore)
+    return _market_score_result(await structured_llm.ainvoke(_market_score_messages(state)))
+
+def _final_report_messages(state: MarketAnalysisState) -> List[BaseMessage]:
+    return [HumanMessage(
+        content=FINAL_REPORT_PROMPT.format(
             query=state["query"],
             market_size=state.get("market_size", "N/A"),
             growth_trend=state.get("growth_trend", "N/A"),
@@ -428,15 +588,28 @@ def generate_final_report_node(state: MarketAnalysisState) -> Dict[str, Any]:
             final_score=state.get("final_score", "N/A"),
             analysis_depth=state.get("analysis_depth", "intermediate")
         )
-    )])
-    
+    )]
+
+def generate_final_report_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """
+    Step 6: 최종 종합 리포트 생성
+    """
+    response = get_llm_creative().invoke(_final_report_messages(state))
+    return {
+        "final_report": response.content,
+        "messages": [AIMessage(content="최종 리포트 생성 완료")]
+    }
+
+async def agenerate_final_report_node(state: MarketAnalysisState) -> Dict[str, Any]:
+    """Step 6 (async)"""
+    response = await get_llm_creative().ainvoke(_final_report_messages(state))
     return {
         "final_report": response.content,
         "messages": [AIMessage(content="최종 리포트 생성 완료")]
     }
 
 # =============================================================================
-# 6. 조건부 라우팅 함수
+# 7. 조건부 라우팅 함수
 # =============================================================================
 
 def should_do_web_search(state: MarketAnalysisState) -> Literal["web_search", "skip_web_search"]:
@@ -445,6 +618,15 @@ def should_do_web_search(state: MarketAnalysisState) -> Literal["web_search", "s
         return "web_search"
     return "skip_web_search"
 
+# 서로 독립적인 분석 노드 (query, rag_data, web_data만 읽음) → 병렬 실행
+ANALYSIS_BRANCHES = ["analyze_market_size", "analyze_growth", "analyze_competition"]
+
+def route_after_retrieval(state: MarketAnalysisState) -> Union[str, List[str]]:
+    """내부 검색 이후: 웹 검색 또는 병렬 분석 브랜치로 분기"""
+    if should_do_web_search(state) == "web_search":
+        return "web_search"
+    return ANALYSIS_BRANCHES
+
 def route_by_analysis_depth(state: MarketAnalysisState) -> Literal["detailed_analysis", "basic_analysis"]:
     """분석 깊이에 따른 라우팅"""
     depth = state.get("analysis_depth", "intermediate")
@@ -453,44 +635,49 @@ def route_by_analysis_depth(state: MarketAnalysisState) -> Literal["detailed_ana
     return "basic_analysis"
 
 # =============================================================================
-# 7. LangGraph 워크플로우 구성
+# 8. LangGraph 워크플로우 구성
 # =============================================================================
 
+NODE_FUNCTIONS = {
+    "classify_query": (classify_query_node, aclassify_query_node),
+    "retrieve_internal": (retrieve_internal_data_node, aretrieve_internal_data_node),
+    "web_search": (web_search_node, aweb_search_node),
+    "analyze_market_size": (analyze_market_size_node, aanalyze_market_size_node),
+    "analyze_growth": (analyze_growth_trend_node, aanalyze_growth_trend_node),
+    "analyze_competition": (analyze_competition_node, aanalyze_competition_node),
+    "analyze_risks": (analyze_risk_factors_node, aanalyze_risk_factors_node),
+    "calculate_score": (calculate_market_score_node, acalculate_market_score_node),
+    "generate_report": (generate_final_report_node, agenerate_final_report_node),
+}
+
 def create_market_analysis_graph():
     """시장성 평가 그래프 생성"""
     workflow = StateGraph(MarketAnalysisState)
     
-    # 노드 추가
-    workflow.add_node("classify_query", classify_query_node)
-    workflow.add_node("retrieve_internal", retrieve_internal_data_node)
-    workflow.add_node("web_search", web_search_node)
-    workflow.add_node("analyze_market_size", analyze_market_size_node)
-    workflow.add_node("analyze_growth", analyze_growth_trend_node)
-    workflow.add_node("analyze_competition", analyze_competition_node)
-    workflow.add_node("analyze_risks", analyze_risk_factors_node)
-    workflow.add_node("calculate_score", calculate_market_score_node)
-    workflow.add_node("generate_report", generate_final_report_node)
+    # 노드 추가 (invoke → 동기 함수, ainvoke → 비동기 함수 사용)
+    for name, (func, afunc) in NODE_FUNCTIONS.items():
+        workflow.add_node(
+            name,
+            RunnableLambda(timed_node("market", name, func), afunc=timed_node("market", name, afunc), name=name),
+        )
     
     # 엣지 구성
     workflow.add_edge(START, "classify_query")
     workflow.add_edge("classify_query", "retrieve_internal")
     
-    # 조건부 엣지: 웹 검색 여부
+    # 조건부 엣지: 웹 검색 여부 (생략 시 바로 병렬 분석 시작)
     workflow.add_conditional_edges(
         "retrieve_internal",
-        should_do_web_search,
-        {
-            "web_search": "web_search",
-            "skip_web_search": "analyze_market_size"
-        }
+        route_after_retrieval,
+        ["web_search", *ANALYSIS_BRANCHES]
     )
     
-    workflow.add_edge("web_search", "analyze_market_size")
+    # 병렬 분석 단계: 시장 규모 / 성장 추세 / 경쟁 환경 동시 실행
+    for branch in ANALYSIS_BRANCHES:
+        workflow.add_edge("web_search", branch)
     
-    # 순차적 분석 단계
-    workflow.add_edge("analyze_market_size", "analyze_growth")
-    workflow.add_edge("analyze_growth", "analyze_competition")
-    workflow.add_edge("analyze_competition", "analyze_risks")
+    # 세 브랜치가 모두 끝난 뒤 리스크 분석에서 합류
+    workflow.add_edge(ANALYSIS_BRANCHES, "analyze_risks")
     workflow.add_edge("analyze_risks", "calculate_score")
     workflow.add_edge("calculate_score", "generate_report")
     workflow.add_edge("generate_report", END)
@@ -498,7 +685,7 @@ def create_market_analysis_graph():
     return workflow.compile()
 
 # =============================================================================
-# 8. 메인 실행 부분
+# 9. 메인 실행 부분
 # =============================================================================
 
 def run_market_analysis(query: str, verbose: bool = True):
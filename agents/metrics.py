@@ -0,0 +1,309 @@
+# ai-agent/agents/metrics.py
+"""
+파이프라인 계측 (노드 지연시간, LLM 토큰/비용, 검색/렌더링 지연시간).
+
+- timed_node()        : 그래프 노드 함수 래퍼 → pipeline_node_duration_seconds{graph,node}
+- MetricsCallback     : 모든 ChatOpenAI에 붙는 콜백 → llm_* {model,node}
+- render_prometheus() : Prometheus text format (report_server /metrics)
+- write_run_summary() : 실행 1회분 요약 JSON (outputs/run_summary_<run_id>.json)
+
+집계는 프로세스 전역 레지스트리에 누적되며, 실행 요약은 시작 시점 스냅샷과의 차이로 계산한다.
+"""
+import functools
+import inspect
+import json
+import math
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+# USD / 1M tokens (input, output) — 목록에 없는 모델은 비용 0으로 집계
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(**labels: Any) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 = +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # name → (type, help, {labels: Histogram | float})
+        self._metrics: Dict[str, Tuple[str, str, Dict[Labels, Any]]] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = DURATION_BUCKETS) -> None:
+        with self._lock:
+            self._metrics.setdefault(name, ("histogram", help_text, {}))
+            self._buckets[name] = buckets
+
+    def counter(self, name: str, help_text: str) -> None:
+        with self._lock:
+            self._metrics.setdefault(name, ("counter", help_text, {}))
+
+    def gauge(self, name: str, help_text: str) -> None:
+        with self._lock:
+            self._metrics.setdefault(name, ("gauge", help_text, {}))
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = _labels(**labels)
+        with self._lock:
+            series = self._metrics[name][2]
+            if key not in series:
+                series[key] = Histogram(self._buckets[name])
+            series[key].observe(value)
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        key = _labels(**labels)
+        with self._lock:
+            series = self._metrics[name][2]
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        key = _labels(**labels)
+        with self._lock:
+            self._metrics[name][2][key] = float(value)
+
+    def snapshot(self) -> Dict[str, Dict[Labels, Tuple[float, float]]]:
+        """name → {labels: (count, sum)} (카운터/게이지는 (value, value))"""
+        with self._lock:
+            result: Dict[str, Dict[Labels, Tuple[float, float]]] = {}
+            for name, (kind, _, series) in self._metrics.items():
+                if kind == "histogram":
+                    result[name] = {k: (h.count, h.sum) for k, h in series.items()}
+                else:
+                    result[name] = {k: (v, v) for k, v in series.items()}
+            return result
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, (kind, help_text, series) in sorted(self._metrics.items()):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(series.items()):
+                    if kind == "histogram":
+                        cumulative = 0
+                        bounds = [*value.buckets, math.inf]
+                        for bound, count in zip(bounds, value.counts):
+                            cumulative += count
+                            le = "+Inf" if bound == math.inf else repr(float(bound))
+                            lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                        lines.append(f"{name}_sum{_format_labels(labels)} {value.sum}")
+                        lines.append(f"{name}_count{_format_labels(labels)} {value.count}")
+                    else:
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+REGISTRY = MetricsRegistry()
+REGISTRY.histogram("pipeline_node_duration_seconds", "그래프 노드 실행 시간")
+REGISTRY.counter("pipeline_node_errors_total", "예외로 끝난 노드 실행 수")
+REGISTRY.histogram("llm_request_duration_seconds", "LLM 호출 시간 (캐시 적중 포함)")
+REGISTRY.histogram("llm_prompt_tokens", "LLM 호출당 입력 토큰", TOKEN_BUCKETS)
+REGISTRY.histogram("llm_completion_tokens", "LLM 호출당 출력 토큰", TOKEN_BUCKETS)
+REGISTRY.counter("llm_tokens_total", "LLM 토큰 합계")
+REGISTRY.counter("llm_cost_usd_total", "LLM 추정 비용 (USD)")
+REGISTRY.counter("llm_errors_total", "LLM 호출 실패 수")
+REGISTRY.counter("llm_json_errors_total", "JSON 응답 잘림/형식 오류 수 (agents/json_stream.py)")
+REGISTRY.histogram("llm_scheduler_wait_seconds", "LLM 스케줄러 대기 시간 (rate limit / 동시성 제한)")
+REGISTRY.gauge("llm_scheduler_queue_depth", "LLM 스케줄러 대기 중인 요청 수")
+REGISTRY.gauge("llm_scheduler_in_flight", "실행 중인 LLM 요청 수")
+REGISTRY.gauge("llm_scheduler_concurrency_limit", "현재 LLM 동시 요청 한도 (429 시 감소)")
+REGISTRY.counter("llm_rate_limited_total", "429 응답 수")
+REGISTRY.histogram("search_request_duration_seconds", "웹 검색 호출 시간 (캐시 미적중)")
+REGISTRY.histogram("report_render_duration_seconds", "PDF 렌더링 시간")
+
+
+def render_prometheus() -> str:
+    return REGISTRY.render_prometheus()
+
+
+# ---------------------------
+# 노드 계측
+# ---------------------------
+def timed_node(graph: str, node: str, func: Callable) -> Callable:
+    """동기/비동기 노드 함수를 감싸 실행 시간을 기록 (config 등 시그니처는 그대로 노출)"""
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except BaseException:
+                REGISTRY.inc("pipeline_node_errors_total", graph=graph, node=node)
+                raise
+            finally:
+                REGISTRY.observe("pipeline_node_duration_seconds", time.perf_counter() - started, graph=graph, node=node)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            REGISTRY.inc("pipeline_node_errors_total", graph=graph, node=node)
+            raise
+        finally:
+            REGISTRY.observe("pipeline_node_duration_seconds", time.perf_counter() - started, graph=graph, node=node)
+    return wrapper
+
+
+# ---------------------------
+# LLM 토큰/비용 계측
+# ---------------------------
+def _usage(response: LLMResult) -> Tuple[int, int]:
+    """(prompt_tokens, completion_tokens) — 메시지 usage_metadata 우선, 없으면 llm_output"""
+    prompt = completion = 0
+    found = False
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt += usage.get("input_tokens", 0)
+                completion += usage.get("output_tokens", 0)
+                found = True
+    if not found:
+        token_usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt = token_usage.get("prompt_tokens", 0)
+        completion = token_usage.get("completion_tokens", 0)
+    return prompt, completion
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        # gpt-4o-mini-2024-07-18 처럼 날짜가 붙은 이름
+        prices = next((p for name, p in MODEL_PRICES.items() if model.startswith(name + "-")), (0.0, 0.0))
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+class MetricsCallback(BaseCallbackHandler):
+    """ChatOpenAI 콜백: 호출 시간, 토큰 사용량, 추정 비용을 model/node별로 기록"""
+
+    def __init__(self, model: str):
+        self.model = model
+        self._runs: Dict[UUID, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        node = (metadata or {}).get("langgraph_node", "-")
+        with self._lock:
+            self._runs[run_id] = (time.perf_counter(), node)
+
+    def _finish(self, run_id: UUID) -> str:
+        with self._lock:
+            started, node = self._runs.pop(run_id, (time.perf_counter(), "-"))
+        REGISTRY.observe("llm_request_duration_seconds", time.perf_counter() - started, model=self.model, node=node)
+        return node
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        node = self._finish(run_id)
+        prompt, completion = _usage(response)
+        if not (prompt or completion):
+            return  # 캐시 적중 등 usage 정보가 없는 응답
+        REGISTRY.observe("llm_prompt_tokens", prompt, model=self.model, node=node)
+        REGISTRY.observe("llm_completion_tokens", completion, model=self.model, node=node)
+        REGISTRY.inc("llm_tokens_total", prompt, model=self.model, type="prompt")
+        REGISTRY.inc("llm_tokens_total", completion, model=self.model, type="completion")
+        REGISTRY.inc("llm_cost_usd_total", estimate_cost(self.model, prompt, completion), model=self.model)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        node = self._finish(run_id)
+        if isinstance(error, GeneratorExit):
+            return  # 호출 측이 필요한 출력을 받고 스트림을 닫음 (agents/json_stream.py) — 실패 아님
+        REGISTRY.inc("llm_errors_total", model=self.model, node=node)
+
+
+# ---------------------------
+# 실행 요약
+# ---------------------------
+def _histogram_summary(before: Dict, after: Dict, name: str) -> List[Dict[str, Any]]:
+    rows = []
+    previous = before.get(name, {})
+    for labels, (count, total) in after.get(name, {}).items():
+        prev_count, prev_total = previous.get(labels, (0, 0.0))
+        count, total = count - prev_count, total - prev_total
+        if count <= 0:
+            continue
+        row: Dict[str, Any] = dict(labels)
+        row.update({"count": count, "total": round(total, 4), "mean": round(total / count, 4)})
+        rows.append(row)
+    return sorted(rows, key=lambda r: r["total"], reverse=True)
+
+
+def _counter_summary(before: Dict, after: Dict, name: str) -> List[Dict[str, Any]]:
+    rows = []
+    previous = before.get(name, {})
+    for labels, (value, _) in after.get(name, {}).items():
+        delta = value - previous.get(labels, (0.0, 0.0))[0]
+        if delta:
+            rows.append({**dict(labels), "value": round(delta, 6)})
+    return sorted(rows, key=lambda r: r["value"], reverse=True)
+
+
+def write_run_summary(run_id: str, started_at: float, baseline: Dict, directory: str = "outputs") -> str:
+    """baseline(REGISTRY.snapshot()) 이후 누적분으로 실행 요약 JSON 작성, 경로 반환"""
+    current = REGISTRY.snapshot()
+    summary = {
+        "run_id": run_id,
+        "started_at": started_at,
+        "wall_time_s": round(time.time() - started_at, 3),
+        "nodes": _histogram_summary(baseline, current, "pipeline_node_duration_seconds"),
+        "node_errors": _counter_summary(baseline, current, "pipeline_node_errors_total"),
+        "llm_calls": _histogram_summary(baseline, current, "llm_request_duration_seconds"),
+        "llm_tokens": _counter_summary(baseline, current, "llm_tokens_total"),
+        "llm_cost_usd": _counter_summary(baseline, current, "llm_cost_usd_total"),
+        "llm_errors": _counter_summary(baseline, current, "llm_errors_total"),
+        "search": _histogram_summary(baseline, current, "search_request_duration_seconds"),
+        "report_render": _histogram_summary(baseline, current, "report_render_duration_seconds"),
+    }
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"run_summary_{run_id}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return path
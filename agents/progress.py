@@ -0,0 +1,123 @@
+# ai-agent/agents/progress.py
+"""
+평가 파이프라인 진행 이벤트 스트림.
+
+컴파일된 그래프의 astream_events(v2)를 분석가용 이벤트로 변환한다.
+- node_start / node_end : 그래프 노드 시작/종료 (중첩된 시장성 그래프 노드 포함)
+- token                 : 시장성 최종 보고서(generate_report) LLM 부분 토큰
+- startup_done          : 스타트업 1개의 투자 판단 완료
+- done                  : 전체 실행 완료 (보고서 목록)
+- error                 : 실행 중 예외
+
+이벤트마다 어느 스타트업에 속하는지(startup)를 부모 run 체인으로 찾아 붙이므로
+병렬(fan-out) 평가에서도 구분된다.
+"""
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+TOKEN_NODES = ("generate_report",)
+STARTUP_DONE_NODE = "investment_decision"
+
+
+def _is_node_event(event: Dict[str, Any]) -> bool:
+    """그래프 노드 자체의 run (노드 내부 runnable 제외)"""
+    metadata = event.get("metadata", {})
+    return (
+        event.get("name") == metadata.get("langgraph_node")
+        and any(tag.startswith("graph:step:") for tag in event.get("tags", []))
+    )
+
+
+def _startup_name(value: Any) -> Optional[str]:
+    if isinstance(value, dict):
+        current = value.get("current_startup")
+        if isinstance(current, dict):
+            return current.get("name")
+    return None
+
+
+def _startup_summary(startup: Dict[str, Any]) -> Dict[str, Any]:
+    decision = startup.get("investment_decision", {})
+    scores = startup.get("investment_scores", {})
+    return {
+        "startup": startup.get("name", "Unknown"),
+        "decision": decision.get("decision") if isinstance(decision, dict) else None,
+        "total_score": scores.get("total_score") if isinstance(scores, dict) else None,
+        "market_score": startup.get("market_eval", {}).get("score"),
+        "error": startup.get("error"),
+    }
+
+
+async def stream_progress(graph, inputs: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """graph.astream_events → 진행 이벤트 dict"""
+    started = time.perf_counter()
+    # run_id → 스타트업 이름 (노드 입력의 current_startup으로 기록, 하위 run은 parent_ids로 조회)
+    owners: Dict[str, str] = {}
+
+    def owner_of(event: Dict[str, Any]) -> Optional[str]:
+        for run_id in [event.get("run_id"), *reversed(event.get("parent_ids", []))]:
+            if run_id in owners:
+                return owners[run_id]
+        return None
+
+    def envelope(kind: str, event: Dict[str, Any], **fields: Any) -> Dict[str, Any]:
+        return {
+            "type": kind,
+            "elapsed_s": round(time.perf_counter() - started, 3),
+            "startup": owner_of(event),
+            **fields,
+        }
+
+    final_output: Any = None
+    try:
+        async for event in graph.astream_events(inputs, config=config, version="v2"):
+            kind = event["event"]
+            node = event.get("metadata", {}).get("langgraph_node")
+
+            if kind == "on_chain_start" and _is_node_event(event):
+                name = _startup_name(event.get("data", {}).get("input"))
+                if name:
+                    owners[event["run_id"]] = name
+                yield envelope("node_start", event, node=node)
+
+            elif kind == "on_chain_end" and _is_node_event(event):
+                yield envelope("node_end", event, node=node)
+                output = event.get("data", {}).get("output")
+                if node == STARTUP_DONE_NODE and isinstance(output, dict) and output.get("current_startup"):
+                    yield envelope("startup_done", event, **_startup_summary(output["current_startup"]))
+                elif node == "evaluate_batch" and isinstance(output, dict):
+                    for startup in output.get("processed_startups", []):
+                        if startup.get("error"):
+                            yield envelope("startup_done", event, **_startup_summary(startup))
+
+            elif kind == "on_chat_model_stream" and node in TOKEN_NODES:
+                chunk = event.get("data", {}).get("chunk")
+                text = getattr(chunk, "content", "")
+                if text:
+                    yield envelope("token", event, node=node, text=text)
+
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                final_output = event.get("data", {}).get("output")
+
+    except Exception as e:
+        yield {"type": "error", "elapsed_s": round(time.perf_counter() - started, 3), "message": str(e)}
+        return
+
+    reports: List[Dict[str, Any]] = []
+    processed = 0
+    if isinstance(final_output, dict):
+        reports = final_output.get("reports", [])
+        processed = len(final_output.get("processed_startups", []))
+    yield {
+        "type": "done",
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "processed": processed,
+        "reports": reports,
+    }
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Server-Sent Events 프레임 (event: <type>, data: <json>)"""
+    data = json.dumps(event, ensure_ascii=False, default=str)
+    return f"event: {event['type']}\ndata: {data}\n\n"
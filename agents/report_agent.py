@@ -1,17 +1,29 @@
 import os
 import re
 import json
+import time
+import asyncio
+import functools
+import hashlib
+import tempfile
 import unicodedata
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import aiohttp
 from dotenv import load_dotenv
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
+
+from agents.investment_decision_agent import is_invested
+from agents.json_stream import astream_json
+from agents.metrics import REGISTRY
+from agents.resources import get_chat_model, get_http_session, get_resource
 
 
 load_dotenv()
 
+PDF_CHUNK_SIZE = 64 * 1024
+
 
 SUMMARY_TEMPLATE = ChatPromptTemplate.from_messages(
     [
@@ -70,7 +82,7 @@ def _prepare_competitor_snippet(competitors: List[Dict[str, Any]]) -> str:
     return "; ".join(rows)
 
 
-async def _build_summary(startup: Dict[str, Any], llm: Optional[ChatOpenAI]) -> Dict[str, Any]:
+async def _build_summary(startup: Dict[str, Any], llm: Optional[BaseChatModel]) -> Dict[str, Any]:
     tech_summary = startup.get("tech_summary", {})
     tech_highlights = tech_summary.get("highlights", startup.get("tech_highlights", []))
     tech_gaps = tech_summary.get("gaps", startup.get("tech_gaps", []))
@@ -105,11 +117,8 @@ async def _build_summary(startup: Dict[str, Any], llm: Optional[ChatOpenAI]) ->
             confidence=decision.get("confidence", "N/A"),
             overall_risk=risks.get("overall_risk_score", "N/A"),
         )
-        response = await llm.ainvoke(messages)
-        content = response.content.strip()
-        if content.startswith("```"):
-            content = content.split("```", 2)[1].strip()
-        summary = json.loads(content)
+        # JSON 객체가 닫히는 즉시 생성 중단
+        summary = await astream_json(llm, messages, expect="{")
         for key in ("technology", "market_competition", "risk", "investment"):
             section = summary.get(key)
             if isinstance(section, dict):
@@ -150,135 +159,282 @@ async def _build_summary(startup: Dict[str, Any], llm: Optional[ChatOpenAI]) ->
         }
 
 
+def _report_key(index: int, startup: Dict[str, Any]) -> str:
+    """processed_startups 내 위치 + 이름 (같은 이름의 기업이 여러 번 나와도 구분)"""
+    return f"{index}:{startup.get('name', 'Unknown')}"
+
+
+def select_report_targets(state: Dict) -> List[Tuple[str, Dict]]:
+    """
+    아직 보고서를 만들지 않은 투자 확정 기업만 (보고서 키, 기업) 목록으로 선택.
+    (미평가 startups, 투자 미확정 기업, 이미 rendered_reports에 있는 기업은 제외)
+    순차 경로도 평가가 끝나면 processed_startups에 결과가 반영되므로 processed_startups만 본다.
+    """
+    rendered = set(state.get("rendered_reports", []))
+    targets: List[Tuple[str, Dict]] = []
+    for index, item in enumerate(state.get("processed_startups", [])):
+        if not isinstance(item, dict) or not is_invested(item):
+            continue
+        key = _report_key(index, item)
+        if key in rendered:
+            continue
+        rendered.add(key)
+        targets.append((key, item))
+    return targets
+
+
+def build_report_payload(s: Dict[str, Any], summary: Dict[str, Any]) -> Dict[str, Any]:
+    """스타트업 평가 결과 + LLM 요약 → report_server ReportInput payload"""
+    # --- 기술 요약 ---
+    tech = s.get("tech_summary", {})
+    tech_summary = tech.get("summary", "기술 요약 없음")
+    tech_highlights = tech.get("highlights", [])
+    tech_gaps = tech.get("gaps", [])
+
+    # --- 시장성 평가 ---
+    market = s.get("market_eval", {})
+    market_summary = market.get("summary", "시장성 요약 없음")
+    market_size = market.get("size", "시장 규모 데이터 없음")
+    market_growth = market.get("growth", "성장률 정보 없음")
+    market_competition = market.get("competition", "경쟁 환경 정보 없음")
+
+    # --- 투자 판단 ---
+    decision_data = s.get("investment_decision", {})
+    decision = decision_data.get("decision", "검토 중")
+    reason = decision_data.get("reason", "추가 검토 필요")
+
+    return {
+        "company_name": s.get("name", "Unknown"),
+        "domain": s.get("domain", "에듀테크"),
+        "tech_eval": {
+            "innovation": ", ".join(tech_highlights[:2]) if tech_highlights else "평가 대기",
+            "scalability": "평가 대기",
+            "stability": "평가 대기",
+            "summary": tech_summary,
+            "highlights": tech_highlights,
+            "gaps": tech_gaps,
+            "readiness_score": 72,
+        },
+        "market_eval": {
+            "size": market_size,
+            "growth": market_growth,
+            "competition": market_competition,
+            "summary": market_summary,
+        },
+        "market_eval_detail": s.get("market_eval_detail", {}),
+        "competitor_list": s.get("competitor_list", []),
+        "competitor_analysis": s.get("competitor_analysis", {}),
+        "competitive_positioning": s.get("competitive_positioning", {}),
+        "investment_scores": s.get("investment_scores", {}),
+        "risk_assessment": s.get("risk_assessment", {}),
+        "investment_decision": decision_data,
+        "decision": decision,
+        "decision_reason": reason,
+        "llm_summary": summary,
+        "headline_metrics": {
+            "decision": decision,
+            "score": s.get("investment_scores", {}).get("total_score", "N/A"),
+            "confidence": decision_data.get("confidence", "N/A"),
+            "overall_risk": s.get("risk_assessment", {}).get("overall_risk_score", "N/A"),
+        },
+    }
+
+
+def _report_file_name(startup: Dict[str, Any], key: str) -> str:
+    """
+    기업명(한글 유지) + 보고서 키 해시.
+    이름이 같거나 정리 후 같아지는 기업들도 동시에 렌더링될 때 파일이 겹치지 않는다.
+    """
+    name = unicodedata.normalize("NFC", str(startup.get("name", "startup")))
+    safe_name = re.sub(r"[^\w-]+", "_", name).strip("_")[:80] or "startup"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:8]
+    return f"{safe_name}_{digest}_report.pdf"
+
+
+# ---------------------------
+# PDF 파일 기록 (임시 파일 → os.replace, 이벤트 루프 밖에서 실행)
+# ---------------------------
+def _open_part_file(file_name: str):
+    """outputs/ 안의 고유한 임시 파일 (동시 렌더링끼리 겹치지 않음)"""
+    return tempfile.NamedTemporaryFile(dir="outputs", prefix=f".{file_name}.", suffix=".part", delete=False)
+
+
+def _commit_part_file(part, file_name: str) -> None:
+    part.close()
+    os.replace(part.name, os.path.join("outputs", file_name))
+
+
+def _discard_part_file(part) -> None:
+    part.close()
+    if os.path.exists(part.name):
+        os.remove(part.name)
+
+
+def _write_pdf(file_name: str, content: bytes) -> None:
+    part = _open_part_file(file_name)
+    try:
+        part.write(content)
+        _commit_part_file(part, file_name)
+    except BaseException:
+        _discard_part_file(part)
+        raise
+
+
+async def _request_pdf(
+    session: aiohttp.ClientSession,
+    report_url: str,
+    payload: Dict[str, Any],
+    startup: Dict[str, Any],
+    file_name: str,
+) -> Dict[str, Any]:
+    """report_server에 PDF 생성 요청 후 응답을 청크 단위로 파일에 기록"""
+    name = startup.get("name", "Unknown")
+    timeout = aiohttp.ClientTimeout(total=float(os.getenv("REPORT_REQUEST_TIMEOUT", "300")))
+    async with session.post(report_url, json=payload, timeout=timeout) as res:
+        if res.status != 200:
+            return {"name": name, "error": await res.text()}
+
+        part = await asyncio.to_thread(_open_part_file, file_name)
+        try:
+            async for chunk in res.content.iter_chunked(PDF_CHUNK_SIZE):
+                await asyncio.to_thread(part.write, chunk)
+            await asyncio.to_thread(_commit_part_file, part, file_name)
+        except BaseException:
+            _discard_part_file(part)
+            raise
+        return {"name": name, "pdf": file_name}
+
+
+def render_mode() -> str:
+    """REPORT_RENDER_MODE: http (기본, report_server 호출) | inprocess"""
+    return os.getenv("REPORT_RENDER_MODE", "http").lower()
+
+
+def _get_render_pool():
+    """
+    inprocess 모드 렌더링 풀 (프로세스당 1개, 동시 렌더링 수 = REPORT_RENDER_CONCURRENCY).
+    같은 프로세스의 여러 파이프라인이 공유하므로 대기열(REPORT_RENDER_QUEUE_SIZE, 기본 워커 수 × 2)을 둔다.
+    aclose_resources()에서 워커 프로세스와 함께 종료된다.
+    """
+    from report_renderer import RenderPool
+    workers = int(os.getenv("REPORT_RENDER_CONCURRENCY", "2"))
+    queue_size = int(os.getenv("REPORT_RENDER_QUEUE_SIZE", str(workers * 2)))
+    return get_resource("report_render_pool", lambda: RenderPool(workers, queue_size=queue_size))
+
+
+async def _render_inprocess(payload: Dict[str, Any], startup: Dict[str, Any], file_name: str) -> Dict[str, Any]:
+    """report_renderer를 직접 호출 (HTTP/JSON 왕복 없이 렌더링 워커 프로세스에서 PDF 생성)"""
+    from report_renderer import RenderQueueFull, render_report
+
+    while True:
+        try:
+            content, _ = await render_report(_get_render_pool(), payload)
+            break
+        except RenderQueueFull:
+            # 다른 파이프라인이 풀을 채운 경우 — 실패로 처리하지 않고 자리가 날 때까지 대기
+            await asyncio.sleep(0.2)
+    await asyncio.to_thread(_write_pdf, file_name, content)
+    return {"name": startup.get("name", "Unknown"), "pdf": file_name}
+
+
+RenderFn = Callable[[Dict[str, Any], Dict[str, Any], str], Awaitable[Dict[str, Any]]]
+
+
+async def _generate_report(
+    key: str,
+    s: Dict[str, Any],
+    render: RenderFn,
+    summary_llm: Optional[BaseChatModel],
+    summary_slots: asyncio.Semaphore,
+    render_slots: asyncio.Semaphore,
+) -> Dict[str, Any]:
+    """
+    요약(LLM)과 렌더링을 서로 다른 슬롯으로 제한 →
+    k번째 기업 렌더링 중에 k+1번째 기업 요약이 진행됨
+    """
+    started = time.perf_counter()
+    async with summary_slots:
+        summary = await _build_summary(s, summary_llm)
+    summarized = time.perf_counter()
+
+    payload = build_report_payload(s, summary)
+
+    # --- PDF 생성 ---
+    async with render_slots:
+        rendering = time.perf_counter()
+        try:
+            result = await render(payload, s, _report_file_name(s, key))
+        except Exception as e:
+            result = {"name": s.get("name", "Unknown"), "error": str(e)}
+    finished = time.perf_counter()
+    REGISTRY.observe("report_render_duration_seconds", finished - rendering, mode=render_mode())
+
+    result["timings"] = {
+        "summary_s": round(summarized - started, 3),
+        "render_wait_s": round(rendering - summarized, 3),
+        "render_s": round(finished - rendering, 3),
+        "total_s": round(finished - started, 3),
+    }
+    return result
+
+
+async def _generate_reports(
+    selected: List[Tuple[str, Dict[str, Any]]],
+    render: RenderFn,
+    summary_llm: Optional[BaseChatModel],
+) -> List[Dict[str, Any]]:
+    summary_slots = asyncio.Semaphore(int(os.getenv("REPORT_SUMMARY_CONCURRENCY", "4")))
+    render_slots = asyncio.Semaphore(int(os.getenv("REPORT_RENDER_CONCURRENCY", "2")))
+    return await asyncio.gather(*(
+        _generate_report(key, s, render, summary_llm, summary_slots, render_slots)
+        for key, s in selected
+    ))
+
+
 async def report_node(state: Dict) -> Dict:
     """
     LangGraph 마지막 단계:
-    1️⃣ 각 스타트업 결과를 JSON payload로 report_server에 POST
+    1️⃣ 새로 투자 확정된 스타트업 결과를 JSON payload로 report_server에 POST
+       (REPORT_RENDER_MODE=inprocess 이면 report_renderer 직접 호출)
     2️⃣ PDF를 로컬 outputs 폴더에 저장
-    3️⃣ 결과 리스트 반환
+    3️⃣ 결과 리스트 반환 (처리한 기업은 rendered_reports에 기록 → 다음 호출에서 제외)
     """
     # --- 상태 관리 ---
     current = state.get("current_startup")
-    startups: List[Dict] = state.get("startups", [])
-    processed: List[Dict] = state.get("processed_startups", [])
-    pdf_results: List[Dict] = state.get("reports", [])
-
-    # 처리 대상이 하나만 있을 경우도 포함
-    targets = []
-    if current:
-        targets.append(current)
-    if startups:
-        targets.extend(startups)
-    if processed:
-        targets.extend(processed)
-
-    if not targets:
-        print("⚠️ 보고서 생성 대상이 없습니다.")
-        return state
+    pdf_results: List[Dict] = list(state.get("reports", []))
+    rendered: List[str] = list(state.get("rendered_reports", []))
 
-    unique_targets: List[Dict] = []
-    seen_keys = set()
-    for item in targets:
-        if not isinstance(item, dict):
-            continue
-        key = (item.get("name"), item.get("task_id"))
-        if key in seen_keys:
-            continue
-        seen_keys.add(key)
-        unique_targets.append(item)
-    targets = unique_targets
+    selected = select_report_targets(state)
+    if not selected:
+        print("⚠️ 새로 생성할 보고서가 없습니다.")
+        return state
 
-    # --- 서버 주소 설정 ---
+    # --- 서버 주소 설정 (http 모드) ---
     report_url = os.getenv("REPORT_SERVER_URL", "http://localhost:8000/generate-report")
     os.makedirs("outputs", exist_ok=True)
 
     llm_model = os.getenv("REPORT_SUMMARY_MODEL", "gpt-4o-mini")
     try:
-        summary_llm = ChatOpenAI(model=llm_model, temperature=0.2)
+        summary_llm = get_chat_model(llm_model, temperature=0.2)
     except Exception:
         summary_llm = None
 
-    async with aiohttp.ClientSession() as session:
-        for s in targets:
-            # --- 기술 요약 ---
-            tech = s.get("tech_summary", {})
-            tech_summary = tech.get("summary", "기술 요약 없음")
-            tech_highlights = tech.get("highlights", [])
-            tech_gaps = tech.get("gaps", [])
-
-            # --- 시장성 평가 ---
-            market = s.get("market_eval", {})
-            market_summary = market.get("summary", "시장성 요약 없음")
-            market_size = market.get("size", "시장 규모 데이터 없음")
-            market_growth = market.get("growth", "성장률 정보 없음")
-            market_competition = market.get("competition", "경쟁 환경 정보 없음")
-
-            # --- 투자 판단 ---
-            decision_data = s.get("investment_decision", {})
-            decision = decision_data.get("decision", "검토 중")
-            reason = decision_data.get("reason", "추가 검토 필요")
-
-            summary = await _build_summary(s, summary_llm)
-
-            payload = {
-                "company_name": s.get("name", "Unknown"),
-                "domain": s.get("domain", "에듀테크"),
-                "tech_eval": {
-                    "innovation": ", ".join(tech_highlights[:2]) if tech_highlights else "평가 대기",
-                    "scalability": "평가 대기",
-                    "stability": "평가 대기",
-                    "summary": tech_summary,
-                    "highlights": tech_highlights,
-                    "gaps": tech_gaps,
-                    "readiness_score": 72,
-                },
-                "market_eval": {
-                    "size": market_size,
-                    "growth": market_growth,
-                    "competition": market_competition,
-                    "summary": market_summary,
-                },
-                "market_eval_detail": s.get("market_eval_detail", {}),
-                "competitor_list": s.get("competitor_list", []),
-                "competitor_analysis": s.get("competitor_analysis", {}),
-                "competitive_positioning": s.get("competitive_positioning", {}),
-                "investment_scores": s.get("investment_scores", {}),
-                "risk_assessment": s.get("risk_assessment", {}),
-                "investment_decision": decision_data,
-                "decision": decision,
-                "decision_reason": reason,
-                "llm_summary": summary,
-                "headline_metrics": {
-                    "decision": decision,
-                    "score": s.get("investment_scores", {}).get("total_score", "N/A"),
-                    "confidence": decision_data.get("confidence", "N/A"),
-                    "overall_risk": s.get("risk_assessment", {}).get("overall_risk_score", "N/A"),
-                },
-            }
-
-
-            # --- PDF 생성 요청 ---
-            try:
-                async with session.post(report_url, json=payload) as res:
-                    if res.status == 200:
-                        content = await res.read()
-
-                        safe_name = unicodedata.normalize("NFKD", s.get("name", "startup"))
-                        safe_name = re.sub(r"[^a-zA-Z0-9_-]", "_", safe_name)
-                        file_name = f"{safe_name}_report.pdf"
-                        file_path = os.path.join("outputs", file_name)
-
-                        with open(file_path, "wb") as f:
-                            f.write(content)
-
-                        pdf_results.append({"name": s.get("name", "Unknown"), "pdf": file_name})
-                    else:
-                        text = await res.text()
-                        pdf_results.append({"name": s.get("name", "Unknown"), "error": text})
-            except Exception as e:
-                pdf_results.append({"name": s.get("name", "Unknown"), "error": str(e)})
-
-    print(f"총 {len(pdf_results)}개 보고서 생성 완료")
+    # REPORT_RENDER_MODE=inprocess: 같은 머신에서 report_server 없이 직접 렌더링
+    if render_mode() == "inprocess":
+        results = await _generate_reports(selected, _render_inprocess, summary_llm)
+    else:
+        # 공유 keep-alive 세션 (호출마다 세션/커넥션을 새로 만들지 않음)
+        render = functools.partial(_request_pdf, get_http_session(), report_url)
+        results = await _generate_reports(selected, render, summary_llm)
+
+    for (key, _), result in zip(selected, results):
+        pdf_results.append(result)
+        # 성공/실패와 관계없이 한 번만 시도 (배치 전체 비용이 기업 수에 선형)
+        rendered.append(key)
+        print(f"[{result['name']}] 보고서 {'완료' if 'pdf' in result else '실패'} ({result['timings']['total_s']}s)")
+
+    print(f"신규 {len(selected)}개 / 누적 {len(pdf_results)}개 보고서 생성 완료")
     state["reports"] = pdf_results
+    state["rendered_reports"] = rendered
     state["current_startup"] = current
     return state
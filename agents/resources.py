@@ -0,0 +1,198 @@
+# ai-agent/agents/resources.py
+"""
+파이프라인 공용 리소스 접근자.
+
+임베딩 모델, FAISS 벡터 DB, LLM 클라이언트, 검색 도구, HTTP 커넥션 풀처럼 생성 비용이 큰 객체를
+import 시점이 아니라 최초 사용 시점에 한 번만 만들고, 프로세스 전체에서 공유한다.
+"""
+import asyncio
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# _lock은 dict 조회/변경 동안만 잡는다 (생성 함수 실행 중에는 키별 잠금만 잡으므로
+# 느린 생성(벡터 DB, 임베딩 모델)이 다른 리소스 조회나 이벤트 루프를 막지 않음)
+_lock = threading.Lock()
+_instances: Dict[Hashable, Any] = {}
+_key_locks: Dict[Hashable, threading.Lock] = {}
+
+
+# ---------------------------
+# 공용 접근자
+# ---------------------------
+def get_resource(key: Hashable, factory: Callable[[], Any]) -> Any:
+    """key에 해당하는 리소스 반환 (최초 호출 시 factory()로 생성 후 캐시)"""
+    try:
+        return _instances[key]
+    except KeyError:
+        pass
+    with _lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+    with key_lock:
+        try:
+            return _instances[key]
+        except KeyError:
+            pass
+        value = factory()
+        with _lock:
+            return _instances.setdefault(key, value)
+
+
+def override_resource(key: Hashable, value: Any) -> None:
+    """테스트/벤치마크용 리소스 교체"""
+    with _lock:
+        _instances[key] = value
+
+
+def reset_resources() -> None:
+    """캐시된 리소스 전체 해제"""
+    with _lock:
+        _instances.clear()
+
+
+# ---------------------------
+# 리소스별 헬퍼
+# ---------------------------
+def get_embeddings():
+    def factory():
+        from agents.vector_store import create_embeddings
+        return create_embeddings()
+    return get_resource("embeddings", factory)
+
+
+def get_vector_db():
+    def factory():
+        from agents.vector_store import load_vector_db
+        return load_vector_db(get_embeddings())
+    return get_resource("vector_db", factory)
+
+
+def get_retriever(k: int = 5):
+    return get_resource(
+        ("retriever", k),
+        lambda: get_vector_db().as_retriever(search_type="similarity", search_kwargs={"k": k}),
+    )
+
+
+def get_llm_cache():
+    """모든 ChatOpenAI 호출이 공유하는 SQLite 응답 캐시 (LLM_CACHE_ENABLED=0이면 None)"""
+    def factory():
+        from agents.llm_cache import create_llm_cache_from_env
+        return create_llm_cache_from_env()
+    return get_resource("llm_cache", factory)
+
+
+def get_chat_model(model: str = "gpt-4o-mini", temperature: float = 0.2, streaming: bool = False):
+    """
+    (model, temperature, streaming) 조합별로 하나의 ChatOpenAI 클라이언트 공유 (HTTP 커넥션 풀은 전체 공유).
+    모든 클라이언트는 agents/llm_scheduler.py의 모델별 스케줄러를 거친다 (LLM_SCHEDULER_ENABLED=0이면 미사용).
+    """
+    def factory():
+        from langchain_openai import ChatOpenAI
+        from agents.llm_scheduler import ScheduledChatOpenAI, scheduler_enabled
+        from agents.metrics import MetricsCallback
+        http_client, http_async_client = get_openai_http_clients()
+        options = dict(
+            model=model,
+            temperature=temperature,
+            streaming=streaming,
+            stream_usage=True,  # 스트리밍 응답에도 토큰 사용량 포함
+            cache=get_llm_cache(),
+            callbacks=[MetricsCallback(model)],
+            http_client=http_client,
+            http_async_client=http_async_client,
+        )
+        if scheduler_enabled():
+            # RPM/TPM/동시성 제한과 429 재시도는 모델별 공용 스케줄러가 담당
+            return ScheduledChatOpenAI(max_retries=0, **options)
+        return ChatOpenAI(**options)
+    return get_resource(("chat_model", model, temperature, streaming), factory)
+
+
+def get_search_tool(provider: str):
+    """provider: "tavily" | "duckduckgo" """
+    def factory():
+        if provider == "tavily":
+            from langchain_community.tools.tavily_search.tool import TavilySearchResults
+            return TavilySearchResults(k=5)  # 검색 결과 문서 수 (필요 시 늘리기)
+        if provider == "duckduckgo":
+            from langchain_community.tools import DuckDuckGoSearchRun
+            return DuckDuckGoSearchRun()
+        raise ValueError(f"unknown search provider: {provider}")
+    return get_resource(("search_tool", provider), factory)
+
+
+# ---------------------------
+# HTTP 커넥션 풀
+# ---------------------------
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "50"))  # 전체 동시 커넥션
+HTTP_POOL_PER_HOST = int(os.getenv("HTTP_POOL_PER_HOST", "20"))  # 호스트별 동시 커넥션 / 유지할 keep-alive 커넥션
+HTTP_KEEPALIVE_S = float(os.getenv("HTTP_KEEPALIVE_S", "60"))
+
+
+def get_openai_http_clients():
+    """
+    모든 ChatOpenAI가 공유하는 httpx 클라이언트 (sync, async) — 모델/temperature가 달라도 커넥션 풀은 하나.
+    override_resource("openai_http_transports", (sync, async))로 전송 계층만 바꿀 수 있다 (오프라인 벤치마크 등).
+    """
+    def factory():
+        import httpx
+        from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+        transports = _instances.get("openai_http_transports")
+        if transports is not None:
+            sync_transport, async_transport = transports
+            return DefaultHttpxClient(transport=sync_transport), DefaultAsyncHttpxClient(transport=async_transport)
+        limits = httpx.Limits(
+            max_connections=HTTP_POOL_SIZE,
+            max_keepalive_connections=HTTP_POOL_PER_HOST,
+            keepalive_expiry=HTTP_KEEPALIVE_S,
+        )
+        return DefaultHttpxClient(limits=limits), DefaultAsyncHttpxClient(limits=limits)
+    return get_resource("openai_http_clients", factory)
+
+
+def get_http_session():
+    """이벤트 루프별로 하나의 aiohttp 세션(keep-alive 커넥션 풀) 공유 — Tavily, report_server 호출"""
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    entry = _instances.get("http_session")
+    if entry is None or entry[0] is not loop or entry[1].closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_SIZE,
+            limit_per_host=HTTP_POOL_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_S,
+            ttl_dns_cache=300,
+        )
+        entry = (loop, aiohttp.ClientSession(connector=connector))
+        with _lock:
+            _instances["http_session"] = entry
+    return entry[1]
+
+
+async def aclose_resources() -> None:
+    """
+    공유 HTTP 커넥션 풀과 inprocess 렌더링 풀 종료 (CLI 실행 종료, report_server 종료 시).
+    닫힌 풀을 참조하는 ChatOpenAI 클라이언트도 함께 해제되어 다음 사용 시 새로 만들어진다.
+    """
+    with _lock:
+        session_entry = _instances.pop("http_session", None)
+        render_pool = _instances.pop("report_render_pool", None)
+        clients = _instances.pop("openai_http_clients", None)
+        if clients is not None:
+            for key in [k for k in _instances if isinstance(k, tuple) and k[0] == "chat_model"]:
+                del _instances[key]
+
+    if session_entry is not None and not session_entry[1].closed:
+        await session_entry[1].close()
+    if clients is not None:
+        http_client, http_async_client = clients
+        http_client.close()
+        await http_async_client.aclose()
+    if render_pool is not None:
+        # 진행 중인 렌더링이 끝날 때까지 기다리므로 이벤트 루프 밖에서 종료
+        await asyncio.to_thread(render_pool.shutdown)
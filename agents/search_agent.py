@@ -1,16 +1,16 @@
-from langchain_community.chat_models import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
-from langchain_community.tools.tavily_search.tool import TavilySearchResults
 from typing import Dict, List
-import json, re
 from dotenv import load_dotenv
+from agents.json_stream import JSONStreamError, astream_json
+from agents.resources import get_chat_model
+from agents.search_cache import acached_search
 from prompts.search_prompt import SEARCH_PROMPT_TEMPLATE
 
 load_dotenv()
 
-# Tavily 초기화
-tavily_tool = TavilySearchResults(k=5)  # 검색 결과 문서 수 (필요 시 늘리기)
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
+# Tavily 검색 도구 / LLM은 최초 호출 시 생성 (agents/resources.py)
+def get_llm():
+    return get_chat_model("gpt-4o-mini", temperature=0.2)
 
 # 프롬프트 템플릿 (count 추가)
 prompt = PromptTemplate(
@@ -31,25 +31,22 @@ async def startup_search_node(state: Dict) -> Dict:
     count = state.get("count", 3)  # 기본 3개
     query = state.get("query", f"국내 에듀테크 스타트업 {count}개")
 
-    # Tavily 검색 실행
-    search_results = tavily_tool.run(query)
+    # Tavily 검색 실행 (캐시 / 동일 쿼리 동시 요청 합침)
+    try:
+        search_results = await acached_search("tavily", query)
+    except Exception as e:
+        print(f"Tavily 검색 실패: {e}")
+        search_results = f"검색 실패: {e}"
 
     # count 전달 포함한 프롬프트 구성
     formatted_prompt = prompt.format(query=query, results=search_results, count=count)
 
-    # LLM 호출
-    response = await llm.ainvoke(formatted_prompt)
-    text = response.content.strip()
-
-    # JSON 블록 추출
-    match = re.search(r"\[.*\]", text, re.DOTALL)
-    json_str = match.group(0) if match else text
-    json_str = json_str.replace("```json", "").replace("```", "").strip()
-
+    # LLM 호출 (JSON 배열이 닫히는 즉시 생성 중단)
     try:
-        parsed = json.loads(json_str)
-    except Exception:
-        parsed = [{"raw_output": text}]
+        parsed = await astream_json(get_llm(), formatted_prompt, expect="[")
+    except JSONStreamError as e:
+        print(f"스타트업 목록 파싱 실패: {e}")
+        parsed = [{"raw_output": e.text}]
 
     # LLM 결과가 list가 아닐 경우 보정
     if not isinstance(parsed, list):
@@ -67,9 +64,11 @@ async def startup_search_node(state: Dict) -> Dict:
 
     current = startups[0] if startups else {}
 
-    return {
+    # query/count/concurrency 등 입력 설정은 이후 노드에서도 유지
+    state.update({
         "startups": startups,
         "current_startup": current,
         "processed_startups": [],
         "done": False,
-    }
+    })
+    return state
@@ -0,0 +1,254 @@
+# ai-agent/agents/search_cache.py
+"""
+웹 검색(Tavily, DuckDuckGo) 결과 캐시.
+
+- provider별 TTL (SEARCH_CACHE_TTL_<PROVIDER>, 기본 SEARCH_CACHE_TTL)
+- 빈 결과(Tavily [], DuckDuckGo "No good ... Result") 는 짧은 TTL(SEARCH_CACHE_NEGATIVE_TTL)로만 저장
+- 만료된 행은 열 때, 그리고 PURGE_INTERVAL마다 저장 시점에 삭제
+- SQLite 영속 저장 (SEARCH_CACHE_PATH)
+- 동일 쿼리 동시 요청은 하나의 네트워크 호출로 합침 (in-flight de-duplication)
+
+쿼리는 공백/대소문자를 정규화해서 키로 사용하므로, 같은 시장의 스타트업들이
+보내는 "{query} 시장 규모 전망 2024 2025" 같은 고정 쿼리는 한 번만 검색된다.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from agents.resources import get_resource, get_search_tool
+from agents.search_clients import DUCKDUCKGO_NO_RESULT
+
+PURGE_INTERVAL = 3600.0  # 만료 행 정리 주기(초)
+# 검색 실패와 다름없는 결과 — 잠깐만 캐시 (일시적인 빈 응답이 하루 동안 남지 않도록)
+NEGATIVE_RESULTS = ([], "", DUCKDUCKGO_NO_RESULT)
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(str(query).split()).lower()
+
+
+class _OwnerCancelled(Exception):
+    """합쳐진 검색 호출을 맡은 요청이 취소됨 (대기자는 직접 다시 시도)"""
+
+
+def is_negative(value: Any) -> bool:
+    return value is None or any(value == empty for empty in NEGATIVE_RESULTS)
+
+
+class SearchCache:
+    def __init__(
+        self,
+        path: str,
+        default_ttl: float,
+        ttls: Optional[Dict[str, float]] = None,
+        negative_ttl: float = 300.0,
+    ):
+        self.path = path
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._inflight_sync: Dict[str, threading.Event] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                query TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self._last_purge = 0.0
+        self.purge_expired()
+
+    def ttl_for(self, provider: str) -> float:
+        return self.ttls.get(provider, self.default_ttl)
+
+    def _ttl(self, provider: str, value: Any) -> float:
+        ttl = self.ttl_for(provider)
+        return min(ttl, self.negative_ttl) if is_negative(value) else ttl
+
+    def purge_expired(self) -> int:
+        """provider별 TTL이 지난 행과 negative TTL이 지난 빈 결과 삭제, 삭제 행 수 반환"""
+        now = time.time()
+        negatives = [json.dumps(v, ensure_ascii=False) for v in NEGATIVE_RESULTS] + ["null"]
+        with self._lock:
+            deleted = 0
+            providers = [row[0] for row in self._conn.execute("SELECT DISTINCT provider FROM search_cache")]
+            for provider in providers:
+                deleted += self._conn.execute(
+                    "DELETE FROM search_cache WHERE provider = ? AND created_at < ?",
+                    (provider, now - self.ttl_for(provider)),
+                ).rowcount
+            deleted += self._conn.execute(
+                f"DELETE FROM search_cache WHERE created_at < ? AND value IN ({', '.join('?' * len(negatives))})",
+                (now - self.negative_ttl, *negatives),
+            ).rowcount
+            self._conn.commit()
+            self._last_purge = now
+        return deleted
+
+    @staticmethod
+    def make_key(provider: str, query: str) -> str:
+        return hashlib.sha256(f"{provider}\x00{normalize_query(query)}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, key: str, provider: str) -> Tuple[bool, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if not row:
+            return False, None
+        value = json.loads(row[0])
+        if time.time() - row[1] > self._ttl(provider, value):
+            return False, None
+        return True, value
+
+    def get(self, provider: str, query: str) -> Optional[Any]:
+        found, value = self._lookup(self.make_key(provider, query), provider)
+        return value if found else None
+
+    def set(self, provider: str, query: str, value: Any) -> None:
+        if is_negative(value) and self.negative_ttl <= 0:
+            return
+        if time.time() - self._last_purge > PURGE_INTERVAL:
+            self.purge_expired()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, provider, query, value, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.make_key(provider, query), provider, query, json.dumps(value, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+
+    async def afetch(self, provider: str, query: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """캐시 조회 → 없으면 loader() 실행. 같은 키의 동시 요청은 결과를 공유"""
+        key = self.make_key(provider, query)
+        while True:
+            found, value = self._lookup(key, provider)
+            if found:
+                self.hits += 1
+                return value
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except _OwnerCancelled:
+                # 호출을 맡은 요청이 취소됨 → 캐시 재확인 후 직접 호출 (또는 새 owner 대기)
+                continue
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+            self.set(provider, query, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            # 취소는 owner에게만 — 대기자들은 _OwnerCancelled를 받고 다시 시도
+            self._inflight.pop(key, None)
+            future.set_exception(_OwnerCancelled())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 대기자가 없으면 "exception was never retrieved" 경고 방지
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def fetch(self, provider: str, query: str, loader: Callable[[], Any]) -> Any:
+        """afetch의 동기 버전 (스레드 간 동시 요청 합침)"""
+        key = self.make_key(provider, query)
+        while True:
+            found, value = self._lookup(key, provider)
+            if found:
+                self.hits += 1
+                return value
+            with self._lock:
+                event = self._inflight_sync.get(key)
+                if event is None:
+                    event = threading.Event()
+                    self._inflight_sync[key] = event
+                    owner = True
+                else:
+                    owner = False
+            if owner:
+                break
+            # 다른 스레드의 호출이 끝나면 캐시를 다시 확인 (실패했다면 직접 호출)
+            self.coalesced += 1
+            event.wait()
+
+        self.misses += 1
+        try:
+            value = loader()
+            self.set(provider, query, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight_sync.pop(key, None)
+            event.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced}
+
+
+def create_search_cache_from_env() -> SearchCache:
+    """
+    SEARCH_CACHE_PATH (기본 .cache/search_cache.sqlite), SEARCH_CACHE_TTL 초 (기본 1일),
+    SEARCH_CACHE_TTL_TAVILY / SEARCH_CACHE_TTL_DUCKDUCKGO (provider별 TTL),
+    SEARCH_CACHE_NEGATIVE_TTL 초 (빈 결과 TTL, 기본 300, 0 이하면 저장 안 함)
+    """
+    default_ttl = float(os.getenv("SEARCH_CACHE_TTL", str(24 * 3600)))
+    ttls = {}
+    for provider in ("tavily", "duckduckgo"):
+        value = os.getenv(f"SEARCH_CACHE_TTL_{provider.upper()}")
+        if value:
+            ttls[provider] = float(value)
+    return SearchCache(
+        path=os.getenv("SEARCH_CACHE_PATH", os.path.join(".cache", "search_cache.sqlite")),
+        default_ttl=default_ttl,
+        ttls=ttls,
+        negative_ttl=float(os.getenv("SEARCH_CACHE_NEGATIVE_TTL", "300")),
+    )
+
+
+def get_search_cache() -> SearchCache:
+    return get_resource("search_cache", create_search_cache_from_env)
+
+
+# ---------------------------
+# 캐시를 거치는 검색 호출
+# ---------------------------
+def cached_search(provider: str, query: str) -> Any:
+    return get_search_cache().fetch(provider, query, lambda: get_search_tool(provider).run(query))
+
+
+async def acached_search(provider: str, query: str) -> Any:
+    """비동기 어댑터(agents/search_clients.py)로 검색 — 이벤트 루프를 막지 않음"""
+    from agents.search_clients import asearch
+    return await get_search_cache().afetch(provider, query, lambda: asearch(provider, query))
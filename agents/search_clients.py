@@ -0,0 +1,134 @@
+# ai-agent/agents/search_clients.py
+"""
+비동기 웹 검색 어댑터.
+
+langchain 도구의 `.run()`은 동기 호출이라 async 노드 안에서 이벤트 루프를 멈춘다.
+여기서는 같은 반환 형식을 유지하면서
+- Tavily: 공유 aiohttp 세션(agents/resources.get_http_session, keep-alive 커넥션 풀)으로 REST API 직접 호출
+- DuckDuckGo: 전용 스레드 풀 + 스레드별 DDGS 클라이언트(세션 재사용)
+으로 실행하고, 호출마다 deadline(timeout)을 건다.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import aiohttp
+
+from agents.metrics import REGISTRY
+from agents.resources import get_http_session
+
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+TAVILY_MAX_RESULTS = 5
+DUCKDUCKGO_MAX_RESULTS = 5
+DUCKDUCKGO_NO_RESULT = "No good DuckDuckGo Search Result was found"  # search_cache는 짧은 negative TTL로만 저장
+
+
+class SearchError(RuntimeError):
+    """검색 실패 (timeout, HTTP 오류 등) — 캐시에 저장되지 않음"""
+
+
+def _timeout(provider: str, default: float) -> float:
+    return float(os.getenv(f"SEARCH_TIMEOUT_{provider.upper()}", str(default)))
+
+
+# ---------------------------
+# Tavily (aiohttp)
+# ---------------------------
+async def tavily_search(query: str, max_results: int = TAVILY_MAX_RESULTS) -> List[Dict[str, Any]]:
+    """TavilySearchResults.run()과 같은 [{title, url, content, score}] 리스트 반환"""
+    payload = {
+        "api_key": os.getenv("TAVILY_API_KEY", ""),
+        "query": query,
+        "max_results": max_results,
+        "search_depth": "advanced",
+        "include_answer": False,
+        "include_raw_content": False,
+        "include_images": False,
+    }
+    timeout = aiohttp.ClientTimeout(total=_timeout("tavily", 15))
+    try:
+        async with get_http_session().post(TAVILY_SEARCH_URL, json=payload, timeout=timeout) as res:
+            if res.status != 200:
+                raise SearchError(f"Tavily HTTP {res.status}: {(await res.text())[:200]}")
+            data = await res.json()
+    except asyncio.TimeoutError as e:
+        raise SearchError(f"Tavily timeout: {query}") from e
+    except aiohttp.ClientError as e:
+        raise SearchError(f"Tavily request failed: {e}") from e
+
+    return [
+        {
+            "title": item.get("title", ""),
+            "url": item.get("url", ""),
+            "content": item.get("content", ""),
+            "score": item.get("score"),
+        }
+        for item in data.get("results", [])
+    ]
+
+
+# ---------------------------
+# DuckDuckGo (thread pool)
+# ---------------------------
+_ddg_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("DUCKDUCKGO_WORKERS", "4")),
+    thread_name_prefix="duckduckgo",
+)
+_ddg_local = threading.local()
+
+
+def _ddgs_client():
+    client = getattr(_ddg_local, "client", None)
+    if client is None:
+        try:
+            from ddgs import DDGS
+        except ImportError:
+            from duckduckgo_search import DDGS
+        client = DDGS(timeout=int(_timeout("duckduckgo", 10)))
+        _ddg_local.client = client
+    return client
+
+
+def _duckduckgo_text(query: str, max_results: int) -> str:
+    results = _ddgs_client().text(
+        query, region="wt-wt", safesearch="moderate", timelimit="y", max_results=max_results
+    )
+    results = list(results or [])
+    if not results:
+        return DUCKDUCKGO_NO_RESULT
+    return " ".join(r.get("body", "") for r in results)
+
+
+async def duckduckgo_search(query: str, max_results: int = DUCKDUCKGO_MAX_RESULTS) -> str:
+    """DuckDuckGoSearchRun.run()과 같은 형식(본문 스니펫을 이어붙인 문자열) 반환"""
+    loop = asyncio.get_running_loop()
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(_ddg_executor, _duckduckgo_text, query, max_results),
+            timeout=_timeout("duckduckgo", 10),
+        )
+    except asyncio.TimeoutError as e:
+        raise SearchError(f"DuckDuckGo timeout: {query}") from e
+    except Exception as e:
+        raise SearchError(f"DuckDuckGo search failed: {e}") from e
+
+
+SEARCH_PROVIDERS = {
+    "tavily": tavily_search,
+    "duckduckgo": duckduckgo_search,
+}
+
+
+async def asearch(provider: str, query: str) -> Any:
+    try:
+        search = SEARCH_PROVIDERS[provider]
+    except KeyError:
+        raise ValueError(f"unknown search provider: {provider}")
+    started = time.perf_counter()
+    try:
+        return await search(query)
+    finally:
+        REGISTRY.observe("search_request_duration_seconds", time.perf_counter() - started, provider=provider)
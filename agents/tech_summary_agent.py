@@ -1,17 +1,18 @@
-from langchain_community.chat_models import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
 from typing import Dict
 import json
-import re
 from dotenv import load_dotenv
+from agents.json_stream import astream_json
+from agents.resources import get_chat_model
 from prompts.tech_summary_prompt import TECH_SUMMARY_PROMPT_TEMPLATE
 
 load_dotenv()
 
 # ---------------------------
-# LLM 초기화
+# LLM (최초 호출 시 생성)
 # ---------------------------
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
+def get_llm():
+    return get_chat_model("gpt-4o-mini", temperature=0.2)
 
 prompt = PromptTemplate(
     input_variables=["startup_info"],
@@ -38,15 +39,8 @@ async def tech_summary_node(state: Dict) -> Dict:
     try:
         startup_info = json.dumps(current, ensure_ascii=False, indent=2)
         formatted_prompt = prompt.format(startup_info=startup_info)
-        response = await llm.ainvoke(formatted_prompt)
-        text = response.content.strip()
-
-        # JSON만 추출
-        match = re.search(r"\{.*\}", text, re.DOTALL)
-        json_str = match.group(0) if match else text
-        json_str = json_str.replace("```json", "").replace("```", "").strip()
-
-        parsed = json.loads(json_str)
+        # JSON 객체가 닫히는 즉시 생성 중단
+        parsed = await astream_json(get_llm(), formatted_prompt, expect="{")
     except Exception as e:
         parsed = {
             "summary": f"요약 실패: {e}",
@@ -0,0 +1,226 @@
+# ai-agent/agents/vector_store.py
+"""
+내부 PDF(data/) → FAISS 벡터 DB(db_faiss/).
+
+db_faiss/manifest.json 에 문서별 파일 해시와 청크 ID를 기록해 두고,
+로드할 때마다 data/ 와 비교하여
+- 새 문서 / 내용이 바뀐 문서만 임베딩하여 추가하고
+- 삭제되었거나 바뀐 문서의 기존 청크는 인덱스에서 제거한다.
+
+    python -m agents.vector_store            # 변경분만 반영
+    python -m agents.vector_store --rebuild  # 전체 재생성
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+# Vector DB (faiss) and document loader imports
+from langchain_community.vectorstores import FAISS
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_community.document_loaders import PyPDFLoader
+from langchain_core.documents import Document
+
+# HuggingFace sentence transformers
+from langchain_huggingface import HuggingFaceEmbeddings
+
+# ---------------------------
+# 설정
+# ---------------------------
+DATA_DIR = "data"
+PERSIST_PATH = "db_faiss"
+MANIFEST_FILE = "manifest.json"
+EMBEDDINGS_MODEL_NAME = "dragonkue/multilingual-e5-small-ko"
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 50
+
+
+def create_embeddings() -> HuggingFaceEmbeddings:
+    """임베딩 모델 로드 (SentenceTransformer, CPU)"""
+    return HuggingFaceEmbeddings(
+        model_name=EMBEDDINGS_MODEL_NAME,
+        model_kwargs={"device": "cpu"}
+    )
+
+
+# ---------------------------
+# Manifest
+# ---------------------------
+def _manifest_path() -> str:
+    return os.path.join(PERSIST_PATH, MANIFEST_FILE)
+
+
+def _new_manifest() -> Dict:
+    return {
+        "embeddings_model": EMBEDDINGS_MODEL_NAME,
+        "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+        "documents": {},
+    }
+
+
+def load_manifest() -> Optional[Dict]:
+    path = _manifest_path()
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest: Dict) -> None:
+    os.makedirs(PERSIST_PATH, exist_ok=True)
+    tmp_path = _manifest_path() + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, _manifest_path())
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def list_source_files() -> List[str]:
+    pattern = os.path.join(DATA_DIR, "**", "*.pdf")
+    return sorted(os.path.normpath(p) for p in glob.glob(pattern, recursive=True))
+
+
+def _bootstrap_manifest(db: FAISS) -> Dict:
+    """
+    manifest 없이 저장된 기존 인덱스: docstore의 metadata["source"]로 청크를 문서별로 묶는다.
+    현재 data/ 에 있는 문서는 변경 없음으로 간주하고, 원본이 없는 문서는 sha256 없이 기록해
+    같은 동기화에서 삭제된 문서로 처리한다 (인덱스는 항상 data/ 와 일치).
+    """
+    manifest = _new_manifest()
+    documents = manifest["documents"]
+    for doc_id in db.index_to_docstore_id.values():
+        doc = db.docstore.search(doc_id)
+        if not isinstance(doc, Document):
+            continue
+        source = os.path.normpath(doc.metadata.get("source", "unknown"))
+        entry = documents.setdefault(source, {"sha256": None, "chunk_ids": []})
+        entry["chunk_ids"].append(doc_id)
+
+    for source, entry in documents.items():
+        if os.path.exists(source):
+            entry["sha256"] = file_sha256(source)
+    return manifest
+
+
+def _split_document(path: str, sha256: str) -> Tuple[List[Document], List[str]]:
+    splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    chunks = splitter.split_documents(PyPDFLoader(path).load())
+    for chunk in chunks:
+        chunk.metadata["source"] = path
+    # 청크 ID = (경로 + 파일 해시)의 해시 + 순번 — 같은 내용의 다른 파일과 충돌하지 않음
+    prefix = hashlib.sha256(f"{path}\x00{sha256}".encode("utf-8")).hexdigest()[:16]
+    ids = [f"{prefix}-{i}" for i in range(len(chunks))]
+    return chunks, ids
+
+
+# ---------------------------
+# 인덱스 동기화
+# ---------------------------
+def sync_vector_db(db: Optional[FAISS], embeddings: HuggingFaceEmbeddings) -> Tuple[FAISS, Dict[str, List[str]]]:
+    """
+    data/ 의 PDF와 manifest를 비교하여 변경분만 인덱스에 반영.
+    반환: (db, {"added": [...], "updated": [...], "removed": [...]})
+    """
+    manifest = load_manifest()
+    manifest_missing = manifest is None
+    if manifest_missing:
+        manifest = _bootstrap_manifest(db) if db is not None else _new_manifest()
+    documents: Dict[str, Dict] = manifest["documents"]
+
+    current = {path: file_sha256(path) for path in list_source_files()}
+    changes: Dict[str, List[str]] = {"added": [], "updated": [], "removed": []}
+
+    # 1) 삭제/변경된 문서의 기존 청크 제거
+    stale_ids: List[str] = []
+    for source in list(documents):
+        entry = documents[source]
+        if source not in current:
+            changes["removed"].append(source)
+        elif entry.get("sha256") != current[source]:
+            changes["updated"].append(source)
+        else:
+            continue
+        stale_ids.extend(entry.get("chunk_ids", []))
+        del documents[source]
+
+    if stale_ids and db is not None:
+        db.delete(stale_ids)
+
+    # 2) 새 문서 / 변경된 문서만 임베딩하여 추가
+    for source, sha256 in current.items():
+        if source in documents:
+            continue
+        if source not in changes["updated"]:
+            changes["added"].append(source)
+        chunks, ids = _split_document(source, sha256)
+        if chunks:
+            if db is None:
+                db = FAISS.from_documents(chunks, embeddings, ids=ids)
+            else:
+                db.add_documents(chunks, ids=ids)
+        documents[source] = {"sha256": sha256, "chunk_ids": ids}
+
+    if db is None:
+        raise FileNotFoundError(f"{DATA_DIR}/ 에 인덱싱할 PDF가 없습니다.")
+
+    if any(changes.values()) or manifest_missing:
+        db.save_local(PERSIST_PATH)
+        save_manifest(manifest)
+    return db, changes
+
+
+def build_vector_db(embeddings: HuggingFaceEmbeddings) -> FAISS:
+    """data/ 아래 PDF 전체를 임베딩하여 FAISS 인덱스 새로 생성"""
+    manifest_path = _manifest_path()
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    db, _ = sync_vector_db(None, embeddings)
+    return db
+
+
+def load_vector_db(embeddings: HuggingFaceEmbeddings) -> FAISS:
+    """저장된 인덱스 로드 후 data/ 변경분 반영 (VECTOR_DB_SYNC=0이면 반영 생략)"""
+    if not os.path.exists(os.path.join(PERSIST_PATH, "index.faiss")):
+        return build_vector_db(embeddings)
+
+    db = FAISS.load_local(
+        PERSIST_PATH,
+        embeddings,
+        allow_dangerous_deserialization=True
+    )
+    if os.getenv("VECTOR_DB_SYNC", "1").lower() in ("0", "false", "no"):
+        return db
+
+    db, changes = sync_vector_db(db, embeddings)
+    if any(changes.values()):
+        print(f"[벡터DB] 추가 {len(changes['added'])} / 변경 {len(changes['updated'])} / 삭제 {len(changes['removed'])}")
+    return db
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="data/ PDF → db_faiss 인덱스 동기화")
+    parser.add_argument("--rebuild", action="store_true", help="manifest를 무시하고 전체 재생성")
+    args = parser.parse_args()
+
+    embeddings = create_embeddings()
+    if args.rebuild:
+        db = build_vector_db(embeddings)
+        print(f"전체 재생성 완료: {db.index.ntotal}개 청크")
+    else:
+        exists = os.path.exists(os.path.join(PERSIST_PATH, "index.faiss"))
+        db = FAISS.load_local(PERSIST_PATH, embeddings, allow_dangerous_deserialization=True) if exists else None
+        db, changes = sync_vector_db(db, embeddings)
+        for kind in ("added", "updated", "removed"):
+            for source in changes[kind]:
+                print(f"{kind:>8}: {source}")
+        print(f"동기화 완료: {db.index.ntotal}개 청크")
@@ -0,0 +1,117 @@
+# ai-agent/benchmarks/import_time.py
+"""
+콜드 스타트(import) 비용 측정.
+
+모듈마다 새 파이썬 프로세스에서 `python -X importtime -c "import <module>"`을 실행하여
+누적 import 시간, 가장 무거운 하위 import, 프로세스 최대 RSS를 출력한다.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py integration report_server --top 5
+    python benchmarks/import_time.py --budget 1.5   # 어느 모듈이든 1.5초를 넘으면 exit 1
+
+import에 실패한 모듈이 있으면 (budget 지정 여부와 관계없이) exit 1.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    "agents.resources",
+    "agents.search_agent",
+    "agents.tech_summary_agent",
+    "agents.market_analysis_graph",
+    "agents.market_analysis_agent",
+    "agents.competitor_analysis_agent",
+    "agents.investment_decision_agent",
+    "agents.report_agent",
+    "integration",
+    "report_server",
+]
+
+# 자식 프로세스: import 후 최대 RSS(KB)를 stdout에 출력
+CHILD_CODE = (
+    "import resource, sys\n"
+    "import {module}\n"
+    "rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    "if sys.platform == 'darwin': rss //= 1024\n"
+    "print(rss)\n"
+)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """`import time: self [us] | cumulative | imported package` 라인 파싱"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+        except ValueError:
+            continue
+    return rows
+
+
+def measure(module: str) -> Dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_CODE.format(module=module)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    rows = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "unknown error"
+        return {"module": module, "error": error}
+
+    total_us = next((cum for name, _, cum in rows if name == module), 0)
+    # 대상 모듈 자신을 제외한 최상위 무거운 import
+    heavy = sorted(
+        ((name, cum) for name, _, cum in rows if name != module and "." not in name),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    return {
+        "module": module,
+        "seconds": total_us / 1_000_000,
+        "max_rss_mb": int(proc.stdout.strip().splitlines()[-1]) / 1024,
+        "heaviest": heavy,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="모듈별 import 시간 측정")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=3, help="모듈별로 표시할 무거운 하위 import 개수")
+    parser.add_argument("--budget", type=float, default=None, help="모듈당 허용 import 시간(초)")
+    args = parser.parse_args()
+
+    over_budget, failed = [], []
+    print(f"{'module':<40} {'import(s)':>10} {'max RSS(MB)':>12}  heaviest imports")
+    print("-" * 100)
+    for module in args.modules:
+        result = measure(module)
+        if "error" in result:
+            print(f"{module:<40} {'ERROR':>10} {'-':>12}  {result['error']}")
+            failed.append(module)
+            continue
+        heaviest = ", ".join(f"{name} {cum / 1_000_000:.2f}s" for name, cum in result["heaviest"][: args.top])
+        print(f"{module:<40} {result['seconds']:>10.3f} {result['max_rss_mb']:>12.1f}  {heaviest}")
+        if args.budget is not None and result["seconds"] > args.budget:
+            over_budget.append(module)
+
+    if failed:
+        print(f"\nimport 실패: {', '.join(failed)}")
+    if over_budget:
+        print(f"\nimport budget({args.budget}s) 초과: {', '.join(over_budget)}")
+    return 1 if failed or over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
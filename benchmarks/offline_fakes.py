@@ -0,0 +1,324 @@
+# ai-agent/benchmarks/offline_fakes.py
+"""
+오프라인 벤치마크용 가짜 LLM / 검색 / 벡터 DB.
+
+- FakeOpenAIBackend : OpenAI HTTP API 대체. 프롬프트 머리말(prompts/ 및 에이전트 모듈의 템플릿)로 어떤
+                      단계인지 판별해 해당 프롬프트의 JSON 형식에 맞는 고정 응답을 지정된 지연시간 후 반환.
+                      ChatOpenAI 자체는 바꾸지 않으므로 스케줄러/LLM 캐시/메트릭 경로가 실제와 같다
+- fake_tavily / fake_duckduckgo : search_clients.SEARCH_PROVIDERS 대체 (네트워크 없음)
+- install()     : agents.resources 레지스트리와 검색 provider를 가짜로 교체
+"""
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Tuple
+
+from agents.context_budget import count_tokens
+
+SAMPLE_REPORT_TEXT = (
+    "국내 에듀테크 시장은 공교육 디지털 전환과 AI 디지털 교과서 도입으로 연평균 12% 성장이 예상된다. "
+    "K-12 세그먼트 비중이 가장 크며, 진입 장벽은 중간 수준이다. "
+) * 4
+
+
+def _tech_summary() -> Dict[str, Any]:
+    return {
+        "summary": "AI 기반 적응형 학습 엔진과 학습 분석 대시보드를 제공한다.",
+        "highlights": ["적응형 학습 경로", "실시간 학습 분석"],
+        "gaps": ["STEM 외 과목 커버리지", "B2G 영업 역량"],
+    }
+
+
+def _competitors() -> Dict[str, Any]:
+    return {
+        "competitors": [
+            {
+                "name": f"경쟁사{i}",
+                "description": "K-12 대상 AI 튜터링 서비스",
+                "category": "B2C",
+                "founded_year": "2019",
+                "estimated_revenue": "Unknown",
+                "key_products": ["AI 튜터"],
+                "target_market": "초중고 학생",
+                "funding_stage": "Series A",
+                "competitive_overlap": "중간",
+            }
+            for i in range(1, 4)
+        ]
+    }
+
+
+def _competition_analysis() -> Dict[str, Any]:
+    return {
+        "competition_intensity": 6,
+        "market_positioning": "Niche Market",
+        "differentiation_factors": ["커리큘럼 정합성", "교사용 대시보드"],
+        "competitive_advantages": ["Technology", "Network Effect"],
+        "entry_barriers": "중간",
+        "key_threats": ["대형 에듀테크 진입", "가격 경쟁"],
+        "market_share_potential": 6,
+    }
+
+
+def _positioning() -> Dict[str, Any]:
+    return {
+        "positioning_score": 7,
+        "differentiation_score": 7,
+        "competitive_moat": {"technology": 7, "brand": 5, "network_effect": 4, "data": 6, "overall": 6},
+        "sustainability": {"score": 6, "reasoning": "학습 데이터 축적으로 개인화 품질이 개선됨"},
+        "recommendations": ["B2G 파트너십 확대", "STEM 콘텐츠 강화"],
+    }
+
+
+def _scores() -> Dict[str, Any]:
+    return {
+        "scores": {
+            "educational_efficacy": {"subtotal": 18, "max": 25},
+            "market_traction": {"subtotal": 13, "max": 20},
+            "team": {"subtotal": 14, "max": 20},
+            "technology": {"subtotal": 11, "max": 15},
+            "business_model": {"subtotal": 7, "max": 10},
+            "competition": {"subtotal": 3, "max": 5},
+            "compliance": {"subtotal": 4, "max": 5},
+        },
+        "total_score": 70,
+        "percentile_rank": "상위 30%",
+    }
+
+
+def _risks() -> Dict[str, Any]:
+    item = {"level": 5, "likelihood": "중간", "impact": "중간"}
+    return {
+        "market_risk": dict(item),
+        "technology_risk": dict(item),
+        "execution_risk": dict(item),
+        "financial_risk": dict(item),
+        "competition_risk": dict(item),
+        "regulatory_risk": dict(item),
+        "overall_risk_score": 5.0,
+    }
+
+
+def _decision(invest: bool) -> Dict[str, Any]:
+    return {
+        "decision": "유치" if invest else "보류",
+        "confidence": "중간",
+        "key_strengths": ["적응형 학습 기술", "교사 네트워크"],
+        "key_concerns": ["매출 규모", "규제 리스크"],
+        "investment_thesis": "공교육 디지털 전환 수혜가 기대되는 적응형 학습 플랫폼이다.",
+        "recommended_actions": ["개인정보 보호 실사", "B2G 파일럿 확인"],
+        "valuation_suggestion": "Pre-money 80억 원",
+        "expected_return": "3~5년 3x",
+        "exit_strategy": "전략적 M&A",
+    }
+
+
+def _report_summary() -> Dict[str, Any]:
+    section = {"paragraph": "Adaptive learning platform with curriculum-aligned content.", "bullets": ["Adaptive paths"]}
+    return {
+        "executive_summary": "Adaptive AI tutoring for K-12 classrooms.",
+        "technology": dict(section),
+        "market_competition": dict(section),
+        "risk": dict(section),
+        "investment": dict(section),
+        "headline_points": ["Top 30%"],
+    }
+
+
+def _startups(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "name": f"벤치스타트업{i:03d}",
+            "tech": ["AI 적응형 학습", "학습 분석"],
+            "market": f"국내 K-12 에듀테크 세그먼트 {i % 5}",
+            "competitors": ["경쟁사1", "경쟁사2"],
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def _signature(template: str) -> str:
+    """템플릿의 앞 두 줄 (포맷 후에도 그대로 남는 고정 문구)"""
+    lines = [line for line in template.strip().splitlines() if line.strip()]
+    return "\n".join(lines[:2])
+
+
+def _build_routes(startup_count: int, invest: bool) -> List[Tuple[str, Any]]:
+    from prompts.competitor_analysis_prompt import (
+        COMPETITOR_ANALYSIS_PROMPT,
+        COMPETITOR_DISCOVERY_PROMPT,
+        COMPETITOR_POSITIONING_PROMPT,
+    )
+    from prompts.investment_decision_prompt import (
+        INVESTMENT_DECISION_PROMPT,
+        INVESTMENT_RISK_PROMPT,
+        INVESTMENT_SCORING_PROMPT,
+    )
+    from prompts.search_prompt import SEARCH_PROMPT_TEMPLATE
+    from prompts.tech_summary_prompt import TECH_SUMMARY_PROMPT_TEMPLATE
+
+    return [
+        (_signature(SEARCH_PROMPT_TEMPLATE), _startups(startup_count)),
+        (_signature(TECH_SUMMARY_PROMPT_TEMPLATE), _tech_summary()),
+        (_signature(COMPETITOR_DISCOVERY_PROMPT), _competitors()),
+        (_signature(COMPETITOR_ANALYSIS_PROMPT), _competition_analysis()),
+        (_signature(COMPETITOR_POSITIONING_PROMPT), _positioning()),
+        (_signature(INVESTMENT_SCORING_PROMPT), _scores()),
+        (_signature(INVESTMENT_RISK_PROMPT), _risks()),
+        (_signature(INVESTMENT_DECISION_PROMPT), _decision(invest)),
+        ("You are an investment memo editor", _report_summary()),
+    ]
+
+
+def _structured(schema_name: str, invest: bool) -> Dict[str, Any]:
+    """with_structured_output 스키마별 고정 응답"""
+    if schema_name == "QueryClassification":
+        return {"query_type": "market_size", "needs_web_search": True, "analysis_depth": "intermediate"}
+    if schema_name == "MarketScore":
+        return {
+            "market_size_score": 18, "growth_score": 22, "competition_score": 15,
+            "risk_score": 12, "total_score": 67, "justification": "성장성은 높으나 경쟁 강도가 중간 이상",
+        }
+    if schema_name == "InvestmentEvaluation":
+        return {"investment_scores": _scores(), "risk_assessment": _risks(), "investment_decision": _decision(invest)}
+    if schema_name == "CompetitorEvaluation":
+        return {
+            "competitors": _competitors()["competitors"],
+            "competitor_analysis": _competition_analysis(),
+            "competitive_positioning": _positioning(),
+        }
+    raise ValueError(f"no canned structured output for {schema_name}")
+
+
+def _message_text(message: Dict[str, Any]) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):  # [{"type": "text", "text": ...}, ...]
+        return "\n".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return str(content)
+
+
+def _sdk_httpx():
+    """openai SDK가 쓰는 httpx 모듈 (SDK 버전에 따라 httpx 또는 httpx2) — 다른 쪽 Response는 SDK가 거부"""
+    from openai import _base_client
+    return getattr(_base_client, "httpx2", None) or _base_client.httpx
+
+
+class FakeOpenAIBackend:
+    """
+    OpenAI /chat/completions 대체 (httpx MockTransport 핸들러).
+    get_chat_model()이 만드는 실제 ScheduledChatOpenAI(스케줄러, LLM 캐시, MetricsCallback)가 그대로 동작하고
+    HTTP 요청만 여기서 latency초 후 고정 응답으로 끝난다.
+    - 프롬프트 머리말로 단계를 판별해 해당 프롬프트의 JSON 형식 응답
+    - response_format.json_schema(with_structured_output)는 스키마 이름별 고정 응답
+    - stream=true면 SSE 청크 + usage 청크
+    """
+
+    def __init__(self, latency: float, startup_count: int, invest: bool):
+        self.latency = latency
+        self.invest = invest
+        self.routes = _build_routes(startup_count, invest)
+        self.httpx = _sdk_httpx()
+
+    def _content(self, body: Dict[str, Any], prompt: str) -> str:
+        schema = ((body.get("response_format") or {}).get("json_schema") or {}).get("name")
+        if schema:
+            return json.dumps(_structured(schema, self.invest), ensure_ascii=False)
+        for signature, payload in self.routes:
+            if signature in prompt:
+                return json.dumps(payload, ensure_ascii=False)
+        # 시장성 그래프의 자유 서술형 분석/최종 보고서
+        return SAMPLE_REPORT_TEXT
+
+    def _response(self, request) -> Any:
+        if not request.url.path.endswith("/chat/completions"):
+            return self.httpx.Response(404, json={"error": {"message": f"offline backend: {request.url.path}"}})
+        body = json.loads(request.content)
+        prompt = "\n".join(_message_text(m) for m in body.get("messages", []))
+        content = self._content(body, prompt)
+        prompt_tokens = count_tokens(prompt)
+        completion_tokens = count_tokens(content)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        base = {"id": f"chatcmpl-{uuid.uuid4().hex[:12]}", "created": int(time.time()), "model": body.get("model")}
+        if not body.get("stream"):
+            return self.httpx.Response(200, json={
+                **base,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+        chunk = {**base, "object": "chat.completion.chunk"}
+        events = [
+            {**chunk, "choices": [{"index": 0, "delta": {"role": "assistant", "content": content}, "finish_reason": None}]},
+            {**chunk, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]},
+        ]
+        if (body.get("stream_options") or {}).get("include_usage"):
+            events.append({**chunk, "choices": [], "usage": usage})
+        sse = "".join(f"data: {json.dumps(event, ensure_ascii=False)}\n\n" for event in events) + "data: [DONE]\n\n"
+        return self.httpx.Response(200, content=sse.encode("utf-8"), headers={"content-type": "text/event-stream"})
+
+    def handle(self, request) -> Any:
+        time.sleep(self.latency)
+        return self._response(request)
+
+    async def ahandle(self, request) -> Any:
+        await asyncio.sleep(self.latency)
+        return self._response(request)
+
+    def transports(self) -> Tuple[Any, Any]:
+        """(sync, async) MockTransport — resources.get_openai_http_clients()가 사용"""
+        return self.httpx.MockTransport(self.handle), self.httpx.MockTransport(self.ahandle)
+
+
+class FakeSearchTool:
+    """langchain 검색 도구(.run) 대체 — 동기 경로(cached_search)용"""
+
+    def __init__(self, provider: str, latency: float):
+        self.provider = provider
+        self.latency = latency
+
+    def run(self, query: str) -> Any:
+        time.sleep(self.latency)
+        return _search_result(self.provider, query)
+
+
+def _search_result(provider: str, query: str) -> Any:
+    if provider == "tavily":
+        return [
+            {"title": f"{query} 관련 기사 {i}", "url": f"https://example.com/{i}", "content": SAMPLE_REPORT_TEXT[:300], "score": 0.9 - i * 0.1}
+            for i in range(5)
+        ]
+    return SAMPLE_REPORT_TEXT[:600]
+
+
+def install(llm_latency: float, search_latency: float, startup_count: int, invest: bool = False) -> None:
+    """agents.resources / search_clients를 가짜 구현으로 교체 (에이전트 import 전후 모두 가능)"""
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+
+    from agents import search_clients
+    from agents.resources import override_resource
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-offline-benchmark")  # 요청은 MockTransport에서 끝남
+    backend = FakeOpenAIBackend(latency=llm_latency, startup_count=startup_count, invest=invest)
+    override_resource("openai_http_transports", backend.transports())
+
+    embeddings = DeterministicFakeEmbedding(size=384)
+    texts = [f"{SAMPLE_REPORT_TEXT[:200]} 문서 {i}" for i in range(200)]
+    override_resource("embeddings", embeddings)
+    override_resource("vector_db", FAISS.from_texts(texts, embeddings))
+
+    async def fake_search(provider: str, query: str) -> Any:
+        await asyncio.sleep(search_latency)
+        return _search_result(provider, query)
+
+    search_clients.SEARCH_PROVIDERS["tavily"] = lambda q: fake_search("tavily", q)
+    search_clients.SEARCH_PROVIDERS["duckduckgo"] = lambda q: fake_search("duckduckgo", q)
+    for provider in ("tavily", "duckduckgo"):
+        override_resource(("search_tool", provider), FakeSearchTool(provider, search_latency))
@@ -0,0 +1,299 @@
+# ai-agent/benchmarks/pipeline_benchmark.py
+"""
+오프라인 end-to-end 처리량 벤치마크.
+
+OpenAI HTTP API / TavilySearchResults / DuckDuckGoSearchRun / 임베딩·FAISS를 benchmarks/offline_fakes.py의
+가짜 구현(지연시간 설정 가능, prompts/ 형식의 고정 JSON 응답)으로 바꾼 뒤 investment_graph를
+N개의 합성 스타트업으로 실행한다. ChatOpenAI는 실제 get_chat_model() 경로(스케줄러, LLM 캐시)를 그대로 거친다.
+네트워크와 OpenAI 크레딧 없이 파이프라인 자체 오버헤드와 동시성/캐시 설정의 효과를 측정한다.
+
+머신 성능에 따라 절대값이 달라지므로 baseline은 같은 프로세스에서 먼저 실행한 기준 실행
+(스타트업 1개, 순차, LLM 캐시 없음)에 대한 비율로 비교한다.
+- throughput_ratio : 처리량 / (min(동시성, 스타트업 수) × 기준 실행 처리량) — 병렬 효율
+- p50_ratio / p95_ratio : 스타트업별 지연시간 / 기준 실행 지연시간
+- rss_growth : 최대 RSS / 기준 실행 직후 RSS — 허용 범위는 --memory-tolerance (기본 25%)
+절대값(분당 처리 수, 초, MB)은 참고용으로만 출력한다.
+benchmarks/baselines.json(--baseline으로 머신별 파일 지정 가능)의 같은 시나리오 기준값보다
+허용 범위 이상 나빠지거나, 시나리오/지표의 기준값이 없으면 exit 1 (--update-baseline으로 기록).
+
+    python benchmarks/pipeline_benchmark.py --startups 20 --concurrency 4
+    python benchmarks/pipeline_benchmark.py --startups 20 --concurrency 4 --update-baseline
+    python benchmarks/pipeline_benchmark.py --startups 5 --reports   # 투자 확정 → 보고서(in-process 렌더링)까지
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baselines.json")
+
+# 지표별 비교 방향 (True: 클수록 좋음)
+METRICS = {
+    "throughput_ratio": True,
+    "p50_ratio": False,
+    "p95_ratio": False,
+    "rss_growth": False,
+}
+MEMORY_METRICS = {"rss_growth"}  # --memory-tolerance 적용
+
+
+def configure_env(args: argparse.Namespace, workdir: str) -> None:
+    """에이전트 모듈 import 전에 캐시/체크포인트/네트워크 관련 설정 고정"""
+    os.environ["LLM_CACHE_ENABLED"] = "1"
+    os.environ["LLM_CACHE_PATH"] = os.path.join(workdir, "llm_cache.sqlite")  # 매 실행 빈 캐시에서 시작
+    os.environ["CHECKPOINT_ENABLED"] = "0"
+    # 가짜 API에서는 quota 대기가 측정 대상이 아니므로 기본값만 크게 (직접 지정하면 그대로 사용)
+    os.environ.setdefault("LLM_RPM", "100000")
+    os.environ.setdefault("LLM_TPM", "1000000000")
+    os.environ["SEARCH_CACHE_PATH"] = os.path.join(workdir, "search_cache.sqlite")
+    os.environ["SEARCH_CACHE_TTL"] = "0"
+    os.environ["HF_HUB_OFFLINE"] = "1"
+    os.environ["TRANSFORMERS_OFFLINE"] = "1"
+    os.environ["STARTUP_CONCURRENCY"] = str(args.concurrency)
+    if args.reports:
+        os.environ["REPORT_RENDER_MODE"] = "inprocess"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        rss //= 1024
+    return rss / 1024
+
+
+def scenario_key(args: argparse.Namespace) -> str:
+    key = f"n{args.startups}-c{args.concurrency}-llm{args.llm_latency}-search{args.search_latency}"
+    return key + ("-reports" if args.reports else "")
+
+
+def make_latency_tracker():
+    """
+    tech_summary 노드 시작 ~ investment_decision 노드 종료를 스타트업 이름별로 기록하는 콜백.
+    on_chain_end에는 노드 이름이 전달되지 않으므로 on_chain_start에서 run_id별로 기록해 두고 조회한다.
+    """
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class StartupLatencyTracker(BaseCallbackHandler):
+        def __init__(self):
+            self.started: Dict[str, float] = {}
+            self.latencies: Dict[str, float] = {}
+            self._decision_runs: Dict[UUID, str] = {}  # investment_decision run_id → 스타트업 이름
+
+        @staticmethod
+        def _startup_name(payload: Any) -> Optional[str]:
+            if isinstance(payload, dict) and isinstance(payload.get("current_startup"), dict):
+                return payload["current_startup"].get("name")
+            return None
+
+        @staticmethod
+        def _node_name(serialized: Any, kwargs: Dict[str, Any]) -> Optional[str]:
+            return (
+                kwargs.get("name")
+                or (serialized or {}).get("name")
+                or (kwargs.get("metadata") or {}).get("langgraph_node")
+            )
+
+        def on_chain_start(self, serialized, inputs, *, run_id: UUID, **kwargs):
+            node = self._node_name(serialized, kwargs)
+            name = self._startup_name(inputs)
+            if not name:
+                return
+            if node == "tech_summary" and name not in self.started:
+                self.started[name] = time.perf_counter()
+            elif node == "investment_decision":
+                self._decision_runs[run_id] = name
+
+        def on_chain_end(self, outputs, *, run_id: UUID, **kwargs):
+            name = self._decision_runs.pop(run_id, None)
+            if name in self.started and name not in self.latencies:
+                self.latencies[name] = time.perf_counter() - self.started[name]
+
+        def on_chain_error(self, error, *, run_id: UUID, **kwargs):
+            self._decision_runs.pop(run_id, None)
+
+    return StartupLatencyTracker()
+
+
+async def run_graph(count: int, concurrency: int) -> Dict[str, Any]:
+    from integration import investment_graph
+
+    tracker = make_latency_tracker()
+    inputs = {
+        "query": "국내 에듀테크 스타트업",
+        "count": count,
+        "concurrency": concurrency,
+    }
+    started = time.perf_counter()
+    state = await investment_graph.ainvoke(inputs, config={"callbacks": [tracker], "recursion_limit": 1000})
+    elapsed = time.perf_counter() - started
+
+    processed = state.get("processed_startups", [])
+    latencies = list(tracker.latencies.values())
+    return {
+        "startups": len(processed),
+        "failed": [s.get("name", "Unknown") for s in processed if s.get("error")],
+        "elapsed_s": elapsed,
+        "startups_per_min": len(latencies) / elapsed * 60 if elapsed > 0 else 0.0,
+        "p50_s": statistics.median(latencies) if latencies else 0.0,
+        "p95_s": percentile(latencies, 95),
+    }
+
+
+async def run_reference(args: argparse.Namespace) -> Dict[str, Any]:
+    """기준 실행: 스타트업 1개를 순차 경로로, LLM 캐시 없이 (첫 실행은 import/모델 로딩 워밍업으로 버림)"""
+    from benchmarks import offline_fakes
+    from agents.resources import reset_resources
+
+    cache_enabled = os.environ.get("LLM_CACHE_ENABLED")
+    os.environ["LLM_CACHE_ENABLED"] = "0"
+    try:
+        offline_fakes.install(args.llm_latency, args.search_latency, startup_count=1, invest=args.reports)
+        await run_graph(count=1, concurrency=1)
+        return await run_graph(count=1, concurrency=1)
+    finally:
+        if cache_enabled is None:
+            os.environ.pop("LLM_CACHE_ENABLED", None)
+        else:
+            os.environ["LLM_CACHE_ENABLED"] = cache_enabled
+        reset_resources()  # 캐시/스케줄러/가짜 백엔드를 본 실행용으로 새로 생성
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    from benchmarks import offline_fakes
+
+    reference = await run_reference(args)
+    warm_rss = peak_rss_mb()
+
+    offline_fakes.install(
+        llm_latency=args.llm_latency,
+        search_latency=args.search_latency,
+        startup_count=args.startups,
+        invest=args.reports,
+    )
+    result = await run_graph(count=args.startups, concurrency=args.concurrency)
+    result["failed"] = reference["failed"] + result["failed"]
+    result["peak_rss_mb"] = peak_rss_mb()
+
+    reference_s = reference["p50_s"]
+    ideal_per_min = min(args.concurrency, args.startups) * 60 / reference_s if reference_s > 0 else 0.0
+    result.update(
+        reference_s=reference_s,
+        throughput_ratio=result["startups_per_min"] / ideal_per_min if ideal_per_min > 0 else 0.0,
+        p50_ratio=result["p50_s"] / reference_s if reference_s > 0 else 0.0,
+        p95_ratio=result["p95_s"] / reference_s if reference_s > 0 else 0.0,
+        rss_growth=result["peak_rss_mb"] / warm_rss if warm_rss > 0 else 0.0,
+    )
+    return result
+
+
+def compare(
+    result: Dict[str, Any], baseline: Dict[str, float], tolerance: float, memory_tolerance: float
+) -> List[str]:
+    """baseline 대비 허용 범위 이상 악화되었거나 기준값이 없는 지표 목록 (메모리 지표는 memory_tolerance)"""
+    regressions = []
+    for metric, higher_is_better in METRICS.items():
+        expected = baseline.get(metric)
+        if expected is None:
+            regressions.append(f"{metric}: baseline 없음 (--update-baseline으로 기록)")
+            continue
+        actual = result[metric]
+        limit = memory_tolerance if metric in MEMORY_METRICS else tolerance
+        if higher_is_better:
+            worse = actual < expected * (1 - limit)
+        else:
+            worse = actual > expected * (1 + limit)
+        if worse:
+            regressions.append(f"{metric}: {actual:.3f} (baseline {expected:.3f}, 허용 ±{limit:.0%})")
+    return regressions
+
+
+def load_baselines(path: str = BASELINE_PATH) -> Dict[str, Dict[str, float]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(key: str, result: Dict[str, Any], path: str = BASELINE_PATH) -> None:
+    baselines = load_baselines(path)
+    baselines[key] = {metric: round(result[metric], 4) for metric in METRICS}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="가짜 LLM/검색으로 investment_graph 처리량 측정 (오프라인)")
+    parser.add_argument("--startups", type=int, default=10, help="합성 스타트업 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 평가 개수 (1이면 순차 경로)")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="가짜 LLM 호출당 지연(초)")
+    parser.add_argument("--search-latency", type=float, default=0.02, help="가짜 검색 호출당 지연(초)")
+    parser.add_argument("--reports", action="store_true", help="모든 스타트업을 투자 확정으로 만들어 보고서 생성까지 포함")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="허용 악화 비율 (처리량/지연시간 비율)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="허용 악화 비율 (rss_growth)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline 파일 (머신별로 따로 기록할 때)")
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과를 baseline 파일에 저장")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="pipeline_bench_") as workdir:
+        configure_env(args, workdir)
+        result = asyncio.run(run_benchmark(args))
+
+    key = scenario_key(args)
+    print(f"\n[pipeline benchmark] {key}")
+    print("-" * 60)
+    print(f"{'startups':<20} {result['startups']:>10}")
+    print(f"{'elapsed(s)':<20} {result['elapsed_s']:>10.2f}")
+    print(f"{'startups/min':<20} {result['startups_per_min']:>10.1f}")
+    print(f"{'p50 latency(s)':<20} {result['p50_s']:>10.3f}")
+    print(f"{'p95 latency(s)':<20} {result['p95_s']:>10.3f}")
+    print(f"{'peak RSS(MB)':<20} {result['peak_rss_mb']:>10.1f}")
+    print(f"{'reference(s)':<20} {result['reference_s']:>10.3f}")
+    for metric in METRICS:
+        print(f"{metric:<20} {result[metric]:>10.3f}")
+
+    if result["failed"]:
+        print(f"\n평가 실패 {len(result['failed'])}건: {', '.join(result['failed'])}")
+        return 1
+
+    if args.update_baseline:
+        save_baseline(key, result, args.baseline)
+        print(f"\nbaseline 저장: {os.path.relpath(args.baseline, ROOT)} [{key}]")
+        return 0
+
+    baseline = load_baselines(args.baseline).get(key)
+    if baseline is None:
+        print(f"\n[{key}] 저장된 baseline 없음 (--update-baseline으로 기록)")
+        return 1
+
+    regressions = compare(result, baseline, args.tolerance, args.memory_tolerance)
+    if regressions:
+        print("\n성능 회귀:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("\nbaseline 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
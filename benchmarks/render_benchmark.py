@@ -0,0 +1,118 @@
+# ai-agent/benchmarks/render_benchmark.py
+"""
+PDF 렌더링 마이크로벤치마크.
+
+같은 프로세스에서 보고서 1건당 렌더링 시간을 비교한다.
+- before: 캐시 없는 렌더링 — 매번 새 Jinja 환경(템플릿 재컴파일, 새로 뜬 렌더링 워커와 같은 조건) + 폰트 설정 생성
+- after : report_renderer.render_pdf (바이트코드 캐시, 공유 FontConfiguration)
+
+    python benchmarks/render_benchmark.py --runs 10
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+SAMPLE_PAYLOAD: Dict = {
+    "company_name": "Aurora Learn",
+    "domain": "EdTech",
+    "tech_eval": {
+        "innovation": "Reinforcement learning tutor, Real-time analytics",
+        "scalability": "평가 대기",
+        "stability": "평가 대기",
+        "summary": "Adaptive AI tutoring with curriculum-aligned content.",
+    },
+    "market_eval": {
+        "size": "$3.8B TAM (K12 APAC)",
+        "growth": "17% CAGR (2024-2028)",
+        "competition": "Moderate density; legacy LMS incumbents",
+        "summary": "High growth in hybrid learning spend across East Asia.",
+    },
+    "decision": "유치",
+    "decision_reason": "Scalable platform with differentiated AI tutoring IP.",
+    "investment_scores": {
+        "total_score": 74,
+        "percentile_rank": "Top 30%",
+        "scores": {
+            "educational_efficacy": {"subtotal": 18, "max": 25},
+            "market_traction": {"subtotal": 12, "max": 20},
+            "team": {"subtotal": 15, "max": 20},
+        },
+    },
+    "risk_assessment": {"overall_risk_score": 4.8},
+    "competitor_list": [
+        {"name": "LearnNova", "category": "B2G", "competitive_overlap": "Medium", "funding_stage": "Series B"},
+        {"name": "TutorPulse", "category": "B2C", "competitive_overlap": "Low", "funding_stage": "Series A"},
+    ],
+    "llm_summary": {
+        "executive_summary": "Aurora Learn builds adaptive AI tutors for K12 classrooms.",
+        "technology": {"paragraph": "RL-based tutoring engine.", "bullets": ["Adaptive paths", "Teacher dashboard"]},
+        "market_competition": {"paragraph": "Fragmented APAC market.", "bullets": ["LearnNova", "TutorPulse"]},
+        "risk": {"paragraph": "Overall risk score: 4.8", "bullets": []},
+        "investment": {"paragraph": "Invest at seed extension.", "bullets": ["Privacy audit"]},
+        "headline_points": [],
+    },
+    "headline_metrics": {"decision": "유치", "score": 74, "confidence": "중간", "overall_risk": 4.8},
+}
+
+
+def render_before(template_name: str, data: Dict) -> bytes:
+    """매번 새 Environment — 바이트코드 캐시 없는 콜드 워커처럼 템플릿을 매번 컴파일"""
+    from jinja2 import Environment, FileSystemLoader
+    from weasyprint import HTML
+
+    env = Environment(loader=FileSystemLoader("templates"))
+    html_out = env.get_template(template_name).render(data=data)
+    pdf_bytes = io.BytesIO()
+    HTML(string=html_out).write_pdf(pdf_bytes)
+    return pdf_bytes.getvalue()
+
+
+def render_after(template_name: str, data: Dict) -> bytes:
+    from report_renderer import render_pdf
+    return render_pdf(template_name, data)
+
+
+def measure(render: Callable[[str, Dict], bytes], template_name: str, data: Dict, runs: int) -> List[float]:
+    render(template_name, data)  # warm-up (import, 첫 컴파일)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        render(template_name, data)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="보고서 PDF 렌더링 시간 비교")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--template", default=os.getenv("REPORT_TEMPLATE", "report_template.html"))
+    args = parser.parse_args()
+
+    from report_renderer import ReportInput
+    data = ReportInput(**SAMPLE_PAYLOAD).model_dump()
+
+    results = {
+        "before": measure(render_before, args.template, data, args.runs),
+        "after": measure(render_after, args.template, data, args.runs),
+    }
+    print(f"{'mode':<8} {'mean(ms)':>10} {'p50(ms)':>10} {'min(ms)':>10}")
+    for mode, timings in results.items():
+        print(
+            f"{mode:<8} {statistics.mean(timings) * 1000:>10.1f} "
+            f"{statistics.median(timings) * 1000:>10.1f} {min(timings) * 1000:>10.1f}"
+        )
+    speedup = statistics.median(results["before"]) / statistics.median(results["after"])
+    print(f"\np50 speedup: x{speedup:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
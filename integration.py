@@ -1,14 +1,36 @@
 from langgraph.graph import StateGraph, END
-from typing import Dict
+from langchain_core.runnables import RunnableConfig
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+import argparse
 import asyncio
+import contextvars
+import copy
+import importlib
+import os
+import time
+import uuid
 
-# === [1] 에이전트 import ===
-from agents.search_agent import startup_search_node
-from agents.tech_summary_agent import tech_summary_node
-from agents.market_analysis_agent import market_analysis_node
-from agents.competitor_analysis_agent import competitor_analysis_node
-from agents.investment_decision_agent import investment_decision_node
-from agents.report_agent import report_node
+from agents.metrics import REGISTRY, timed_node, write_run_summary
+from agents.resources import aclose_resources
+
+
+# === [1] 에이전트 import (첫 실행 시점에 지연 로드) ===
+def lazy_node(module: str, name: str) -> Callable:
+    """노드가 처음 실행될 때 에이전트 모듈을 import 하는 래퍼"""
+    async def node(state: Dict) -> Dict:
+        func = getattr(importlib.import_module(module), name)
+        return await func(state)
+
+    node.__name__ = name
+    return node
+
+
+startup_search_node = lazy_node("agents.search_agent", "startup_search_node")
+tech_summary_node = lazy_node("agents.tech_summary_agent", "tech_summary_node")
+market_analysis_node = lazy_node("agents.market_analysis_agent", "market_analysis_node")
+competitor_analysis_node = lazy_node("agents.competitor_analysis_agent", "competitor_analysis_node")
+investment_decision_node = lazy_node("agents.investment_decision_agent", "investment_decision_node")
+report_node = lazy_node("agents.report_agent", "report_node")
 
 
 # === [2] 스타트업별 순차 처리 노드 ===
@@ -33,9 +55,29 @@ async def process_next_startup_node(state: Dict) -> Dict:
     return state
 
 
+def record_current_startup(node: Callable) -> Callable:
+    """
+    순차 경로의 마지막 평가 노드 래퍼: 평가가 끝난 current_startup을 processed_startups 마지막 항목에 반영.
+    체크포인트에서 재개하면 두 값이 별개의 dict로 복원되므로 같은 객체라고 가정하지 않는다.
+    """
+    async def wrapper(state: Dict) -> Dict:
+        state = await node(state)
+        processed = list(state.get("processed_startups", []))
+        current = state.get("current_startup")
+        if processed and isinstance(current, dict):
+            processed[-1] = current
+            state["processed_startups"] = processed
+        return state
+
+    wrapper.__name__ = node.__name__
+    return wrapper
+
+
 # === [3] 투자 판단 분기 ===
 def route_decision(state: Dict) -> str:
     """투자 판단 결과에 따라 다음 흐름 제어"""
+    from agents.investment_decision_agent import is_invested  # lazy_node와 같이 import 지연
+
     current = state.get("current_startup")
     if not current:
         return "continue"
@@ -45,8 +87,7 @@ def route_decision(state: Dict) -> str:
     if isinstance(inv_decision, dict):
         decision = inv_decision.get("decision", "")
 
-    decision_lower = str(decision).lower()
-    if "유치" in decision_lower or "확정" in decision_lower:
+    if is_invested(current):
         print(f"투자 확정 감지 → {decision}")
         return "invested"
 
@@ -60,21 +101,150 @@ def check_done(state: Dict) -> str:
     return "done" if state.get("done") else "continue"
 
 
-# === [5] 그래프 구성 ===
+# === [5] 병렬(fan-out) 처리 노드 ===
+# 스타트업 1개의 평가 흐름: tech_summary → market_eval → competitor_analysis → investment_decision
+startup_graph_builder = StateGraph(dict)
+startup_graph_builder.add_node("tech_summary", timed_node("startup", "tech_summary", tech_summary_node))
+startup_graph_builder.add_node("market_eval", timed_node("startup", "market_eval", market_analysis_node))
+startup_graph_builder.add_node("competitor_analysis", timed_node("startup", "competitor_analysis", competitor_analysis_node))
+startup_graph_builder.add_node("investment_decision", timed_node("startup", "investment_decision", investment_decision_node))
+startup_graph_builder.set_entry_point("tech_summary")
+startup_graph_builder.add_edge("tech_summary", "market_eval")
+startup_graph_builder.add_edge("market_eval", "competitor_analysis")
+startup_graph_builder.add_edge("competitor_analysis", "investment_decision")
+startup_graph_builder.add_edge("investment_decision", END)
+startup_graph = startup_graph_builder.compile()
+
+
+STARTUP_CONCURRENCY_MAX = int(os.getenv("STARTUP_CONCURRENCY_MAX", "8"))  # 요청 값과 무관한 상한
+
+
+def resolve_concurrency(state: Dict) -> int:
+    """동시 평가 개수 (state["concurrency"] > STARTUP_CONCURRENCY 환경변수 > 1), 1 ~ STARTUP_CONCURRENCY_MAX"""
+    value = state.get("concurrency") or os.getenv("STARTUP_CONCURRENCY", "1")
+    try:
+        return min(STARTUP_CONCURRENCY_MAX, max(1, int(value)))
+    except (TypeError, ValueError):
+        return 1
+
+
+# 체크포인트 실행 중에는 같은 저장소를 쓰는 스타트업 그래프 (run_pipeline에서 설정)
+_checkpointed_startup_graph: contextvars.ContextVar = contextvars.ContextVar(
+    "checkpointed_startup_graph", default=None
+)
+
+
+async def invoke_or_resume(app, inputs: Optional[Dict], config: Dict) -> Dict:
+    """
+    thread_id의 체크포인트 상태에 따라
+    - 완료된 실행: 저장된 최종 상태 반환 (재실행 없음)
+    - 중단된 실행: 마지막 체크포인트 다음 노드부터 재개
+    - 체크포인트 없음: inputs로 새로 실행
+    """
+    snapshot = await app.aget_state(config)
+    if snapshot.values and not snapshot.next:
+        return snapshot.values
+    if snapshot.next:
+        return await app.ainvoke(None, config=config)
+    return await app.ainvoke(inputs, config=config)
+
+
+async def evaluate_startups_node(state: Dict, config: RunnableConfig) -> Dict:
+    """남은 startups를 최대 concurrency개씩 동시에 평가하고 결과를 병합"""
+    startups = list(state.get("startups", []))
+    processed = list(state.get("processed_startups", []))
+    concurrency = resolve_concurrency(state)
+    semaphore = asyncio.Semaphore(concurrency)
+    checkpointed = _checkpointed_startup_graph.get()
+    run_id = config.get("configurable", {}).get("thread_id")
+    print(f"\n[병렬 평가] {len(startups)}개 스타트업, 동시 실행 {concurrency}개")
+
+    async def evaluate(index: int, startup: Dict) -> Dict:
+        async with semaphore:
+            # 스타트업마다 독립된 상태로 실행 (공유 dict 변경 방지)
+            local_state = {
+                "query": state.get("query"),
+                "current_startup": copy.deepcopy(startup),
+            }
+            print(f"\n[진행중] {startup.get('name', 'Unknown')} 처리 시작")
+            try:
+                if checkpointed is not None and run_id:
+                    # 스타트업별 thread → 재개 시 완료된 스타트업/노드는 건너뜀
+                    thread_id = f"{run_id}:{index}:{startup.get('name', 'Unknown')}"
+                    result = await invoke_or_resume(
+                        checkpointed, local_state, {"configurable": {"thread_id": thread_id}}
+                    )
+                else:
+                    result = await startup_graph.ainvoke(local_state)
+                return result.get("current_startup", local_state["current_startup"])
+            except Exception as e:
+                print(f"[{startup.get('name', 'Unknown')}] 평가 실패: {e}")
+                failed = copy.deepcopy(startup)
+                failed["error"] = str(e)
+                return failed
+
+    # gather는 입력 순서를 유지하므로 processed_startups 순서가 결정적임
+    results: List[Dict] = await asyncio.gather(*(evaluate(i, s) for i, s in enumerate(startups)))
+    processed.extend(results)
+
+    state["startups"] = []
+    state["processed_startups"] = processed
+    state["current_startup"] = results[-1] if results else state.get("current_startup")
+    state["done"] = True
+    print("\n모든 스타트업 처리 완료")
+    return state
+
+
+def route_after_search(state: Dict) -> str:
+    """concurrency > 1 이면 병렬 평가, 아니면 기존 순차 처리"""
+    return "fan_out" if resolve_concurrency(state) > 1 else "sequential"
+
+
+def route_after_batch(state: Dict) -> str:
+    """병렬 평가 후 투자 확정 건이 있으면 보고서 생성"""
+    from agents.investment_decision_agent import is_invested  # lazy_node와 같이 import 지연
+
+    if any(is_invested(s) for s in state.get("processed_startups", [])):
+        return "invested"
+    return "done"
+
+
+# === [6] 그래프 구성 ===
 graph = StateGraph(dict)
 
-graph.add_node("startup_search", startup_search_node)
-graph.add_node("next_startup", process_next_startup_node)
-graph.add_node("tech_summary", tech_summary_node)
-graph.add_node("market_eval", market_analysis_node)
-graph.add_node("competitor_analysis", competitor_analysis_node)
-graph.add_node("investment_decision", investment_decision_node)
-graph.add_node("report", report_node)
+graph.add_node("startup_search", timed_node("investment", "startup_search", startup_search_node))
+graph.add_node("next_startup", timed_node("investment", "next_startup", process_next_startup_node))
+graph.add_node("tech_summary", timed_node("investment", "tech_summary", tech_summary_node))
+graph.add_node("market_eval", timed_node("investment", "market_eval", market_analysis_node))
+graph.add_node("competitor_analysis", timed_node("investment", "competitor_analysis", competitor_analysis_node))
+graph.add_node(
+    "investment_decision",
+    timed_node("investment", "investment_decision", record_current_startup(investment_decision_node)),
+)
+graph.add_node("report", timed_node("investment", "report", report_node))
+graph.add_node("evaluate_batch", timed_node("investment", "evaluate_batch", evaluate_startups_node))
 
 graph.set_entry_point("startup_search")
 
-# 검색 후 순차 처리 시작
-graph.add_edge("startup_search", "next_startup")
+# 검색 후 순차 처리 또는 병렬 평가 시작
+graph.add_conditional_edges(
+    "startup_search",
+    route_after_search,
+    {
+        "sequential": "next_startup",
+        "fan_out": "evaluate_batch",
+    }
+)
+
+# 병렬 평가 → 보고서 or 종료
+graph.add_conditional_edges(
+    "evaluate_batch",
+    route_after_batch,
+    {
+        "invested": "report",
+        "done": END,
+    }
+)
 
 # next_startup → 처리 or 종료
 graph.add_conditional_edges(
@@ -113,15 +283,95 @@ graph.add_conditional_edges(
 
 investment_graph = graph.compile()
 
-# === [6] 실행 ===
+# === [7] 실행 ===
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", os.path.join(".cache", "checkpoints.sqlite"))
+
+
+def checkpoint_enabled() -> bool:
+    return os.getenv("CHECKPOINT_ENABLED", "1").lower() not in ("0", "false", "no")
+
+
+async def run_pipeline(inputs: Dict, config: Dict, run_id: Optional[str] = None, resume: bool = False) -> Dict:
+    """
+    그래프 실행 후 공유 HTTP 커넥션 풀(LLM, 검색, report_server 호출) 정리.
+    체크포인트(SQLite, CHECKPOINT_PATH)가 켜져 있으면 run_id를 thread_id로 노드마다 상태를 저장하고,
+    resume=True면 해당 run의 마지막 체크포인트부터 이어서 실행한다.
+    """
+    run_id = run_id or uuid.uuid4().hex[:12]
+    started_at, baseline = time.time(), REGISTRY.snapshot()
+    try:
+        if not checkpoint_enabled():
+            return await investment_graph.ainvoke(inputs, config=config)
+
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        os.makedirs(os.path.dirname(CHECKPOINT_PATH) or ".", exist_ok=True)
+        async with AsyncSqliteSaver.from_conn_string(CHECKPOINT_PATH) as saver:
+            app = graph.compile(checkpointer=saver)
+            token = _checkpointed_startup_graph.set(startup_graph_builder.compile(checkpointer=saver))
+            try:
+                run_config = {**config, "configurable": {**config.get("configurable", {}), "thread_id": run_id}}
+                if resume:
+                    snapshot = await app.aget_state(run_config)
+                    if not snapshot.values:
+                        raise ValueError(f"재개할 실행이 없습니다: {run_id}")
+                    print(f"[재개] run {run_id} — 다음 노드: {list(snapshot.next) or '완료됨'}")
+                return await invoke_or_resume(app, inputs, run_config)
+            finally:
+                _checkpointed_startup_graph.reset(token)
+    finally:
+        await aclose_resources()
+        print(f"실행 요약: {write_run_summary(run_id, started_at, baseline)}")
+
+
+async def stream_pipeline(inputs: Dict, config: Dict) -> AsyncIterator[Dict[str, Any]]:
+    """
+    그래프 실행 진행 이벤트(노드 시작/종료, 보고서 토큰, 스타트업 완료)를 순서대로 전달.
+    report_server에서 요청마다 호출되므로 공유 커넥션 풀은 닫지 않는다 (서버 lifespan에서 정리).
+    """
+    from agents.progress import stream_progress
+    # 외부 요청 값이므로 상한과 요청 기업 수 이내로 제한
+    concurrency = min(resolve_concurrency(inputs), max(1, int(inputs.get("count") or 1)))
+    inputs = {**inputs, "concurrency": concurrency}
+    run_id = uuid.uuid4().hex[:12]
+    started_at, baseline = time.time(), REGISTRY.snapshot()
+    try:
+        async for event in stream_progress(investment_graph, inputs, config):
+            yield event
+    finally:
+        write_run_summary(run_id, started_at, baseline)
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="에듀테크 스타트업 투자 평가 파이프라인")
+    parser.add_argument("--resume", metavar="RUN_ID", help="중단된 실행을 마지막 체크포인트부터 재개")
+    parser.add_argument("--run-id", help="새 실행의 ID (기본: 자동 생성)")
+    args = parser.parse_args()
+
+    run_id = args.resume or args.run_id or uuid.uuid4().hex[:12]
+    if checkpoint_enabled() and not args.resume:
+        print(f"run id: {run_id} (중단 시 --resume {run_id} 로 재개)")
+
     result = asyncio.run(
-        investment_graph.ainvoke(
-            {"query": "국내 에듀테크 스타트업", "count": 1},
-            config={"recursion_limit": 100}
+        run_pipeline(
+            {
+                "query": "국내 에듀테크 스타트업",
+                "count": 1,
+                "concurrency": resolve_concurrency({}),
+            },
+            config={"recursion_limit": 100},
+            run_id=run_id,
+            resume=bool(args.resume),
         )
     )
 
+    from agents.resources import get_llm_cache
+    from agents.search_cache import get_search_cache
+    llm_cache = get_llm_cache()
+    if llm_cache is not None:
+        print(f"\nLLM 캐시: {llm_cache.stats()}")
+    print(f"검색 캐시: {get_search_cache().stats()}")
+
     print("\n\n=== 보고서 생성 결과 ===\n")
     reports = result.get("reports", [])
     for r in reports:
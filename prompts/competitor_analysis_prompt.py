@@ -81,3 +81,23 @@ COMPETITOR_POSITIONING_PROMPT = """
   "recommendations": ["권장사항1", "권장사항2"]
 }}
 """
+
+
+# 단일 호출(fused) 모드: 경쟁사 탐색 → 경쟁 구도 분석 → 포지셔닝 평가를 한 번에 산출 (structured output)
+COMPETITOR_FUSED_PROMPT = """
+너는 에듀테크 시장 분석 전문가이자 VC 투자심사역이야.
+다음 스타트업 정보와 검색 결과를 기반으로 아래 세 단계를 순서대로 수행하고 결과를 한 번에 출력해.
+
+1. 주요 경쟁사 식별 (회사별 설명, 카테고리 B2B/B2C/B2B2C, 설립연도, 추정 매출, 주요 제품,
+   타겟 시장, 투자 단계 Seed/Series A/B/C/IPO/Unknown, 경쟁 중첩도 높음/중간/낮음 — 모르면 Unknown)
+2. 1번 경쟁사들과 비교한 경쟁 구도 분석
+   (competition_intensity 1-10, Blue Ocean/Red Ocean/Niche Market, 차별화 요소, 경쟁 우위, 진입 장벽, 주요 위협, market_share_potential 1-10)
+3. 1, 2번을 근거로 경쟁 포지셔닝 평가 (각 점수 0-10, 지속 가능성 근거, 권장사항)
+
+스타트업 이름: {startup_name}
+스타트업 정보:
+{startup_info}
+
+검색 결과:
+{search_results}
+"""
@@ -80,3 +80,30 @@ JSON 형식으로 출력:
   "exit_strategy": "엑싯 전략"
 }}
 """
+
+
+# 단일 호출(fused) 모드: 점수 → 리스크 → 최종 결정을 한 번에 산출 (structured output)
+INVESTMENT_FUSED_PROMPT = """
+너는 에듀테크 전문 VC 투자심사역이자 투자위원회 의장이야.
+아래 정보를 종합해 다음 세 단계를 순서대로 수행하고 결과를 한 번에 출력해.
+
+1. 항목별 점수와 총점(0-100) 계산
+   - educational_efficacy 0-25, market_traction 0-20, team 0-20, technology 0-15,
+     business_model 0-10, competition 0-5, compliance 0-5 (각 항목의 max는 배점)
+2. 1번 점수와 경쟁사 분석을 참고해 리스크 평가
+   - market/technology/execution/financial/competition/regulatory 리스크: level 1-10, likelihood·impact 낮음/중간/높음
+   - overall_risk_score 1-10
+3. 총점과 리스크를 근거로 최종 투자 결정 (유치/보류 등)
+
+스타트업 이름: {startup_name}
+스타트업 정보:
+{startup_info}
+기술 요약:
+{tech_summary}
+시장성 분석:
+{market_analysis}
+경쟁사 분석:
+{competitor_analysis}
+경쟁 포지셔닝:
+{competitive_positioning}
+"""
@@ -0,0 +1,263 @@
+# ai-agent/report_renderer.py
+"""
+보고서 PDF 렌더러 (report_server와 report_agent가 공유).
+
+- REPORT_RENDER_MODE=http      : report_agent → report_server(/generate-report) → 이 모듈
+- REPORT_RENDER_MODE=inprocess : report_agent가 이 모듈을 직접 호출 (서버/JSON 왕복 없음)
+
+두 경우 모두 같은 스키마 검증, 템플릿 환경, 렌더링 프로세스 풀, PDF 캐시를 사용한다.
+"""
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from pydantic import BaseModel
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+
+
+# ----------- Data Schema (LangGraph 결과 매핑) -----------
+class TechEval(BaseModel):
+    innovation: str
+    scalability: str
+    stability: str
+    summary: str
+
+class MarketEval(BaseModel):
+    size: str
+    growth: str
+    competition: str
+    summary: str
+
+class ReportInput(BaseModel):
+    company_name: str
+    domain: str
+    tech_eval: TechEval
+    market_eval: MarketEval
+    decision: str
+    decision_reason: str
+    market_eval_detail: Dict[str, Any] = {}
+    competitor_list: List[Dict[str, Any]] = []
+    competitor_analysis: Dict[str, Any] = {}
+    competitive_positioning: Dict[str, Any] = {}
+    investment_scores: Dict[str, Any] = {}
+    risk_assessment: Dict[str, Any] = {}
+    investment_decision: Dict[str, Any] = {}
+    llm_summary: Dict[str, Any] = {}
+    headline_metrics: Dict[str, Any] = {}
+
+
+def report_template_name() -> str:
+    return os.getenv("REPORT_TEMPLATE", "report_template.html")
+
+
+# -----------------------------------
+# PDF 렌더링 프로세스 풀
+# -----------------------------------
+class RenderQueueFull(Exception):
+    """대기열이 가득 차서 새 렌더링 요청을 받을 수 없음"""
+
+
+class RenderPool:
+    """
+    WeasyPrint 렌더링은 CPU를 많이 쓰고 GIL을 잡고 있으므로 별도 프로세스에서 실행.
+    실행 중 + 대기 중 작업 수가 workers + queue_size를 넘으면 RenderQueueFull.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def submit(self, fn: Callable, *args: Any) -> Any:
+        if self.pending >= self.capacity:
+            raise RenderQueueFull(f"render queue full ({self.pending}/{self.capacity})")
+        self.start()
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.pending -= 1
+
+
+# ----------- Jinja2 Environment -----------
+TEMPLATE_DIR = "templates"
+JINJA_CACHE_DIR = os.getenv("JINJA_BYTECODE_CACHE_DIR", os.path.join(".cache", "jinja"))
+
+_env: Optional[Environment] = None
+
+
+def get_template_env() -> Environment:
+    """
+    템플릿 환경 (프로세스당 1개, 첫 렌더링 시 생성).
+    컴파일된 템플릿은 프로세스 내 캐시 + 디스크 바이트코드 캐시(새 워커 프로세스도 재컴파일 없이 시작)
+    auto_reload: 템플릿 파일이 바뀌면 다시 컴파일
+    """
+    global _env
+    if _env is None:
+        os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+        _env = Environment(
+            loader=FileSystemLoader(TEMPLATE_DIR),
+            bytecode_cache=FileSystemBytecodeCache(JINJA_CACHE_DIR),
+            auto_reload=True,
+        )
+    return _env
+
+
+class RenderAssets:
+    """
+    렌더링 사이에 공유하는 WeasyPrint 폰트 설정 (렌더링 워커 프로세스마다 1개).
+    파싱한 스타일시트는 캐시하지 않는다: write_pdf(stylesheets=...)로 넘긴 CSS는 user origin으로
+    적용되어 문서 안 <style>(author origin)과 우선순위가 달라지므로, <style>은 문서 안에 그대로 둔다.
+    """
+
+    def __init__(self):
+        self._font_config = None
+
+    @property
+    def font_config(self):
+        if self._font_config is None:
+            from weasyprint.text.fonts import FontConfiguration
+            self._font_config = FontConfiguration()
+        return self._font_config
+
+
+render_assets = RenderAssets()
+
+
+def render_pdf(template_name: str, data: Dict[str, Any]) -> bytes:
+    """템플릿 렌더링 + PDF 생성 (렌더링 워커 프로세스에서 실행)"""
+    template = get_template_env().get_template(template_name)
+    html_out = template.render(data=data)
+
+    # WeasyPrint는 import 비용이 커서 첫 렌더링 시점에 로드
+    from weasyprint import HTML
+
+    # PDF 메모리에 생성
+    pdf_bytes = io.BytesIO()
+    HTML(string=html_out).write_pdf(pdf_bytes, font_config=render_assets.font_config)
+    return pdf_bytes.getvalue()
+
+
+# ----------- 렌더링 결과 캐시 -----------
+class PdfCache:
+    """
+    (템플릿 버전 + 정규화된 payload) 해시 → PDF 디스크 캐시.
+    총 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 파일부터 삭제.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._total_bytes = sum(
+            entry.stat().st_size for entry in os.scandir(directory) if entry.name.endswith(".pdf")
+        )
+        self._template_versions: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+    def template_version(self, template_name: str) -> str:
+        path = os.path.join(TEMPLATE_DIR, template_name)
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._template_versions.get(template_name)
+        if cached and cached[0] == version:
+            return cached[1]
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self._template_versions[template_name] = (version, digest)
+        return digest
+
+    def make_key(self, template_name: str, data: Dict[str, Any]) -> str:
+        normalized = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+        digest = hashlib.sha256()
+        digest.update(template_name.encode("utf-8"))
+        digest.update(self.template_version(template_name).encode("utf-8"))
+        digest.update(normalized.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # LRU 기준 갱신
+        return content
+
+    def put(self, key: str, content: bytes) -> None:
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        self._total_bytes += len(content)
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.name.endswith(".pdf")),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._total_bytes = total
+
+
+pdf_cache = PdfCache(
+    os.getenv("REPORT_CACHE_DIR", os.path.join(".cache", "reports")),
+    int(os.getenv("REPORT_CACHE_MAX_BYTES", str(512 * 1024 * 1024))),
+)
+
+
+async def render_cached(pool: RenderPool, template_name: str, data: Dict[str, Any], key: str) -> bytes:
+    content = pdf_cache.get(key)
+    if content is None:
+        content = await pool.submit(render_pdf, template_name, data)
+        pdf_cache.put(key, content)
+    return content
+
+
+async def render_report(pool: RenderPool, payload: Dict[str, Any], template_name: Optional[str] = None) -> Tuple[bytes, str]:
+    """
+    payload 검증(ReportInput) → 캐시 조회 → 렌더링 풀에서 PDF 생성.
+    반환: (PDF 바이트, 캐시 키)
+    """
+    template_name = template_name or report_template_name()
+    data = ReportInput(**payload).model_dump()
+    key = pdf_cache.make_key(template_name, data)
+    return await render_cached(pool, template_name, data, key), key
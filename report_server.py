@@ -1,54 +1,55 @@
-from fastapi import FastAPI, Response
-from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML
-from pydantic import BaseModel
+from fastapi import FastAPI, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from urllib.parse import quote
-from typing import Any, Dict, List, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from contextlib import asynccontextmanager
+import asyncio
 import os
 import unicodedata
 import io
 import re
+import time
+import zipfile
+
+# 스키마/템플릿/렌더링 풀/PDF 캐시는 report_agent의 inprocess 모드와 공유
+from report_renderer import (
+    ReportInput,
+    RenderPool,
+    RenderQueueFull,
+    pdf_cache,
+    render_cached,
+    report_template_name,
+)
+
+
+# -----------------------------------
+# PDF 렌더링 프로세스 풀
+# -----------------------------------
+RENDER_WORKERS = int(os.getenv("REPORT_RENDER_WORKERS", str(os.cpu_count() or 2)))
+RENDER_QUEUE_SIZE = int(os.getenv("REPORT_RENDER_QUEUE_SIZE", str(RENDER_WORKERS * 2)))
+RENDER_RETRY_AFTER = os.getenv("REPORT_RENDER_RETRY_AFTER", "5")
+REPORT_BATCH_MAX = int(os.getenv("REPORT_BATCH_MAX", "50"))
+STARTUP_CONCURRENCY_MAX = int(os.getenv("STARTUP_CONCURRENCY_MAX", "8"))  # /evaluate/stream 동시 평가 상한
+render_pool = RenderPool(RENDER_WORKERS, RENDER_QUEUE_SIZE)
+
 
 # -----------------------------------
 # FastAPI App
 # -----------------------------------
-app = FastAPI()
-
-# ----------- Data Schema (LangGraph 결과 매핑) -----------
-class TechEval(BaseModel):
-    innovation: str
-    scalability: str
-    stability: str
-    summary: str
-
-class MarketEval(BaseModel):
-    size: str
-    growth: str
-    competition: str
-    summary: str
-
-class ReportInput(BaseModel):
-    company_name: str
-    domain: str
-    tech_eval: TechEval
-    market_eval: MarketEval
-    decision: str
-    decision_reason: str
-    market_eval_detail: Dict[str, Any] = {}
-    competitor_list: List[Dict[str, Any]] = []
-    competitor_analysis: Dict[str, Any] = {}
-    competitive_positioning: Dict[str, Any] = {}
-    investment_scores: Dict[str, Any] = {}
-    risk_assessment: Dict[str, Any] = {}
-    investment_decision: Dict[str, Any] = {}
-    llm_summary: Dict[str, Any] = {}
-    headline_metrics: Dict[str, Any] = {}
-
-
-# ----------- Jinja2 Environment -----------
-env = Environment(loader=FileSystemLoader("templates"))
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    render_pool.start()
+    try:
+        yield
+    finally:
+        render_pool.shutdown()
+        # /evaluate/stream 실행이 공유하던 LLM/HTTP 커넥션 풀 정리
+        from agents.resources import aclose_resources
+        await aclose_resources()
 
 
+app = FastAPI(lifespan=lifespan)
+
 def build_filenames(company_name: str) -> Tuple[str, str]:
     base_filename = f"{company_name}_report.pdf"
     encoded = quote(base_filename)
@@ -57,31 +58,185 @@ def build_filenames(company_name: str) -> Tuple[str, str]:
 
 
 
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+async def render_timed(template_name: str, payload: Dict[str, Any], key: str) -> bytes:
+    """render_cached + 렌더링 시간 기록 (/metrics, 캐시 적중 포함)"""
+    from agents.metrics import REGISTRY
+
+    started = time.perf_counter()
+    content = await render_cached(render_pool, template_name, payload, key)
+    REGISTRY.observe("report_render_duration_seconds", time.perf_counter() - started, mode="server")
+    return content
+
+
 # ----------- Endpoint -----------
 @app.post("/generate-report")
-def generate_report(data: ReportInput):
+async def generate_report(data: ReportInput, if_none_match: Optional[str] = Header(default=None)):
     """
     LangGraph 결과(JSON) → PDF 보고서 자동 생성
     """
-    template_name = os.getenv("REPORT_TEMPLATE", "report_template.html")
-    template = env.get_template(template_name)
-    html_out = template.render(data=data.dict())
+    template_name = report_template_name()
+    payload = data.model_dump()
+    key = pdf_cache.make_key(template_name, payload)
+    etag = f'"{key}"'
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
 
-    # PDF 메모리에 생성
-    pdf_bytes = io.BytesIO()
-    HTML(string=html_out).write_pdf(pdf_bytes)
-    pdf_bytes.seek(0)
+    try:
+        pdf_content = await render_timed(template_name, payload, key)
+    except RenderQueueFull as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Report renderer busy: {e}",
+            headers={"Retry-After": RENDER_RETRY_AFTER},
+        )
 
     ascii_filename, encoded_filename = build_filenames(data.company_name)
     headers = {
         "Content-Disposition": (
             f"attachment; filename=\"{ascii_filename}\"; "
             f"filename*=UTF-8''{encoded_filename}"
-        )
+        ),
+        "ETag": etag,
     }
 
     return Response(
-        content=pdf_bytes.read(),
+        content=pdf_content,
         media_type="application/pdf",
         headers=headers
     )
+
+
+# ----------- Batch Endpoint -----------
+class _ZipStreamBuffer(io.RawIOBase):
+    """쓰기 전용 버퍼 — ZipFile이 쓴 바이트를 응답 청크로 꺼내기 위해 사용 (seek 불가)"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _zip_entry_name(index: int, company_name: str) -> str:
+    safe_name = re.sub(r"[\\/:*?\"<>|]", "_", company_name).strip() or "report"
+    return f"{index + 1:02d}_{safe_name}_report.pdf"
+
+
+async def _render_for_batch(template_name: str, data: ReportInput) -> bytes:
+    # 배치는 이미 수락된 요청이므로 대기열이 차 있으면 자리가 날 때까지 재시도
+    payload = data.model_dump()
+    key = pdf_cache.make_key(template_name, payload)
+    while True:
+        try:
+            return await render_timed(template_name, payload, key)
+        except RenderQueueFull:
+            await asyncio.sleep(0.2)
+
+
+async def _stream_zip(items: List[ReportInput], template_name: str) -> AsyncIterator[bytes]:
+    """완료되는 순서대로 PDF를 zip 엔트리로 내보냄 (실패 건은 errors/*.txt)"""
+    buffer = _ZipStreamBuffer()
+    archive = zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED)
+    semaphore = asyncio.Semaphore(render_pool.workers)
+
+    async def render_one(index: int, item: ReportInput) -> Tuple[int, ReportInput, Optional[bytes], Optional[str]]:
+        async with semaphore:
+            try:
+                return index, item, await _render_for_batch(template_name, item), None
+            except Exception as e:
+                return index, item, None, str(e)
+
+    tasks = [asyncio.ensure_future(render_one(i, item)) for i, item in enumerate(items)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, item, pdf_content, error = await next_done
+            name = _zip_entry_name(index, item.company_name)
+            entry = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            if error is None:
+                archive.writestr(entry, pdf_content)
+            else:
+                entry.filename = f"errors/{name[:-4]}.txt"
+                archive.writestr(entry, error)
+            yield buffer.drain()
+        archive.close()
+        yield buffer.drain()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@app.post("/generate-reports")
+async def generate_reports(items: List[ReportInput]):
+    """
+    여러 회사의 보고서를 동시에 렌더링하여 zip으로 스트리밍 (완료 순서대로 전송)
+    """
+    if not items:
+        raise HTTPException(status_code=422, detail="No reports requested")
+    if len(items) > REPORT_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"Too many reports (max {REPORT_BATCH_MAX})")
+    if render_pool.pending >= render_pool.capacity:
+        raise HTTPException(
+            status_code=503,
+            detail="Report renderer busy",
+            headers={"Retry-After": RENDER_RETRY_AFTER},
+        )
+
+    template_name = report_template_name()
+    return StreamingResponse(
+        _stream_zip(items, template_name),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=\"reports.zip\""},
+    )
+
+
+# ----------- 평가 파이프라인 진행 스트림 (SSE) -----------
+@app.get("/evaluate/stream")
+async def evaluate_stream(
+    query: str = Query("국내 에듀테크 스타트업"),
+    count: int = Query(1, ge=1, le=REPORT_BATCH_MAX),
+    concurrency: int = Query(int(os.getenv("STARTUP_CONCURRENCY", "1")), ge=1, le=STARTUP_CONCURRENCY_MAX),
+):
+    """
+    투자 평가 파이프라인을 실행하면서 진행 이벤트를 Server-Sent Events로 전송
+    (node_start / node_end / token / startup_done / done / error)
+    concurrency는 STARTUP_CONCURRENCY_MAX 이하, 실제 실행은 count 이하로 제한된다.
+    """
+    # LangGraph/에이전트 모듈은 이 엔드포인트를 처음 호출할 때 로드
+    from integration import stream_pipeline
+    from agents.progress import format_sse
+
+    inputs = {"query": query, "count": count, "concurrency": concurrency}
+
+    async def events() -> AsyncIterator[str]:
+        async for event in stream_pipeline(inputs, config={"recursion_limit": 100}):
+            yield format_sse(event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ----------- Metrics (Prometheus) -----------
+@app.get("/metrics")
+async def metrics():
+    """노드/LLM/검색/렌더링 지연시간 및 토큰·비용 히스토그램 (Prometheus text format)"""
+    from agents.metrics import render_prometheus
+    return Response(content=render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,26 @@
+# ai-agent/tests/conftest.py
+"""pytest 공용 설정 — 저장소 루트를 import 경로에 추가 (agents/, report_renderer 등), 공용 fixture"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_resources():
+    """테스트 사이에 agents.resources 캐시(가짜 LLM, 검색 캐시 등)가 이어지지 않도록 초기화"""
+    yield
+    from agents.resources import reset_resources
+    reset_resources()
+
+
+@pytest.fixture
+def restore_env():
+    """configure_env 등이 직접 바꾼 os.environ 복원"""
+    saved = dict(os.environ)
+    yield
+    os.environ.clear()
+    os.environ.update(saved)
@@ -0,0 +1,36 @@
+# ai-agent/tests/test_evaluate_stream.py
+"""/evaluate/stream — concurrency 상한 검증, stream_pipeline의 동시 평가 개수 제한"""
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import report_server
+
+
+def test_endpoint_rejects_concurrency_above_limit():
+    client = TestClient(report_server.app)
+    res = client.get("/evaluate/stream", params={"count": 3, "concurrency": report_server.STARTUP_CONCURRENCY_MAX + 1})
+    assert res.status_code == 422
+
+
+def test_stream_pipeline_clamps_concurrency(monkeypatch):
+    import integration
+    from agents import progress
+
+    seen = []
+
+    async def fake_stream_progress(graph, inputs, config):
+        seen.append(inputs["concurrency"])
+        yield {"event": "done"}
+
+    async def collect(inputs):
+        return [event async for event in integration.stream_pipeline(inputs, config={})]
+
+    monkeypatch.setattr(progress, "stream_progress", fake_stream_progress)
+    monkeypatch.setattr(integration, "write_run_summary", lambda *args: None)
+    monkeypatch.setattr(integration, "STARTUP_CONCURRENCY_MAX", 4)
+
+    asyncio.run(collect({"count": 2, "concurrency": 10}))
+    asyncio.run(collect({"count": 10, "concurrency": 10}))
+    asyncio.run(collect({"count": 10, "concurrency": 0}))
+    assert seen == [2, 4, 1]
@@ -0,0 +1,48 @@
+# ai-agent/tests/test_integration_resume.py
+"""integration.py — 순차 경로를 스타트업 평가 도중 중단 후 --resume 했을 때 processed_startups 반영"""
+import asyncio
+import os
+
+import pytest
+
+from benchmarks import offline_fakes
+
+
+def test_resume_mid_startup_updates_processed_entry(tmp_path, monkeypatch, restore_env):
+    monkeypatch.chdir(tmp_path)
+    os.environ["LLM_CACHE_ENABLED"] = "0"
+    os.environ["SEARCH_CACHE_PATH"] = str(tmp_path / "search.sqlite")
+    os.environ["CHECKPOINT_ENABLED"] = "1"
+    offline_fakes.install(llm_latency=0.0, search_latency=0.0, startup_count=2)
+
+    import integration
+    from agents import competitor_analysis_agent
+
+    monkeypatch.setattr(integration, "CHECKPOINT_PATH", str(tmp_path / "checkpoints.sqlite"))
+
+    # 첫 스타트업의 competitor_analysis에서 한 번 중단 (tech_summary, market_eval은 체크포인트에 저장됨)
+    original = competitor_analysis_agent.competitor_analysis_node
+    calls = []
+
+    async def interrupted_once(state):
+        calls.append(state["current_startup"]["name"])
+        if len(calls) == 1:
+            raise RuntimeError("interrupted")
+        return await original(state)
+
+    monkeypatch.setattr(competitor_analysis_agent, "competitor_analysis_node", interrupted_once)
+
+    inputs = {"query": "국내 에듀테크 스타트업", "count": 2, "concurrency": 1}
+    config = {"recursion_limit": 100}
+    with pytest.raises(RuntimeError, match="interrupted"):
+        asyncio.run(integration.run_pipeline(inputs, config, run_id="resume-test"))
+
+    result = asyncio.run(integration.run_pipeline(inputs, config, run_id="resume-test", resume=True))
+
+    processed = result["processed_startups"]
+    assert [s["name"] for s in processed] == ["벤치스타트업001", "벤치스타트업002"]
+    assert calls == ["벤치스타트업001", "벤치스타트업001", "벤치스타트업002"]
+    for startup in processed:
+        assert "competitor_list" in startup
+        assert "investment_decision" in startup
+    assert processed[-1] == result["current_startup"]
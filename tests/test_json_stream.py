@@ -0,0 +1,158 @@
+# ai-agent/tests/test_json_stream.py
+"""agents/json_stream.py — 증분 파서, extract_json, astream_json(조기 종료, 재시도, 캐시 조회/저장)"""
+import asyncio
+from typing import Any, List
+
+import pytest
+from langchain_core.caches import InMemoryCache
+from langchain_core.language_models import BaseChatModel
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from agents.json_stream import (
+    InvalidJSONError,
+    JSONStreamParser,
+    TruncatedJSONError,
+    astream_json,
+    extract_json,
+)
+
+
+def feed_all(parser: JSONStreamParser, chunks: List[str]):
+    for chunk in chunks:
+        value = parser.feed(chunk)
+        if value is not None:
+            return value
+    return None
+
+
+# ---------------------------
+# 증분 파서 / extract_json
+# ---------------------------
+def test_nested_braces_split_across_chunks():
+    parser = JSONStreamParser()
+    chunks = ['{"a": {"b": [1, {"c"', ': 2}]}, "d"', ': []}', " trailing"]
+    assert feed_all(parser, chunks) == '{"a": {"b": [1, {"c": 2}]}, "d": []}'
+
+
+def test_braces_and_escaped_quotes_inside_strings():
+    text = r'{"s": "not } a ] close \" still {string", "t": "\\"} tail'
+    assert extract_json(text) == {"s": 'not } a ] close " still {string', "t": "\\"}
+
+
+def test_escape_split_across_chunks():
+    parser = JSONStreamParser()
+    assert feed_all(parser, ['{"s": "a\\', '"}"}']) == '{"s": "a\\"}"}'
+
+
+def test_leading_prose_and_code_fence():
+    text = 'Sure! Here is the result:\n```json\n{"score": 7, "tags": ["a"]}\n```\nLet me know.'
+    assert extract_json(text) == {"score": 7, "tags": ["a"]}
+
+
+def test_expect_skips_other_opener():
+    text = 'Options [1, 2] considered.\n{"choice": 2}'
+    assert extract_json(text, expect="{") == {"choice": 2}
+    assert extract_json(text) == [1, 2]
+    assert extract_json('note {x} then [3]', expect="[") == [3]
+
+
+def test_only_first_value_is_returned():
+    assert extract_json('{"a": 1} {"b": 2}') == {"a": 1}
+
+
+def test_missing_and_truncated_values():
+    with pytest.raises(InvalidJSONError) as missing:
+        extract_json("no json here")
+    assert missing.value.reason == "invalid"
+    assert missing.value.text == "no json here"
+
+    with pytest.raises(TruncatedJSONError) as truncated:
+        extract_json('```json\n{"a": [1, 2')
+    assert truncated.value.reason == "truncated"
+
+
+def test_closed_but_malformed_value():
+    with pytest.raises(InvalidJSONError):
+        extract_json("{'single': 'quotes'}")
+
+
+# ---------------------------
+# astream_json
+# ---------------------------
+class ScriptedChatModel(BaseChatModel):
+    """호출마다 scripts의 다음 청크 목록을 스트리밍하고, 실제로 내보낸 청크 수를 기록"""
+
+    scripts: List[List[str]]
+    calls: int = 0
+    emitted: List[int] = []
+    prompts: List[Any] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        raise AssertionError("astream_json은 스트리밍 경로만 사용해야 함")
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        chunks = self.scripts[self.calls]
+        self.calls += 1
+        self.prompts.append(list(messages))
+        self.emitted.append(0)
+        for chunk in chunks:
+            self.emitted[-1] += 1
+            yield ChatGenerationChunk(message=AIMessageChunk(content=chunk))
+
+
+def make_model(*scripts: List[str], cache=None) -> ScriptedChatModel:
+    return ScriptedChatModel(scripts=list(scripts), emitted=[], prompts=[], cache=cache)
+
+
+def test_stream_closes_as_soon_as_value_closes():
+    model = make_model(["```json\n", '{"a": ', "1}", "\n```", " extra", " prose"])
+    assert asyncio.run(astream_json(model, "prompt", expect="{")) == {"a": 1}
+    assert model.emitted == [3]  # 닫힌 뒤의 청크는 생성하지 않음
+
+
+def test_truncated_stream_retries_with_hint():
+    model = make_model(['{"a": [1, ', "2"], ['{"a": [1, 2]}'])
+    assert asyncio.run(astream_json(model, "prompt")) == {"a": [1, 2]}
+    assert model.calls == 2
+
+    retry_prompt = model.prompts[1]
+    assert isinstance(retry_prompt[1], AIMessage) and retry_prompt[1].content == '{"a": [1, 2'
+    assert "잘렸다" in retry_prompt[2].content
+
+
+def test_raises_after_retries_exhausted():
+    model = make_model(["no json"], ["still none"])
+    with pytest.raises(InvalidJSONError) as error:
+        asyncio.run(astream_json(model, "prompt", retries=1))
+    assert error.value.text == "still none"
+    assert model.calls == 2
+
+
+def test_cache_write_then_read_skips_stream():
+    cache = InMemoryCache()
+    model = make_model(['prose {"a": ', "1}", " tail"], cache=cache)
+
+    assert asyncio.run(astream_json(model, "prompt")) == {"a": 1}
+    cached = cache.lookup(dumps([HumanMessage(content="prompt")]), model._get_llm_string())
+    assert [g.text for g in cached] == ['prose {"a": 1}']
+
+    # 같은 프롬프트 → 캐시에서 추출, 모델 호출 없음
+    assert asyncio.run(astream_json(model, "prompt")) == {"a": 1}
+    assert model.calls == 1
+
+
+def test_unusable_cache_entry_falls_back_to_stream():
+    cache = InMemoryCache()
+    model = make_model(['{"fresh": true}'], cache=cache)
+    prompt, llm_string = dumps([HumanMessage(content="prompt")]), model._get_llm_string()
+    cache.update(prompt, llm_string, [ChatGeneration(message=AIMessage(content='{"old": '))])
+
+    assert asyncio.run(astream_json(model, "prompt")) == {"fresh": True}
+    assert model.calls == 1
+    assert [g.text for g in cache.lookup(prompt, llm_string)] == ['{"fresh": true}']
@@ -0,0 +1,77 @@
+# ai-agent/tests/test_llm_cache.py
+"""agents/llm_cache.py — TTL 만료, accessed_at 기준 LRU 삭제, 적중/실패 통계, llm_string 분리"""
+import pytest
+from langchain_core.outputs import Generation
+
+from agents import llm_cache
+from agents.llm_cache import SQLiteLLMCache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(llm_cache.time, "time", fake)
+    return fake
+
+
+def texts(value):
+    return [g.text for g in value] if value is not None else None
+
+
+def test_roundtrip_and_stats(tmp_path, clock):
+    cache = SQLiteLLMCache(str(tmp_path / "c.sqlite"))
+    assert cache.lookup("p", "llm") is None
+    cache.update("p", "llm", [Generation(text="answer")])
+    assert texts(cache.lookup("p", "llm")) == ["answer"]
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+
+
+def test_llm_string_is_part_of_key(tmp_path, clock):
+    cache = SQLiteLLMCache(str(tmp_path / "c.sqlite"))
+    cache.update("same prompt", "model=a,temperature=0.1", [Generation(text="a")])
+    cache.update("same prompt", "model=a,temperature=0.7", [Generation(text="b")])
+    assert texts(cache.lookup("same prompt", "model=a,temperature=0.1")) == ["a"]
+    assert texts(cache.lookup("same prompt", "model=a,temperature=0.7")) == ["b"]
+    assert cache.lookup("same prompt", "model=b,temperature=0.1") is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_ttl_expiry(tmp_path, clock):
+    cache = SQLiteLLMCache(str(tmp_path / "c.sqlite"), ttl_seconds=60)
+    cache.update("p", "llm", [Generation(text="x")])
+
+    clock.now += 59
+    assert texts(cache.lookup("p", "llm")) == ["x"]
+
+    clock.now += 2  # 생성 후 61초 (조회해도 만료 시점은 연장되지 않음)
+    assert cache.lookup("p", "llm") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_uses_accessed_at(tmp_path, clock):
+    cache = SQLiteLLMCache(str(tmp_path / "c.sqlite"), max_entries=2)
+    cache.update("a", "llm", [Generation(text="a")])
+    clock.now += 1
+    cache.update("b", "llm", [Generation(text="b")])
+    clock.now += 1
+    assert cache.lookup("a", "llm") is not None  # a가 최근 사용 → b가 가장 오래됨
+    clock.now += 1
+    cache.update("c", "llm", [Generation(text="c")])
+
+    assert cache.lookup("b", "llm") is None
+    assert texts(cache.lookup("a", "llm")) == ["a"]
+    assert texts(cache.lookup("c", "llm")) == ["c"]
+    assert cache.stats()["entries"] == 2
+
+
+def test_create_from_env_disabled(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "0")
+    assert llm_cache.create_llm_cache_from_env() is None
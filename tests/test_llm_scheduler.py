@@ -0,0 +1,205 @@
+# ai-agent/tests/test_llm_scheduler.py
+"""agents/llm_scheduler.py — 가짜 시계로 token bucket, 429 정지/AIMD, FIFO 순서 검증"""
+from types import SimpleNamespace
+
+import pytest
+
+from agents import llm_scheduler
+from agents.llm_scheduler import POLL_INTERVAL, LLMScheduler, TokenBucket
+
+
+class FakeTime:
+    """llm_scheduler.time 대체 — sleep은 시계만 앞으로 돌림"""
+
+    def __init__(self, now: float = 100.0):
+        self.now = now
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(llm_scheduler, "time", fake)
+    monkeypatch.setattr(llm_scheduler, "random", SimpleNamespace(random=lambda: 1.0))  # jitter 제거
+    return fake
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code, code=None, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.code = code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def make_scheduler(**kwargs) -> LLMScheduler:
+    options = {"rpm": 6000, "tpm": 10_000_000, "max_concurrency": 8, "burst_seconds": 6}
+    options.update(kwargs)
+    return LLMScheduler("test-model", **options)
+
+
+# ---------------------------
+# TokenBucket
+# ---------------------------
+def test_token_bucket_refills_at_rate_and_caps_at_capacity(clock):
+    bucket = TokenBucket(per_minute=60, burst_seconds=5)  # 1/s, 최대 5
+    assert bucket.capacity == 5
+    bucket.take(5)
+    assert bucket.wait_time(2, clock.now) == pytest.approx(2.0)
+
+    clock.now += 1.5
+    assert bucket.wait_time(2, clock.now) == pytest.approx(0.5)
+
+    clock.now += 100
+    assert bucket.wait_time(1, clock.now) == 0.0
+    assert bucket.tokens == 5  # 상한 이상 쌓이지 않음
+
+
+def test_token_bucket_oversized_request_waits_for_full_bucket_then_goes_negative(clock):
+    bucket = TokenBucket(per_minute=60, burst_seconds=5)
+    bucket.take(3)
+    assert bucket.wait_time(50, clock.now) == pytest.approx(3.0)  # 가득 찰 때까지만 대기
+    clock.now += 3
+    assert bucket.wait_time(50, clock.now) == 0.0
+    bucket.take(50)
+    assert bucket.wait_time(1, clock.now) == pytest.approx(46.0)
+
+
+def test_token_bucket_settle_charges_and_refunds(clock):
+    bucket = TokenBucket(per_minute=600, burst_seconds=6)  # capacity 60
+    bucket.take(40)
+    bucket.settle(10)   # 예약보다 10 더 씀
+    assert bucket.tokens == 10
+    bucket.settle(-100)  # 환급은 capacity까지만
+    assert bucket.tokens == 60
+
+
+# ---------------------------
+# 예약 / 속도 제한
+# ---------------------------
+def test_reserve_paces_requests_to_rpm(clock):
+    scheduler = make_scheduler(rpm=60, burst_seconds=2)  # 1 req/s, 2개까지 연속 허용
+    started = clock.now
+    for _ in range(4):
+        scheduler.complete(scheduler.reserve(1))
+    assert clock.now - started == pytest.approx(2.0)
+
+
+def test_reserve_charges_estimated_tokens_and_settles_usage(clock):
+    scheduler = make_scheduler(tpm=600, burst_seconds=10)  # 10 tok/s, 버킷 100
+    reservation = scheduler.reserve(80)
+    scheduler.complete(reservation, used_tokens=30)  # 50 환급
+    assert scheduler.tokens.tokens == pytest.approx(70)
+
+    started = clock.now
+    scheduler.complete(scheduler.reserve(90))
+    assert clock.now - started == pytest.approx(2.0)
+
+
+def test_concurrency_limit_blocks_until_slot_released(clock):
+    scheduler = make_scheduler(max_concurrency=1)
+    first = scheduler.reserve(1)
+    ticket = scheduler._enqueue()
+    assert scheduler._try_acquire(ticket, 1) == POLL_INTERVAL
+    scheduler.release(first)
+    assert scheduler._try_acquire(ticket, 1) == 0.0
+    assert scheduler.in_flight == 1
+
+
+# ---------------------------
+# FIFO
+# ---------------------------
+def test_queue_is_fifo_and_head_is_not_overtaken(clock):
+    scheduler = make_scheduler(tpm=600, burst_seconds=10)  # 버킷 100
+    scheduler.tokens.take(100)
+    big, small = scheduler._enqueue(), scheduler._enqueue()
+    assert scheduler.queue_depth == 2
+
+    # 선두(큰 요청)가 토큰을 기다리는 동안 뒤의 작은 요청은 앞지르지 못함
+    assert scheduler._try_acquire(big, 90) == pytest.approx(9.0)
+    clock.now += 5
+    assert scheduler._try_acquire(small, 10) == POLL_INTERVAL
+
+    clock.now += 4
+    assert scheduler._try_acquire(big, 90) == 0.0
+    clock.now += 9
+    assert scheduler._try_acquire(small, 10) == 0.0
+    assert scheduler.queue_depth == 0
+
+
+def test_cancelled_waiter_leaves_queue(clock):
+    scheduler = make_scheduler()
+    first, second = scheduler._enqueue(), scheduler._enqueue()
+    scheduler._dequeue(first)
+    assert scheduler._try_acquire(second, 1) == 0.0
+
+
+# ---------------------------
+# 429 / AIMD
+# ---------------------------
+def test_rate_limit_halves_once_per_pause_and_blocks_queue(clock):
+    scheduler = make_scheduler(max_concurrency=8)
+    reservations = [scheduler.reserve(1) for _ in range(3)]
+
+    error = FakeAPIError(429, headers={"retry-after": "2"})
+    assert scheduler.fail(reservations[0], error, attempt=0) == 2.0
+    assert scheduler.limit == 4
+    assert scheduler.paused_until == clock.now + 2
+
+    # 같은 정지 구간의 429는 한도를 다시 줄이지 않음
+    clock.now += 1
+    assert scheduler.fail(reservations[1], FakeAPIError(429, headers={"retry-after-ms": "500"}), 0) == 0.5
+    assert scheduler.limit == 4
+    assert scheduler.paused_until == clock.now + 1  # 더 긴 쪽 유지
+
+    ticket = scheduler._enqueue()
+    assert scheduler._try_acquire(ticket, 1) == pytest.approx(1.0)
+    clock.now += 1
+    assert scheduler._try_acquire(ticket, 1) == 0.0
+
+    # 정지가 끝난 뒤의 429는 다시 절반
+    scheduler.fail(reservations[2], FakeAPIError(429), attempt=1)
+    assert scheduler.limit == 2
+    assert scheduler.paused_until == clock.now + 2.0  # retry-after 없음 → 2**1 백오프
+
+
+def test_additive_increase_after_limit_successes(clock):
+    scheduler = make_scheduler(max_concurrency=4)
+    # 두 번째 reserve는 정지가 끝날 때까지 기다리므로 429마다 절반: 4 → 2 → 1
+    scheduler.fail(scheduler.reserve(1), FakeAPIError(429, headers={"retry-after": "1"}), 0)
+    scheduler.fail(scheduler.reserve(1), FakeAPIError(429, headers={"retry-after": "1"}), 0)
+    assert scheduler.limit == 1
+    assert clock.sleeps == [1.0]
+
+    limits = []
+    for _ in range(10):
+        scheduler.complete(scheduler.reserve(1))
+        limits.append(scheduler.limit)
+    # 한도만큼 연속 성공할 때마다 +1, max_concurrency에서 멈춤
+    assert limits == [2, 2, 3, 3, 3, 4, 4, 4, 4, 4]
+
+
+def test_fail_retry_policy(clock):
+    scheduler = make_scheduler(max_retries=2)
+    assert scheduler.fail(scheduler.reserve(1), FakeAPIError(429, code="insufficient_quota"), 0) is None
+    assert scheduler.fail(scheduler.reserve(1), FakeAPIError(429), attempt=2) is None
+    assert scheduler.fail(scheduler.reserve(1), FakeAPIError(503), attempt=1) == 2.0
+    assert scheduler.fail(scheduler.reserve(1), FakeAPIError(503), attempt=2) is None
+    assert scheduler.fail(scheduler.reserve(1), FakeAPIError(400), attempt=0) is None
+    assert scheduler.in_flight == 0
+
+
+def test_complete_and_release_are_idempotent(clock):
+    scheduler = make_scheduler()
+    reservation = scheduler.reserve(1)
+    scheduler.complete(reservation)
+    scheduler.release(reservation)
+    scheduler.complete(reservation)
+    assert scheduler.in_flight == 0
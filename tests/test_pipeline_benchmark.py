@@ -0,0 +1,68 @@
+# ai-agent/tests/test_pipeline_benchmark.py
+"""benchmarks/pipeline_benchmark.py — 가짜 파이프라인에서 지연시간 수집, baseline 비교"""
+import argparse
+import asyncio
+
+import pytest
+
+from benchmarks import pipeline_benchmark as bench
+
+
+@pytest.mark.parametrize("concurrency", [1, 2])
+def test_offline_run_records_startup_latencies(tmp_path, restore_env, concurrency):
+    args = argparse.Namespace(
+        startups=3, concurrency=concurrency, llm_latency=0.0, search_latency=0.0, reports=False
+    )
+    bench.configure_env(args, str(tmp_path))
+    result = asyncio.run(bench.run_benchmark(args))
+
+    assert result["startups"] == 3
+    assert result["failed"] == []
+    assert result["startups_per_min"] > 0
+    assert 0 < result["p50_s"] <= result["p95_s"]
+    assert result["throughput_ratio"] > 0
+    assert result["rss_growth"] >= 1.0
+
+
+def test_fakes_go_through_scheduled_client_and_llm_cache(tmp_path, restore_env):
+    args = argparse.Namespace(startups=2, concurrency=1, llm_latency=0.0, search_latency=0.0, reports=False)
+    bench.configure_env(args, str(tmp_path))
+    asyncio.run(bench.run_benchmark(args))
+
+    from agents.llm_scheduler import ScheduledChatOpenAI
+    from agents.resources import get_chat_model, get_llm_cache
+
+    llm = get_chat_model(streaming=True)
+    assert isinstance(llm, ScheduledChatOpenAI)
+    assert llm.cache is get_llm_cache() is not None
+    assert (tmp_path / "llm_cache.sqlite").exists()
+
+
+def test_compare_flags_regressions_and_missing_metrics():
+    baseline = {"throughput_ratio": 1.0, "p50_ratio": 1.0, "p95_ratio": 0.5, "rss_growth": 1.0}
+    result = {"throughput_ratio": 0.8, "p50_ratio": 1.1, "p95_ratio": 1.0, "rss_growth": 1.2}
+
+    regressions = bench.compare(result, baseline, tolerance=0.15, memory_tolerance=0.25)
+    assert [line.split(":")[0] for line in regressions] == ["throughput_ratio", "p95_ratio"]
+
+    # 메모리 지표는 더 넓은 허용 범위를 쓰고, 기준값이 없으면 회귀로 본다
+    regressions = bench.compare(result, {"rss_growth": 1.0}, tolerance=0.15, memory_tolerance=0.1)
+    assert [line.split(":")[0] for line in regressions] == ["throughput_ratio", "p50_ratio", "p95_ratio", "rss_growth"]
+    assert "baseline 없음" in regressions[0]
+    assert "허용 ±10%" in regressions[-1]
+
+
+def test_committed_baselines_cover_default_scenario():
+    args = argparse.Namespace(startups=10, concurrency=4, llm_latency=0.05, search_latency=0.02, reports=False)
+    baseline = bench.load_baselines()[bench.scenario_key(args)]
+    assert set(baseline) == set(bench.METRICS)
+    assert baseline["throughput_ratio"] > 0
+
+
+def test_baseline_path_can_be_per_machine(tmp_path):
+    path = str(tmp_path / "baselines.local.json")
+    result = {"throughput_ratio": 0.8, "p50_ratio": 1.0, "p95_ratio": 1.3, "rss_growth": 1.02, "p50_s": 0.9}
+
+    bench.save_baseline("n1-c1", result, path)
+
+    assert bench.load_baselines(path) == {"n1-c1": {metric: result[metric] for metric in bench.METRICS}}
@@ -0,0 +1,90 @@
+# ai-agent/tests/test_resources.py
+"""agents/resources.py — 키별 1회 생성, 느린 생성 함수가 다른 리소스 조회를 막지 않음"""
+import asyncio
+import threading
+import time
+
+from agents import resources
+
+
+def test_factory_runs_once_per_key_under_concurrency():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(resources.get_resource("k", factory))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_slow_factory_does_not_block_other_keys():
+    release = threading.Event()
+    building = threading.Event()
+
+    def slow_factory():
+        building.set()
+        release.wait(5)
+        return "slow"
+
+    worker = threading.Thread(target=lambda: resources.get_resource("slow", slow_factory))
+    worker.start()
+    try:
+        assert building.wait(5)
+        started = time.perf_counter()
+        assert resources.get_resource("fast", lambda: "fast") == "fast"
+        assert time.perf_counter() - started < 1.0
+    finally:
+        release.set()
+        worker.join()
+    assert resources.get_resource("slow", slow_factory) == "slow"
+
+
+def test_http_session_is_not_blocked_by_slow_factory():
+    release = threading.Event()
+    building = threading.Event()
+
+    def slow_factory():
+        building.set()
+        release.wait(5)
+        return "slow"
+
+    async def session_lookup():
+        session = resources.get_http_session()
+        same = resources.get_http_session()
+        await session.close()
+        return session is same
+
+    worker = threading.Thread(target=lambda: resources.get_resource("slow", slow_factory))
+    worker.start()
+    try:
+        assert building.wait(5)
+        started = time.perf_counter()
+        assert asyncio.run(session_lookup())
+        assert time.perf_counter() - started < 1.0
+    finally:
+        release.set()
+        worker.join()
+
+
+def test_aclose_resources_shuts_down_render_pool():
+    from report_renderer import RenderPool
+
+    pool = resources.get_resource("report_render_pool", lambda: RenderPool(1, queue_size=2))
+
+    async def render_then_close():
+        assert await pool.submit(pow, 2, 10) == 1024
+        await resources.aclose_resources()
+
+    asyncio.run(render_then_close())
+
+    assert pool._executor is None
+    assert "report_render_pool" not in resources._instances
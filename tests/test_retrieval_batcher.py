@@ -0,0 +1,77 @@
+# ai-agent/tests/test_retrieval_batcher.py
+"""agents/market_analysis_graph.py — aretrieve 배치 처리, 이벤트 루프가 바뀌어도 멈추지 않음, 쿼리 임베딩 방식"""
+import asyncio
+
+import pytest
+
+from agents import market_analysis_graph as mag
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    calls = []
+
+    def fake_retrieve_batch(queries, k=mag.RETRIEVAL_K):
+        calls.append(list(queries))
+        return [[f"doc:{q}"] for q in queries]
+
+    monkeypatch.setattr(mag, "retrieve_batch", fake_retrieve_batch)
+    return calls
+
+
+def test_concurrent_queries_share_one_batch(batches):
+    async def run():
+        return await asyncio.gather(*(mag.aretrieve(q) for q in ("a", "b", "c")))
+
+    assert asyncio.run(run()) == [["doc:a"], ["doc:b"], ["doc:c"]]
+    assert batches == [["a", "b", "c"]]
+
+
+def test_new_event_loop_is_not_blocked_by_closed_loop(batches):
+    async def abandoned():
+        # flush 타이머가 걸린 상태에서 루프 종료
+        task = asyncio.ensure_future(mag.aretrieve("stale"))
+        await asyncio.sleep(0)
+        task.cancel()
+
+    asyncio.run(abandoned())
+
+    async def fresh():
+        return await asyncio.wait_for(mag.aretrieve("fresh"), timeout=2)
+
+    assert asyncio.run(fresh()) == ["doc:fresh"]
+    assert batches == [["fresh"]]
+
+
+class QueryAwareEmbeddings:
+    """문서/쿼리 임베딩이 다른 모델 (e5 계열처럼 쿼리 prompt 사용)"""
+
+    def embed_documents(self, texts):
+        return [[0.0, float(len(t))] for t in texts]
+
+    def embed_query(self, text):
+        return [1.0, float(len(text))]
+
+
+class HuggingFaceLike(QueryAwareEmbeddings):
+    def __init__(self, query_encode_kwargs):
+        self.query_encode_kwargs = query_encode_kwargs
+        self.encode_kwargs = {"normalize_embeddings": False}
+        self.calls = []
+
+    def _embed(self, texts, encode_kwargs):
+        self.calls.append((list(texts), encode_kwargs))
+        return [[2.0, float(len(t))] for t in texts]
+
+
+def test_query_embeddings_use_query_semantics():
+    assert mag._embed_query_texts(QueryAwareEmbeddings(), ["ab", "c"]) == [[1.0, 2.0], [1.0, 1.0]]
+
+    hf = HuggingFaceLike({"prompt": "query: "})
+    assert mag._embed_query_texts(hf, ["ab", "c"]) == [[2.0, 2.0], [2.0, 1.0]]
+    assert hf.calls == [(["ab", "c"], {"prompt": "query: "})]
+
+    # query_encode_kwargs가 비어 있으면 embed_query처럼 encode_kwargs 사용
+    hf = HuggingFaceLike({})
+    mag._embed_query_texts(hf, ["x"])
+    assert hf.calls == [(["x"], {"normalize_embeddings": False})]
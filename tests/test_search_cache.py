@@ -0,0 +1,196 @@
+# ai-agent/tests/test_search_cache.py
+"""agents/search_cache.py — 동시 요청 합침(async/스레드), 실패 전파, owner 취소 시 대기자 재시도, 빈 결과 TTL, 만료 행 정리"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agents.search_cache import SearchCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SearchCache(str(tmp_path / "search.sqlite"), default_ttl=3600)
+
+
+def test_afetch_coalesces_concurrent_requests(cache):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"answer": 42}
+
+    async def run():
+        return await asyncio.gather(*(cache.afetch("tavily", "  EdTech  시장 ", loader) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert results == [{"answer": 42}] * 5
+    assert len(calls) == 1
+    assert cache.stats() == {"hits": 0, "misses": 1, "coalesced": 4}
+
+    # 정규화된 같은 쿼리는 캐시 적중
+    assert asyncio.run(cache.afetch("tavily", "edtech 시장", loader)) == {"answer": 42}
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_afetch_propagates_error_to_waiters(cache):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        raise RuntimeError("search down")
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.afetch("tavily", "q", loader) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(isinstance(r, RuntimeError) and str(r) == "search down" for r in results)
+    assert cache.get("tavily", "q") is None
+
+
+def test_afetch_owner_cancellation_lets_waiters_retry(cache):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "fresh"
+
+    async def run():
+        owner = asyncio.create_task(cache.afetch("duckduckgo", "q", loader))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(cache.afetch("duckduckgo", "q", loader)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(run()) == ["fresh"] * 3
+    # 취소된 owner 1회 + 대기자 중 새 owner 1회 (나머지는 다시 합쳐짐)
+    assert len(calls) == 2
+    assert cache.get("duckduckgo", "q") == "fresh"
+
+
+def test_fetch_coalesces_threads(cache):
+    calls = []
+    barrier = threading.Barrier(5)
+    results = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.1)
+        return ["r"]
+
+    def worker():
+        barrier.wait()
+        results.append(cache.fetch("tavily", "q", loader))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [["r"]] * 5
+    assert len(calls) == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_fetch_waiter_retries_after_owner_failure(cache):
+    calls = []
+    started = threading.Event()
+
+    def failing():
+        calls.append("fail")
+        started.set()
+        time.sleep(0.05)
+        raise RuntimeError("boom")
+
+    def ok():
+        calls.append("ok")
+        return "value"
+
+    errors, results = [], []
+
+    def owner():
+        try:
+            cache.fetch("tavily", "q", failing)
+        except RuntimeError as e:
+            errors.append(e)
+
+    t = threading.Thread(target=owner)
+    t.start()
+    started.wait()
+    results.append(cache.fetch("tavily", "q", ok))
+    t.join()
+
+    assert len(errors) == 1
+    assert results == ["value"]
+    assert calls == ["fail", "ok"]
+
+
+def test_ttl_expiry(cache, monkeypatch):
+    from agents import search_cache
+
+    now = [1_000.0]
+    monkeypatch.setattr(search_cache.time, "time", lambda: now[0])
+    cache.ttls = {"duckduckgo": 10}
+    cache.set("duckduckgo", "q", "v")
+    cache.set("tavily", "q", "v")
+    now[0] += 11
+    assert cache.get("duckduckgo", "q") is None
+    assert cache.get("tavily", "q") == "v"
+
+
+def test_negative_results_use_short_ttl(cache, monkeypatch):
+    from agents import search_cache
+    from agents.search_clients import DUCKDUCKGO_NO_RESULT
+
+    now = [1_000.0]
+    monkeypatch.setattr(search_cache.time, "time", lambda: now[0])
+    cache.negative_ttl = 60
+    cache.set("duckduckgo", "empty", DUCKDUCKGO_NO_RESULT)
+    cache.set("tavily", "empty", [])
+    cache.set("tavily", "q", [{"title": "t"}])
+    assert cache.get("duckduckgo", "empty") == DUCKDUCKGO_NO_RESULT
+    now[0] += 61
+    assert cache.get("duckduckgo", "empty") is None
+    assert cache.get("tavily", "empty") is None
+    assert cache.get("tavily", "q") == [{"title": "t"}]
+
+    cache.negative_ttl = 0
+    cache.set("tavily", "none", [])
+    assert cache._conn.execute("SELECT COUNT(*) FROM search_cache WHERE query = 'none'").fetchone()[0] == 0
+
+
+def test_expired_rows_are_purged_on_open_and_periodically(tmp_path, monkeypatch):
+    from agents import search_cache
+
+    now = [1_000.0]
+    monkeypatch.setattr(search_cache.time, "time", lambda: now[0])
+    path = str(tmp_path / "search.sqlite")
+    cache = SearchCache(path, default_ttl=100, negative_ttl=10)
+    cache.set("tavily", "old", ["r"])
+    cache.set("tavily", "empty", [])
+    now[0] += 50
+    cache.set("tavily", "new", ["r"])
+
+    def rows(c):
+        return sorted(r[0] for r in c._conn.execute("SELECT query FROM search_cache"))
+
+    # 다시 열면 negative TTL이 지난 빈 결과 삭제
+    reopened = SearchCache(path, default_ttl=100, negative_ttl=10)
+    assert rows(reopened) == ["new", "old"]
+
+    # 정리 주기가 지나면 저장 시점에 만료 행 삭제
+    now[0] += search_cache.PURGE_INTERVAL + 1
+    reopened.set("tavily", "latest", ["r"])
+    assert rows(reopened) == ["latest"]